@@ -0,0 +1,64 @@
+"""Helpers shared by the benchmarks, maps are generated in the map file format of the device."""
+
+import base64
+import json
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+# The integration is not installed as a package, dreame package is imported from the integration folder
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "custom_components", "dreame_vacuum"))
+
+from dreame.map import DreameVacuumMapDecoder  # noqa: E402
+from dreame.types import Point  # noqa: E402
+
+
+def make_raw(width, height, pixels, frame_type=73, map_id=1, frame_id=1, left=0, top=0, grid_size=50, data_json=None):
+    """Raw map data with the header, the pixels and the optional json data."""
+    raw = (
+        struct.pack("<hh", map_id, frame_id)
+        + bytes([frame_type])
+        + struct.pack("<hhhhhhhhhhh", 10, 20, 30, 40, 50, 60, grid_size, width, height, left, top)
+        + bytes(pixels)
+    )
+    if data_json is not None:
+        raw = raw + json.dumps(data_json).encode()
+    return raw
+
+
+def encode(raw):
+    """Map file content as it is downloaded from the cloud."""
+    return base64.b64encode(zlib.compress(raw)).decode().replace("/", "_").replace("+", "-")
+
+
+def room_pixels(width, height, rng, vslam=False, rooms=7, noise=0.03):
+    """Overlapping rectangular rooms with walls and random noise pixels."""
+    pixels = np.zeros((height, width), np.uint8)
+    for i in range(rooms):
+        x0 = rng.randrange(0, width - 40)
+        y0 = rng.randrange(0, height - 40)
+        x1 = min(width - 2, x0 + rng.randrange(30, width // 2))
+        y1 = min(height - 2, y0 + rng.randrange(30, height // 2))
+        room, wall = (1, 2) if vslam else (i + 1, 0x80 | (i + 1))
+        pixels[y0:y1, x0:x1] = room
+        pixels[y0, x0:x1] = wall
+        pixels[y1 - 1, x0:x1] = wall
+        pixels[y0:y1, x0] = wall
+        pixels[y0:y1, x1 - 1] = wall
+    values = np.random.RandomState(rng.randrange(1 << 31)).rand(height, width)
+    pixels[values < noise] = 2 if vslam else 0x80
+    pixels[values > 1 - noise] = 0
+    return pixels.tobytes()
+
+
+def vslam_map(width, height, rng):
+    """Decoded vslam map with the charger in the middle, as it is passed to the optimizer."""
+    raw = make_raw(width, height, room_pixels(width, height, rng, True), data_json={"ris": 1})
+    map_data, _ = DreameVacuumMapDecoder.decode_map_data_from_partial(
+        DreameVacuumMapDecoder.decode_map_partial(encode(raw)), True
+    )
+    map_data.charger_position = Point(width * 25, height * 25, 0)
+    return map_data
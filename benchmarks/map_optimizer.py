@@ -0,0 +1,78 @@
+"""Map optimizer engines on generated vslam maps.
+
+Prints the best time of each engine and whether the optimized maps of the engines are the same as the Python engine.
+JavaScript engine is only measured when the optimizer script can be loaded on MiniRacer.
+
+    python benchmarks/map_optimizer.py
+"""
+
+import base64
+import copy
+import random
+import time
+
+import numpy as np
+
+from common import vslam_map
+
+from dreame.map import DreameVacuumMapOptimizer
+from dreame.types import MAP_OPTIMIZER_LIST
+
+SIZES = ((120, 90), (300, 260), (400, 380))
+REPEAT = 5
+
+
+def js_available():
+    try:
+        from py_mini_racer import MiniRacer
+        from dreame.resources import MAP_OPTIMIZER_JS
+
+        context = MiniRacer()
+        context.eval(base64.b64decode(MAP_OPTIMIZER_JS))
+        return context.eval("typeof optimize") == "function"
+    except Exception:
+        return False
+
+
+def run(engine, map_data):
+    optimizer = DreameVacuumMapOptimizer(engine)
+    best = None
+    for _ in range(REPEAT):
+        result = copy.deepcopy(map_data)
+        start = time.perf_counter()
+        optimizer.optimize(result, None)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def same(a, b):
+    if a.optimized_pixel_type is None or b.optimized_pixel_type is None:
+        return a.optimized_pixel_type is b.optimized_pixel_type
+    return (
+        np.array_equal(a.optimized_pixel_type, b.optimized_pixel_type)
+        and a.optimized_charger_position == b.optimized_charger_position
+    )
+
+
+def main():
+    engines = [engine for engine in MAP_OPTIMIZER_LIST if engine != "JavaScript" or js_available()]
+    if "JavaScript" not in engines:
+        print("JavaScript optimizer is not available, skipped")
+
+    rng = random.Random(3)
+    for width, height in SIZES:
+        map_data = vslam_map(width, height, rng)
+        results = {engine: run(engine, map_data) for engine in engines}
+        reference = results["Python"][1]
+        print(
+            f"{width}x{height}: "
+            + ", ".join(
+                f"{engine} {elapsed * 1000:.0f} ms{'' if same(result, reference) else ' (different)'}"
+                for engine, (elapsed, result) in results.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
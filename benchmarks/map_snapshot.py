@@ -0,0 +1,112 @@
+"""Memory and time of MapData.snapshot compared to a deep copy over a replayed cleaning session.
+
+An I frame and the following P frames are added to the map manager as they are received from the device.
+The current map is copied for rendering after every frame as the device does and some of the copies are rendered.
+Snapshots share the image buffers with the map manager, so the buffers of every snapshot are checked at the end of the session to be unchanged.
+
+    python benchmarks/map_snapshot.py
+"""
+
+import copy
+import hashlib
+import random
+import time
+import tracemalloc
+import types
+
+import numpy as np
+
+from common import encode, make_raw, room_pixels
+
+from dreame.map import DreameMapVacuumMapManager, DreameVacuumMapRenderer
+
+WIDTH = 800
+HEIGHT = 600
+FRAMES = 40
+# Every copy is not rendered to keep the benchmark short, renderer is the only other reader of the copies
+RENDER_INTERVAL = 10
+
+
+def session(rng):
+    """I frame and P frames of a cleaning, robot moves and changes a small area of the map on every frame."""
+    x, y = 0, 0
+    path = f"M{x},{y}"
+    yield encode(
+        make_raw(
+            WIDTH,
+            HEIGHT,
+            room_pixels(WIDTH, HEIGHT, rng, rooms=12),
+            left=-25000,
+            top=-20000,
+            data_json={"timestamp_ms": 1700000000000, "ris": 2, "tr": path},
+        )
+    )
+    for frame_id in range(2, FRAMES + 2):
+        for _ in range(rng.randrange(20, 60)):
+            x = x + rng.randrange(-300, 301)
+            y = y + rng.randrange(-300, 301)
+            path = path + f"L{x},{y}"
+        width, height = rng.randrange(10, 60), rng.randrange(10, 60)
+        pixels = bytes(rng.randrange(1, 13) if rng.random() < 0.3 else 0 for _ in range(width * height))
+        yield encode(
+            make_raw(
+                width,
+                height,
+                pixels,
+                frame_type=80,
+                frame_id=frame_id,
+                left=rng.randrange(-400, 400) * 50,
+                top=rng.randrange(-300, 300) * 50,
+                data_json={"timestamp_ms": 1700000000000 + frame_id * 1000, "tr": path},
+            )
+        )
+
+
+def buffers(map_data):
+    return tuple(
+        hashlib.sha1(np.ascontiguousarray(buffer).tobytes() if isinstance(buffer, np.ndarray) else bytes(buffer)).digest()
+        for buffer in (map_data.pixel_type, map_data.data, map_data.optimized_pixel_type)
+        if buffer is not None
+    )
+
+
+def replay(frames, copy_map):
+    map_manager = DreameMapVacuumMapManager(None, "Python (NumPy stages)")
+    map_manager._protocol = types.SimpleNamespace(dreame_cloud=False)
+    renderer = DreameVacuumMapRenderer()
+    copies = []
+    elapsed = 0
+    allocated = 0
+    for index, raw_map in enumerate(frames):
+        map_manager._add_map_data(map_manager._decode_map_partial(raw_map))
+        map_data = map_manager.get_map()
+        start = time.perf_counter()
+        copy_map(map_data)
+        elapsed = elapsed + time.perf_counter() - start
+
+        # Only the memory that is kept by the copy is traced
+        tracemalloc.start()
+        copied = copy_map(map_data)
+        allocated = allocated + tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        copies.append((copied, buffers(copied)))
+        if index % RENDER_INTERVAL == 0:
+            renderer.render_map(copied, 0, 0)
+    changed = sum(1 for copied, digest in copies if buffers(copied) != digest)
+    return elapsed / len(copies), allocated / len(copies), changed
+
+
+def main():
+    frames = list(session(random.Random(10)))
+    print(f"{WIDTH}x{HEIGHT} map, {len(frames)} frames")
+    for name, copy_map in (("deepcopy", copy.deepcopy), ("snapshot", lambda map_data: map_data.snapshot())):
+        elapsed, size, changed = replay(frames, copy_map)
+        print(
+            f"{name}: {elapsed * 1000:.2f} ms and {size / 1024:.0f} KiB per copy, "
+            f"{changed} copies with changed image buffers"
+        )
+
+
+if __name__ == "__main__":
+    main()
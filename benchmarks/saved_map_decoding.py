@@ -0,0 +1,112 @@
+"""Startup time of the map list with 1, 2 and 4 floors and decoding time of the other floors in the background.
+
+Map list is received on startup and only the selected floor is decoded then, other floors are decoded when they are first accessed.
+Decoding of the other floors is measured in the calling thread and on the process pool that is used when parallel map decoding is enabled,
+pool is only created when there is more than one CPU so the pool is measured with the worker count it would have on this machine
+unless the worker count is given.
+
+    python benchmarks/saved_map_decoding.py [processes]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from common import encode, make_raw, room_pixels
+
+from dreame.const import MAP_DECODE_PROCESS_COUNT
+from dreame.map import DreameMapVacuumMapManager, DreameVacuumMapDecoder
+
+WIDTH = 800
+HEIGHT = 700
+FLOORS = (1, 2, 4)
+REPEAT = 5
+
+
+def best(function):
+    result = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        result = elapsed if result is None else min(result, elapsed)
+    return result
+
+
+def map_list(raw_maps, count):
+    return json.dumps(
+        {
+            "mapstr": [
+                {"map": raw_map, "angle": 0, "name": f"Floor {index}", "mapobj": f"map-{index}"}
+                for index, (raw_map, _) in enumerate(raw_maps[:count])
+            ],
+            "curr_id": 10,
+        }
+    ).encode()
+
+
+def request_map_list(data):
+    map_manager = DreameMapVacuumMapManager(None)
+    map_manager._ready = True
+    map_manager._protocol = types.SimpleNamespace(cloud=types.SimpleNamespace(logged_in=True))
+    map_manager._map_list_object_name = "map-list"
+    map_manager._get_interim_file_data = lambda *args, **kwargs: data
+    map_manager.request_next_recovery_map_list = lambda: None
+    map_manager.request_map_list()
+
+
+def main():
+    rng = random.Random(1)
+    raw_maps = [
+        (
+            encode(
+                make_raw(
+                    WIDTH,
+                    HEIGHT,
+                    room_pixels(WIDTH, HEIGHT, rng, rooms=10),
+                    map_id=10 + index,
+                    data_json={"timestamp_ms": 1700000000000},
+                )
+            ),
+            0,
+        )
+        for index in range(max(FLOORS))
+    ]
+
+    cpu_count = os.cpu_count() or 1
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else min(cpu_count - 1, MAP_DECODE_PROCESS_COUNT)
+    print(f"{WIDTH}x{HEIGHT} floors, {cpu_count} CPUs, {max(processes, 0)} decoding processes")
+
+    pool = None
+    if processes > 0:
+        start = time.perf_counter()
+        pool = ProcessPoolExecutor(processes, mp_context=get_context("spawn"))
+        for future in [pool.submit(int) for _ in range(processes)]:
+            future.result()
+        print(f"pool start {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for count in FLOORS:
+        data = map_list(raw_maps, count)
+        startup = best(lambda: request_map_list(data))
+        others = raw_maps[1:count]
+        line = f"{count} floors: map list {startup:.0f} ms"
+        if others:
+            line = line + f", other floors in thread {best(lambda: DreameVacuumMapDecoder.decode_saved_maps(others, False)):.0f} ms"
+            if pool:
+                line = line + (
+                    f", with {processes} processes "
+                    f"{best(lambda: DreameVacuumMapDecoder.decode_saved_maps(others, False, None, pool)):.0f} ms"
+                )
+        print(line)
+
+    if pool:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
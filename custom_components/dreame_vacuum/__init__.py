@@ -1,11 +1,13 @@
 """The Dreame Vacuum component."""
 
 from __future__ import annotations
+import shutil
 import traceback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.components.frontend import DATA_EXTRA_MODULE_URL
+from homeassistant.helpers.storage import STORAGE_DIR
 from pathlib import Path
 from .const import DOMAIN
 from .coordinator import DreameVacuumDataUpdateCoordinator
@@ -54,6 +56,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         coordinator: DreameVacuumDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
         coordinator._device.listen(None)
         coordinator._device.disconnect()
+        coordinator.render_executor.shutdown(wait=False, cancel_futures=True)
         del coordinator._device
         coordinator._device = None
         del hass.data[DOMAIN][entry.entry_id]
@@ -61,6 +64,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove cached map files of the Dreame Vacuum config entry."""
+    await hass.async_add_executor_job(
+        shutil.rmtree, hass.config.path(STORAGE_DIR, DOMAIN, entry.entry_id), True
+    )
+
+
 async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(config_entry.entry_id)
@@ -6,6 +6,7 @@ import time
 import asyncio
 import traceback
 import gzip
+import logging
 from typing import Any, Dict, Final
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -36,6 +37,9 @@ from .const import (
     CONF_MAP_OBJECTS,
     CONF_LOW_RESOLUTION,
     CONF_SQUARE,
+    CONF_MAP_ENCODER,
+    CONF_RENDER_BUDGET,
+    DEFAULT_RENDER_BUDGET,
     MAP_OBJECTS,
     LOGGER,
 )
@@ -54,6 +58,7 @@ from .dreame.const import (
     ATTR_RECOVERY_MAP_FILE,
     ATTR_WIFI_MAP_PICTURE,
     ATTR_COLOR_SCHEME,
+    ATTR_RENDER_TIMES,
 )
 from .dreame.map import (
     DreameVacuumMapRenderer,
@@ -62,8 +67,13 @@ from .dreame.map import (
 
 DREAME_TOKEN_CHANGE_INTERVAL: Final = timedelta(minutes=60)
 
+RENDER_IDLE_INTERVAL: Final = 5.0
+RENDER_VIEWER_TIMEOUT: Final = 30.0
+RENDER_COST_SMOOTHING: Final = 0.3
+
 JSON_CONTENT_TYPE: Final = "application/json"
 PNG_CONTENT_TYPE: Final = "image/png"
+JPEG_CONTENT_TYPE: Final = "image/jpeg"
 
 MAP_IMAGE_URL: Final = "/api/camera_proxy/{0}?token={1}&v={2}"
 HISTORY_MAP_IMAGE_URL: Final = "/api/camera_history_map_proxy/{0}?token={1}&index={2}&v={3}"
@@ -112,8 +122,9 @@ class CameraDataView(CameraView):
             response = web.Response(
                 body=gzip.compress(
                     bytes(
-                        camera.map_data_string(
-                            resources and (resources == True or resources == "true" or resources == "1")
+                        await camera.async_map_data_string(
+                            resources and (resources == True or resources == "true" or resources == "1"),
+                            request.query.get("encoding"),
                         ),
                         "utf-8",
                     )
@@ -122,6 +133,13 @@ class CameraDataView(CameraView):
             )
             response.headers["Content-Encoding"] = "gzip"
             return response
+
+        version = request.query.get("version")
+        data = await camera.async_map_data_json_string(int(version) if version and version.isdecimal() else None)
+        if data:
+            response = web.Response(body=gzip.compress(bytes(data, "utf-8")), content_type=JSON_CONTENT_TYPE)
+            response.headers["Content-Encoding"] = "gzip"
+            return response
         raise web.HTTPNotFound()
 
 
@@ -320,7 +338,7 @@ class CameraResourcesView(HomeAssistantView):
         response = web.Response(
             body=gzip.compress(
                 bytes(
-                    camera.resources(icon_set),
+                    await camera.async_resources(icon_set),
                     "utf-8",
                 )
             ),
@@ -343,6 +361,8 @@ async def async_setup_entry(
         low_resolution = entry.options.get(CONF_LOW_RESOLUTION, False)
         square = entry.options.get(CONF_SQUARE, False)
         map_objects = entry.options.get(CONF_MAP_OBJECTS, MAP_OBJECTS.keys())
+        encoder = entry.options.get(CONF_MAP_ENCODER)
+        render_budget = entry.options.get(CONF_RENDER_BUDGET, DEFAULT_RENDER_BUDGET)
 
         async_add_entities(
             DreameVacuumCameraEntity(
@@ -353,6 +373,8 @@ async def async_setup_entry(
                 map_objects,
                 low_resolution,
                 square,
+                encoder=encoder,
+                render_budget=render_budget,
             )
             for description in CAMERAS
         )
@@ -367,6 +389,8 @@ async def async_setup_entry(
             map_objects,
             low_resolution,
             square,
+            encoder,
+            render_budget,
         )
         platform = entity_platform.current_platform.get()
         platform.async_register_entity_service("update", {}, DreameVacuumCameraEntity.async_update.__name__)
@@ -397,6 +421,8 @@ def async_update_map_cameras(
     map_objects: list[str],
     low_resolution: bool,
     square: bool,
+    encoder: str,
+    render_budget: int,
 ) -> None:
     new_indexes = set([k for k in range(1, len(coordinator.device.status.map_list) + 1)])
     current_ids = set(current)
@@ -420,6 +446,8 @@ def async_update_map_cameras(
                 low_resolution,
                 square,
                 map_index,
+                encoder,
+                render_budget,
             )
         ]
 
@@ -440,6 +468,8 @@ def async_update_map_cameras(
                     True,
                     square,
                     map_index,
+                    encoder,
+                    render_budget,
                 )
             )
 
@@ -482,6 +512,8 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
         low_resolution: bool = False,
         square: bool = False,
         map_index: int = 0,
+        encoder: str = None,
+        render_budget: int = DEFAULT_RENDER_BUDGET,
     ) -> None:
         """Initialize a Dreame Vacuum Camera entity."""
         super().__init__(coordinator, description)
@@ -501,6 +533,16 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
         self._calibration_points = None
         self._device_active = None
         self._error = None
+        self._render_task = None
+        self._render_requested = False
+        self._render_budget = (render_budget if render_budget else DEFAULT_RENDER_BUDGET) / 100
+        self._render_cost = None
+        self._overlay_cost = None
+        self._render_interval = self.frame_interval
+        self._next_render = 0
+        self._rendered_frames = collections.deque([], 10)
+        self._stream_viewers = 0
+        self._last_image_request = 0
         self._proxy_renderer = None
         self._color_scheme = color_scheme
 
@@ -515,6 +557,7 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
                 self.device.capability.robot_type,
                 low_resolution,
                 square,
+                encoder=encoder,
             )
             if not self.wifi_map:
                 self._proxy_renderer = DreameVacuumMapRenderer(
@@ -525,6 +568,7 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
                     low_resolution,
                     square,
                     False,
+                    encoder,
                 )
         self._image = None
         self._default_map = True
@@ -607,6 +651,14 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
         self.async_write_ha_state()
 
     async def async_camera_image(self, width: int | None = None, height: int | None = None) -> bytes | None:
+        # Map cards polling the camera proxy are viewers too
+        request_time = time.time()
+        if not self._has_viewers(request_time):
+            # Render the first frame for the viewer without waiting for the idle render interval
+            self._next_render = 0
+            self._render_interval = self.frame_interval
+        self._last_image_request = request_time
+
         if self._should_poll is True:
             self._should_poll = False
             now = time.time()
@@ -615,22 +667,51 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
                 if self.map_index == 0 and self.device:
                     self.device.update_map()
                 self.update()
-                if self._last_updated and self._last_rendered != self._last_updated and self._renderer.render_complete:
-                    await self._update_image(
-                        self.device.get_map_for_render(self._map_data),
-                        self.device.status.robot_status,
-                        self.device.status.station_status,
-                    )
-                    self._last_rendered = self._last_updated
+                if self._last_updated and self._last_rendered != self._last_updated:
+                    self._render_requested = True
+                    if self._render_task is None or self._render_task.done():
+                        self._render_task = self.hass.async_create_background_task(
+                            self._async_render(), f"{self.entity_id} render"
+                        )
             self._should_poll = True
         return self._image
 
+    async def _async_render(self) -> None:
+        """Render frames on the device render executor until there is no newer frame requested."""
+        # Requests received while a frame is being rendered are coalesced and only the latest map data is rendered
+        while self._render_requested and self.device:
+            # Next frame is delayed until the render budget allows it, requests received meanwhile are coalesced too
+            delay = self._next_render - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                if not self.device:
+                    break
+            self._render_requested = False
+            last_updated = self._last_updated
+            try:
+                await self.hass.loop.run_in_executor(self.coordinator.render_executor, self._update_image)
+            except RuntimeError:
+                # Render executor is shut down while the integration is unloading
+                break
+            self._last_rendered = last_updated
+
     async def handle_async_still_stream(self, request: web.Request, interval: float) -> web.StreamResponse:
         """Generate an HTTP MJPEG stream from camera images."""
         response = web.StreamResponse()
         response.content_type = CONTENT_TYPE_MULTIPART.format("--frameboundary")
         await response.prepare(request)
 
+        if not self._stream_viewers:
+            # Render the first frame for the viewer without waiting for the idle render interval
+            self._next_render = 0
+            self._render_interval = self.frame_interval
+        self._stream_viewers = self._stream_viewers + 1
+        try:
+            return await self._async_write_stream(response, interval)
+        finally:
+            self._stream_viewers = self._stream_viewers - 1
+
+    async def _async_write_stream(self, response: web.StreamResponse, interval: float) -> web.StreamResponse:
         last_image = None
         while True:
             img_bytes = await self.async_camera_image()
@@ -638,22 +719,37 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
                 img_bytes = self._default_map_image
 
             if img_bytes != last_image:
+                content_type = self.content_type
+                frame = img_bytes
+                if not self.map_data_json and self._renderer.encoder.stream_quality and img_bytes is self._image:
+                    try:
+                        stream_image = await self.hass.loop.run_in_executor(
+                            self.coordinator.render_executor, self._renderer.render_stream_image
+                        )
+                    except RuntimeError:
+                        # Render executor is shut down while the integration is unloading
+                        stream_image = None
+                    if stream_image:
+                        content_type = JPEG_CONTENT_TYPE
+                        frame = stream_image
+                        self._update_render_stats()
+
                 # Always write twice, otherwise chrome ignores last frame and displays previous frame after second one
                 for k in range(2):
                     await response.write(
                         bytes(
                             "--frameboundary\r\n"
                             "Content-Type: {}\r\n"
-                            "Content-Length: {}\r\n\r\n".format(self.content_type, len(img_bytes)),
+                            "Content-Length: {}\r\n\r\n".format(content_type, len(frame)),
                             "utf-8",
                         )
-                        + img_bytes
+                        + frame
                         + b"\r\n"
                     )
                 last_image = img_bytes
             if not self.device:
                 break
-            await asyncio.sleep(interval)
+            await asyncio.sleep(max(interval, self._render_interval))
         return response
 
     @callback
@@ -707,7 +803,9 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
             response, obstacle = await self.hass.async_add_executor_job(self.device.obstacle_image, index)
             if response and obstacle:
                 return (
-                    self._get_proxy_obstacle_image(response, obstacle, box, crop, "obstacle"),
+                    await self._async_render_job(
+                        self._get_proxy_obstacle_image, response, obstacle, box, crop, "obstacle"
+                    ),
                     obstacle.object_name,
                 )
         return (None, None)
@@ -719,7 +817,9 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
             )
             if response and obstacle:
                 return (
-                    self._get_proxy_obstacle_image(response, obstacle, box, crop, "obstacle_history", 1),
+                    await self._async_render_job(
+                        self._get_proxy_obstacle_image, response, obstacle, box, crop, "obstacle_history", 1
+                    ),
                     obstacle.object_name,
                 )
         return (None, None)
@@ -728,20 +828,19 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
         if self.map_index == 0 and not self.map_data_json:
             map_data = await self.hass.async_add_executor_job(self.device.history_map, index, cruising)
             if map_data:
-                map_data = (
-                    self.device.get_map_for_render(map_data)
-                    if cruising or not dirty_map or map_data.cleaning_map_data is None
-                    else map_data.cleaning_map_data
-                )
-                if data_string:
-                    return self._renderer.get_data_string(
-                        map_data,
-                        self._renderer.get_resources(self.device.capability) if include_resources else None,
-                    )
-                return self._get_proxy_image(
+                if cruising or not dirty_map or map_data.cleaning_map_data is None:
+                    render = True
+                else:
+                    map_data = map_data.cleaning_map_data
+                    render = False
+                return await self._async_render_job(
+                    self._render_proxy_map,
                     index,
                     map_data,
+                    render,
                     info_text,
+                    data_string,
+                    include_resources,
                     "cruising" if cruising else "dirty" if dirty_map else "cleaning",
                 )
 
@@ -768,14 +867,9 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
             else:
                 map_data = await self.hass.async_add_executor_job(self.device.recovery_map, self._map_id, index)
             if map_data:
-                map_data = self.device.get_map_for_render(map_data)
-                if data_string:
-                    return self._renderer.get_data_string(
-                        map_data,
-                        self._renderer.get_resources(self.device.capability) if include_resources else None,
-                    )
-                else:
-                    return self._get_proxy_image(index, map_data, info_text, "recovery")
+                return await self._async_render_job(
+                    self._render_proxy_map, index, map_data, True, info_text, data_string, include_resources, "recovery"
+                )
 
     async def wifi_map_data(self, data_string, include_resources):
         if not self.map_data_json and not self.wifi_map:
@@ -783,48 +877,147 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
             if map_data:
                 map_data = map_data.wifi_map_data
                 if map_data:
-                    map_data = self.device.get_map_for_render(map_data)
-                    if data_string:
-                        return self._renderer.get_data_string(
-                            map_data,
-                            self._renderer.get_resources(self.device.capability) if include_resources else None,
-                        )
-                    else:
-                        return self._get_proxy_image(
-                            map_data.map_index if self.map_index == 0 else self.map_index,
-                            map_data,
-                            False,
-                            "wifi",
-                            1,
-                        )
+                    return await self._async_render_job(
+                        self._render_proxy_map,
+                        map_data.map_index if self.map_index == 0 else self.map_index,
+                        map_data,
+                        True,
+                        False,
+                        data_string,
+                        include_resources,
+                        "wifi",
+                        1,
+                    )
 
-    def map_data_string(self, include_resources) -> str:
+    async def async_map_data_string(self, include_resources, encoding=None) -> str:
         if not self.map_data_json and self._map_data:
             if self.map_index == 0 and self.device:
                 self._last_map_request = time.time()
                 self.device.update_map()
-            return self._renderer.get_data_string(
-                self.device.get_map_for_render(self._map_data),
-                self._renderer.get_resources(self.device.capability) if include_resources else None,
+            data = await self._async_render_job(
+                self._map_data_string,
+                self._map_data,
+                include_resources,
                 self.device.status.robot_status,
                 self.device.status.station_status,
+                encoding,
             )
+            if data:
+                return data
         return "{}"
 
-    def resources(self, icon_set=None) -> str:
+    async def async_map_data_json_string(self, version: int = None) -> str | None:
+        if self.map_data_json:
+            return await self._async_render_job(self._renderer.get_map_data_json, version)
+
+    async def async_resources(self, icon_set=None) -> str:
         if self.device:
-            return self._renderer.get_resources(self.device.capability, True, icon_set)
+            data = await self._async_render_job(self._renderer.get_resources, self.device.capability, True, icon_set)
+            if data:
+                return data
         return "{}"
 
-    async def _update_image(self, map_data, robot_status, station_status) -> None:
+    async def _async_render_job(self, target, *args):
+        """Run the job on the render executor, renderers are not thread safe and are shared with _update_image"""
         try:
-            self._image = self._renderer.render_map(map_data, robot_status, station_status)
-            if not self.map_data_json and self._calibration_points != self._renderer.calibration_points:
-                self._calibration_points = self._renderer.calibration_points
-                self.coordinator.set_updated_data()
+            return await self.hass.loop.run_in_executor(self.coordinator.render_executor, target, *args)
+        except RuntimeError:
+            # Render executor is shut down while the integration is unloading
+            return None
+
+    def _render_proxy_map(
+        self, index, map_data, render, info_text, data_string, include_resources, cache_key, max_item=2
+    ):
+        if render:
+            map_data = self.device.get_map_for_render(map_data)
+        if data_string:
+            return self._renderer.get_data_string(
+                map_data,
+                self._renderer.get_resources(self.device.capability) if include_resources else None,
+            )
+        return self._get_proxy_image(index, map_data, info_text, cache_key, max_item)
+
+    def _map_data_string(self, map_data, include_resources, robot_status, station_status, encoding) -> str:
+        return self._renderer.get_data_string(
+            self.device.get_map_for_render(map_data),
+            self._renderer.get_resources(self.device.capability) if include_resources else None,
+            robot_status,
+            station_status,
+            encoding,
+        )
+
+    def _update_image(self) -> None:
+        try:
+            started = time.thread_time()
+            self._image = self._renderer.render_map(
+                self.device.get_map_for_render(self._map_data),
+                self.device.status.robot_status,
+                self.device.status.station_status,
+            )
+            self._schedule_render(
+                time.thread_time() - started, not self.map_data_json and self._renderer.render_overlay
+            )
+            if not self.map_data_json:
+                self._update_render_stats()
+                if self._calibration_points != self._renderer.calibration_points:
+                    self._calibration_points = self._renderer.calibration_points
+                    self.coordinator.set_updated_data()
         except Exception:
             LOGGER.warning("Map render Failed: %s", traceback.format_exc())
 
+    def _schedule_render(self, cost: float, overlay: bool) -> None:
+        """Delay the next frame until the measured render cost fits in the render budget"""
+        if overlay:
+            self._overlay_cost = (
+                cost
+                if self._overlay_cost is None
+                else self._overlay_cost + (cost - self._overlay_cost) * RENDER_COST_SMOOTHING
+            )
+        else:
+            self._render_cost = (
+                cost
+                if self._render_cost is None
+                else self._render_cost + (cost - self._render_cost) * RENDER_COST_SMOOTHING
+            )
+
+        # Robot moves between consecutive frames while the map is same, assume the next frame is also cheap
+        expected_cost = self._overlay_cost if overlay else self._render_cost
+        interval = max(self.frame_interval, expected_cost / self._render_budget)
+        now = time.time()
+        if not self._has_viewers(now):
+            interval = max(interval, RENDER_IDLE_INTERVAL)
+
+        self._render_interval = interval
+        self._next_render = now + interval
+        self._rendered_frames.append(now)
+
+    def _has_viewers(self, now: float) -> bool:
+        """Camera has an open stream or an image is requested recently"""
+        return bool(self._stream_viewers or now - self._last_image_request < RENDER_VIEWER_TIMEOUT)
+
+    @property
+    def render_fps(self) -> float:
+        """Frames rendered per second over the last rendered frames"""
+        if len(self._rendered_frames) < 2:
+            return 0.0
+        return round((len(self._rendered_frames) - 1) / max(time.time() - self._rendered_frames[0], 0.001), 2)
+
+    def _update_render_stats(self) -> None:
+        self.coordinator.render_stats[self.entity_id] = {
+            "encoder": self._renderer.encoder.__dict__,
+            "encode_time": self._renderer.encode_time,
+            "encode_size": self._renderer.encode_size,
+            "stream_encode_time": self._renderer.stream_encode_time,
+            "stream_encode_size": self._renderer.stream_encode_size,
+            "render_budget": round(self._render_budget * 100),
+            "render_cost": round(self._render_cost * 1000, 2) if self._render_cost is not None else None,
+            "overlay_cost": round(self._overlay_cost * 1000, 2) if self._overlay_cost is not None else None,
+            "render_interval": round(self._render_interval, 3),
+            "render_fps": self.render_fps,
+            "stream_viewers": self._stream_viewers,
+            "last_image_request": round(self._last_image_request, 3),
+        }
+
     def _get_proxy_image(self, index, map_data, info_text, cache_key, max_item=2):
         item_key = f"i{index}_t{int(info_text)}_d{int(map_data.last_updated)}"
         if cache_key not in self._proxy_images:
@@ -1034,4 +1227,7 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
                         token,
                         int(wifi_map_data.last_updated if wifi_map_data.last_updated else map_data.last_updated),
                     )
+
+            if LOGGER.isEnabledFor(logging.DEBUG) and self._renderer.layer_render_times:
+                attributes[ATTR_RENDER_TIMES] = dict(self._renderer.layer_render_times)
             return attributes
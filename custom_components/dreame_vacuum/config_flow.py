@@ -25,7 +25,7 @@ from homeassistant.config_entries import (
     OptionsFlow,
 )
 
-from .dreame import DreameVacuumProtocol, MAP_COLOR_SCHEME_LIST, MAP_ICON_SET_LIST, DEVICE_INFO
+from .dreame import DreameVacuumProtocol, MAP_COLOR_SCHEME_LIST, MAP_ICON_SET_LIST, MAP_OPTIMIZER_LIST, MAP_ENCODER_LIST, DEVICE_INFO
 
 from .const import (
     DOMAIN,
@@ -42,7 +42,16 @@ from .const import (
     CONF_PREFER_CLOUD,
     CONF_LOW_RESOLUTION,
     CONF_SQUARE,
+    CONF_MAP_OPTIMIZER,
+    CONF_PARALLEL_MAP_DECODING,
+    CONF_MAP_ENCODER,
+    CONF_RENDER_BUDGET,
+    CONF_PROPERTY_CHUNK_SIZE,
+    CONF_PROPERTY_CONCURRENCY,
     CONF_DONATED,
+    DEFAULT_RENDER_BUDGET,
+    DEFAULT_PROPERTY_CHUNK_SIZE,
+    DEFAULT_PROPERTY_CONCURRENCY,
     NOTIFICATION,
     MAP_OBJECTS,
     SPONSOR,
@@ -82,7 +91,19 @@ class DreameVacuumOptionsFlowHandler(OptionsFlow):
             else:
                 notify = []
 
-        data_schema = vol.Schema({vol.Required(CONF_NOTIFY, default=notify): cv.multi_select(NOTIFICATION)})
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_NOTIFY, default=notify): cv.multi_select(NOTIFICATION),
+                vol.Required(
+                    CONF_PROPERTY_CHUNK_SIZE,
+                    default=self._config_entry.options.get(CONF_PROPERTY_CHUNK_SIZE, DEFAULT_PROPERTY_CHUNK_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                vol.Required(
+                    CONF_PROPERTY_CONCURRENCY,
+                    default=self._config_entry.options.get(CONF_PROPERTY_CONCURRENCY, DEFAULT_PROPERTY_CONCURRENCY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+            }
+        )
         if self._config_entry.data[CONF_USERNAME]:
             data_schema = data_schema.extend(
                 {
@@ -102,6 +123,22 @@ class DreameVacuumOptionsFlowHandler(OptionsFlow):
                         CONF_LOW_RESOLUTION,
                         default=self._config_entry.options.get(CONF_LOW_RESOLUTION, False),
                     ): bool,
+                    vol.Required(
+                        CONF_MAP_OPTIMIZER,
+                        default=self._config_entry.options.get(CONF_MAP_OPTIMIZER, next(iter(MAP_OPTIMIZER_LIST))),
+                    ): vol.In(list(MAP_OPTIMIZER_LIST.keys())),
+                    vol.Required(
+                        CONF_PARALLEL_MAP_DECODING,
+                        default=self._config_entry.options.get(CONF_PARALLEL_MAP_DECODING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_MAP_ENCODER,
+                        default=self._config_entry.options.get(CONF_MAP_ENCODER, next(iter(MAP_ENCODER_LIST))),
+                    ): vol.In(list(MAP_ENCODER_LIST.keys())),
+                    vol.Required(
+                        CONF_RENDER_BUDGET,
+                        default=self._config_entry.options.get(CONF_RENDER_BUDGET, DEFAULT_RENDER_BUDGET),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
                 }
             )
             if self._config_entry.data.get(CONF_ACCOUNT_TYPE, ACCOUNT_TYPE_MI) == ACCOUNT_TYPE_MI:
@@ -473,6 +510,12 @@ class DreameVacuumFlowHandler(ConfigFlow, domain=DOMAIN):
                 CONF_MAP_OBJECTS: user_input.get(CONF_MAP_OBJECTS),
                 CONF_SQUARE: user_input.get(CONF_SQUARE),
                 CONF_LOW_RESOLUTION: user_input.get(CONF_LOW_RESOLUTION),
+                CONF_MAP_OPTIMIZER: user_input.get(CONF_MAP_OPTIMIZER),
+                CONF_PARALLEL_MAP_DECODING: user_input.get(CONF_PARALLEL_MAP_DECODING),
+                CONF_MAP_ENCODER: user_input.get(CONF_MAP_ENCODER),
+                CONF_RENDER_BUDGET: user_input.get(CONF_RENDER_BUDGET),
+                CONF_PROPERTY_CHUNK_SIZE: user_input.get(CONF_PROPERTY_CHUNK_SIZE, DEFAULT_PROPERTY_CHUNK_SIZE),
+                CONF_PROPERTY_CONCURRENCY: user_input.get(CONF_PROPERTY_CONCURRENCY, DEFAULT_PROPERTY_CONCURRENCY),
                 CONF_PREFER_CLOUD: self.prefer_cloud,
             }
 
@@ -482,6 +525,12 @@ class DreameVacuumFlowHandler(ConfigFlow, domain=DOMAIN):
             {
                 vol.Required(CONF_NAME, default=self.name): str,
                 vol.Required(CONF_NOTIFY, default=list(NOTIFICATION.keys())): cv.multi_select(NOTIFICATION),
+                vol.Required(CONF_PROPERTY_CHUNK_SIZE, default=DEFAULT_PROPERTY_CHUNK_SIZE): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=50)
+                ),
+                vol.Required(CONF_PROPERTY_CONCURRENCY, default=DEFAULT_PROPERTY_CONCURRENCY): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=8)
+                ),
             }
         )
 
@@ -510,6 +559,16 @@ class DreameVacuumFlowHandler(ConfigFlow, domain=DOMAIN):
                     vol.Required(CONF_MAP_OBJECTS, default=default_objects): cv.multi_select(MAP_OBJECTS),
                     vol.Required(CONF_SQUARE, default=False): bool,
                     vol.Required(CONF_LOW_RESOLUTION, default=False): bool,
+                    vol.Required(CONF_MAP_OPTIMIZER, default=next(iter(MAP_OPTIMIZER_LIST))): vol.In(
+                        list(MAP_OPTIMIZER_LIST.keys())
+                    ),
+                    vol.Required(CONF_PARALLEL_MAP_DECODING, default=False): bool,
+                    vol.Required(CONF_MAP_ENCODER, default=next(iter(MAP_ENCODER_LIST))): vol.In(
+                        list(MAP_ENCODER_LIST.keys())
+                    ),
+                    vol.Required(CONF_RENDER_BUDGET, default=DEFAULT_RENDER_BUDGET): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=100)
+                    ),
                 }
             )
 
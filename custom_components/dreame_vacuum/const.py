@@ -23,11 +23,21 @@ CONF_MAP_OBJECTS: Final = "map_objects"
 CONF_PREFER_CLOUD: Final = "prefer_cloud"
 CONF_LOW_RESOLUTION: Final = "low_resolution"
 CONF_SQUARE: Final = "square"
+CONF_MAP_OPTIMIZER: Final = "map_optimizer"
+CONF_PARALLEL_MAP_DECODING: Final = "parallel_map_decoding"
+CONF_MAP_ENCODER: Final = "map_encoder"
+CONF_RENDER_BUDGET: Final = "render_budget"
+CONF_PROPERTY_CHUNK_SIZE: Final = "property_chunk_size"
+CONF_PROPERTY_CONCURRENCY: Final = "property_concurrency"
 CONF_ACCOUNT_TYPE: Final = "account_type"
 CONF_DONATED: Final = "donated"
 
 CONTENT_TYPE: Final = "image/png"
 
+DEFAULT_RENDER_BUDGET: Final = 10
+DEFAULT_PROPERTY_CHUNK_SIZE: Final = 15
+DEFAULT_PROPERTY_CONCURRENCY: Final = 3
+
 MAP_OBJECTS: Final = {
     "color": "Room Colors",
     "icon": "Room Icons",
@@ -5,6 +5,8 @@ from __future__ import annotations
 import math
 import time
 import traceback
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -17,8 +19,10 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .dreame import DreameVacuumDevice, DreameVacuumProperty
@@ -37,6 +41,12 @@ from .const import (
     CONF_AUTH_KEY,
     CONF_ACCOUNT_TYPE,
     CONF_PREFER_CLOUD,
+    CONF_MAP_OPTIMIZER,
+    CONF_PARALLEL_MAP_DECODING,
+    CONF_PROPERTY_CHUNK_SIZE,
+    CONF_PROPERTY_CONCURRENCY,
+    DEFAULT_PROPERTY_CHUNK_SIZE,
+    DEFAULT_PROPERTY_CONCURRENCY,
     CONTENT_TYPE,
     NOTIFICATION_CLEANUP_COMPLETED,
     NOTIFICATION_DUST_COLLECTION_NOT_PERFORMED,
@@ -117,6 +127,13 @@ class DreameVacuumDataUpdateCoordinator(DataUpdateCoordinator[DreameVacuumDevice
         self._low_water = False
         self._drainage_status = None
         self._washing = None
+        # Last frame statistics of the camera entities for diagnostics
+        self.render_stats: dict[str, dict[str, Any]] = {}
+        # Properties changed on the current update, all listeners are updated when it is not known
+        self._changed_properties: frozenset[int] | None = None
+        self.listener_stats: dict[str, int] = {"updates": 0, "listeners": 0, "updated": 0, "last_updated": 0}
+        # Map frames of all cameras of the device are rendered one at a time outside of the event loop
+        self.render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{DOMAIN}_render")
 
         LOGGER.info("Integration loading: %s", entry.data[CONF_NAME])
         self._device = DreameVacuumDevice(
@@ -131,6 +148,13 @@ class DreameVacuumDataUpdateCoordinator(DataUpdateCoordinator[DreameVacuumDevice
             entry.data.get(CONF_ACCOUNT_TYPE, "mi"),
             entry.data.get(CONF_DID),
             self._auth_key,
+            entry.options.get(CONF_MAP_OPTIMIZER),
+            hass.config.path(STORAGE_DIR, DOMAIN, entry.entry_id),
+            entry.options.get(CONF_PARALLEL_MAP_DECODING, False),
+            entry.options.get(CONF_PROPERTY_CHUNK_SIZE, DEFAULT_PROPERTY_CHUNK_SIZE),
+            entry.options.get(CONF_PROPERTY_CONCURRENCY, DEFAULT_PROPERTY_CONCURRENCY),
+            async_get_clientsession(hass),
+            hass.loop,
         )
 
         self._device.listen(self._dust_collection_changed, DreameVacuumProperty.DUST_COLLECTION)
@@ -479,11 +503,11 @@ class DreameVacuumDataUpdateCoordinator(DataUpdateCoordinator[DreameVacuumDevice
     def set_update_error(self, ex=None) -> None:
         self.hass.loop.call_soon_threadsafe(self.async_set_update_error, ex)
 
-    def set_updated_data(self, device=None) -> None:
-        self.hass.loop.call_soon_threadsafe(self.async_set_updated_data, device)
+    def set_updated_data(self, device=None, properties: frozenset[int] = None) -> None:
+        self.hass.loop.call_soon_threadsafe(self.async_set_updated_data, device, properties)
 
     @callback
-    def async_set_updated_data(self, device=None) -> None:
+    def async_set_updated_data(self, device=None, properties: frozenset[int] = None) -> None:
         if not self._device or not self._device.status:
             return
         if self._has_temporary_map != self._device.status.has_temporary_map:
@@ -514,7 +538,27 @@ class DreameVacuumDataUpdateCoordinator(DataUpdateCoordinator[DreameVacuumDevice
             return
 
         self._available = self._device and self._device.available
+        self._changed_properties = properties
         super().async_set_updated_data(self._device)
+        self._changed_properties = None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners depending on the changed properties."""
+        properties = self._changed_properties
+        self._changed_properties = None
+        listeners = list(self._listeners.values())
+        updated = 0
+        for update_callback, context in listeners:
+            # Context of the entities is the set of properties their state depends on
+            if properties is None or context is None or not properties.isdisjoint(context):
+                update_callback()
+                updated = updated + 1
+
+        self.listener_stats["updates"] = self.listener_stats["updates"] + 1
+        self.listener_stats["listeners"] = len(listeners)
+        self.listener_stats["updated"] = self.listener_stats["updated"] + updated
+        self.listener_stats["last_updated"] = updated
 
     @callback
     def async_set_update_error(self, ex) -> None:
@@ -41,6 +41,8 @@ from .types import (
     ACTION_AVAILABILITY,
     MAP_COLOR_SCHEME_LIST,
     MAP_ICON_SET_LIST,
+    MAP_OPTIMIZER_LIST,
+    MAP_ENCODER_LIST,
 )
 from .const import (
     DEVICE_INFO,
@@ -524,6 +524,7 @@ ATTR_SHORTCUT_TASK: Final = "shortcut_task"
 ATTR_FIRMWARE_VERSION: Final = "firmware_version"
 ATTR_AP: Final = "ap"
 ATTR_COLOR_SCHEME: Final = "color_scheme"
+ATTR_RENDER_TIMES: Final = "render_times"
 ATTR_CAPABILITIES: Final = "capabilities"
 
 MAP_PARAMETER_NAME: Final = "name"
@@ -548,6 +549,22 @@ MAP_REQUEST_PARAMETER_TYPE: Final = "type"
 MAP_REQUEST_PARAMETER_INDEX: Final = "index"
 MAP_REQUEST_PARAMETER_ROOM_ID: Final = "roomID"
 
+MAP_CACHE_SIZE: Final = 64 * 1024 * 1024
+MAP_FRAME_CACHE_SIZE: Final = 4
+MAP_SAVED_MAP_MEMORY_LIMIT: Final = 16 * 1024 * 1024
+MAP_DECODE_PROCESS_COUNT: Final = 4
+
+PROPERTY_CHUNK_SIZE: Final = 15
+PROPERTY_CONCURRENCY: Final = 3
+
+PROPERTY_TIER_HOT: Final = 0
+PROPERTY_TIER_WARM: Final = 1
+PROPERTY_TIER_COLD: Final = 2
+PROPERTY_WARM_INTERVAL: Final = 9.5
+PROPERTY_COLD_INTERVAL: Final = 60
+PROPERTY_PUSH_TIMEOUT: Final = 120
+PROPERTY_WRITE_TIMEOUT: Final = 30
+
 MAP_DATA_JSON_CLASS: Final = "ValetudoMap"
 MAP_DATA_JSON_PARAMETER_CLASS: Final = "__class"
 MAP_DATA_JSON_PARAMETER_SIZE: Final = "size"
@@ -582,6 +599,18 @@ MAP_DATA_JSON_PARAMETER_PATH: Final = "path"
 MAP_DATA_JSON_PARAMETER_FLOOR: Final = "floor"
 MAP_DATA_JSON_PARAMETER_WALL: Final = "wall"
 MAP_DATA_JSON_PARAMETER_SEGMENT: Final = "segment"
+MAP_DATA_JSON_PARAMETER_MAP_VERSION: Final = "mapVersion"
+MAP_DATA_JSON_PARAMETER_BASE_VERSION: Final = "baseVersion"
+MAP_DATA_JSON_PARAMETER_APPENDED_ENTITIES: Final = "appendedEntities"
+MAP_DATA_JSON_PARAMETER_INDEX: Final = "index"
+MAP_DATA_JSON_PARAMETER_OFFSET: Final = "offset"
+MAP_DATA_JSON_DELTA_CLASS: Final = "ValetudoMapDelta"
+
+MAP_DATA_STRING_ENCODING_ZLIB: Final = "zlib"
+
+ATTRIBUTE_GROUP_PROPERTIES: Final = "properties"
+ATTRIBUTE_GROUP_STATUS: Final = "status"
+ATTRIBUTE_GROUP_ROOMS: Final = "rooms"
 
 DEVICE_INFO: Final = (
     "H4sIAAAAAAAACu1dWXPUSBL+L37uhzpUUok3YMLD7AADXnZ2Z4l5AIwxBoy5GSb2v28edaT6VLckuw/FzkZ/Vaoj68uszKxSt3n69Kma6In5cwKfKn0q+tTpE/6nAzQNaGLDDKGWu5nQXU1ceOTSgNUkDqLj7GbiiomNgtQJ2kkRK5OY3Bm6VxHENrqOoAygDNPjDLHOxMG1T63SUGYSK71LUpQmQRdl05N6EqfzqVOVW1Y2QZ9hVWWo8wS5ts4jaJVb2NzCZqYs/BdXVSYhggrUpMiPfZnnFUy70MlMitzA5pXbXFsKYWyay2bCCrHg3LaKI5ikApMHgKosoxNNM6WFzw0EN6CpRFluoVWWvc5QK9kkr0nrPLvNMhfJVorITuYsQZA9GgM0yJP5qCrYDGmiBIRxazGUE9aWedQqz1tnsQs5hlhZkZegVebH5+a1GC9blBb2p4WetdiUWpLvZPustTqzWQsRlWydm2gnFmrlkkR7K5aX9h6OI+pLISV4lNw+c+pEteRXbCs5ojBll6tBlmT2dbZPsQN03oNGzGKEV5CzCI2KJRuxHCPoMmINWgyjhenlroIUoa1KmFmGVZ4laRNUGGvNpBLMC++gwenk+iyez9J5uQC5SLEA8AZZZ9I+xOhif2nh1jT4n9xeECQcly5kGzmvGEdsqVpqTrgTObogV7TWgibNTdDracVtGPOk5A3rBMOyqYWWrXOT4FYImtwiqJGxqNdMAGPuiqEcDArjJ0V1lyCYXIIYnQE/xf+DEXEBaA4A2sBn88HkKain8Rz21WwZmpXNajD75mhcDYqcVx0HmRqbBg2dZGuLrl5JYcLiF8wCewrLoHLRCDRNH6GybK62OSDN6Kqp5c5OxJTZ6a48TemcdWIIN9V3+YzgopZObLyyze6wb2cEDmpZpIZ5k1q1un8L2WtV9srbtIGtZKBJ4KKFtBjFKOdaDKQrIq4ztYIabsHrABc3ly29kikrRtGcCAX9QRyiEveDEFDMzhBYFM5hjjnFsSFoN4ePFdAvoDKi5jxiAn7cIy9xDQ16IEzQUlTvS5mlbP6KuAitnCJzx7CHphi0EWQX5lT5KXMylVjWPKuCvCkMOrXAEDAoL0HZINmCeIZiQLQLdWLphsaY8qd2Hsdh0exrUTRFR7kFfkAKkwx0xfRIezG9Z4UEOj4WCpgnBHJTqEqKAyYBgSZIgR88AgRd+ghRJegtSJOtENK3WaHmBh0evak4IVWfItn+RVpgQd3sZkZrRQvlqSkHYUmdyd8ZUshyI0cGlWojr28tF91ZtLLxLNENWPsUYW1cQnu2mtqlVL9qq9aGlNyBnfXUHiiXbAUWI8o2N0a03weF3AdwBsMPuP6hD79azuEF1O3lxEME21PDLsNOoQ+44WOt0wfGL1XzAshS+bFwNvx4lQFwq2wAbq724X5nrvbbO8EZYrs5wZgnLKN4G2ygjZw7YAqz+cuURYR0UUjc5Fs3aHdLPEX2uPhhGirh8YUPDuvDj7qtnuBqiWS1DXX5RbE1KQjuXGdz3sUrbrFU3WpV4NrjlmHUYokh10i9o23advkErxm7Lluv77TqtTXbeiOK1S9c+ip1L1t3tXjddo+Wnw5CrUkoppfNxrcwHYZ3DNHGCXFYMC2XWc2YOnWdWnAxx+JnvdmU4cNAmxuAsuXe2MByBvzKjRAswm1IwhCrn2cQy0no2wO0j3Brh7bmwpv6Xp2JwPuf6fWLvKSNP/AH4BV6CPw3m+OolYYAb/DE4uGV1TppkF+Z/hUbpkbVNBk2pUYBbWIg3LWLl8ARtoSRgtJyZCSgTRjhrl0YwRG6MXKz4XOGklk+mr5jbjC1y8MJ3T7zsyYpRdObsIFiZNGekIPvlQRWjPSl8Ho0NBYUhQroHRBdG6kGVzQckMWfeWOtFXHCPgoXXpYH62kH7fQhoyd/m+JvycqJJBmjZg2JX8yCcIbu7aZiMTR2dMUgyCvpm2cLozK3R5pKunNEpkr6gtd6+ym8VUnjIHMs40ZBGQe5Lte7zJiqwf1N0dHt7L35dEjtohW152iGGhs77T1JU1tt/SjWIKnXSDYbwdZKDRfnhBzL+kgKp+laSNQUQ9mI+iAqyNedsmpA5jY9cOaTeKBqLRdfJPIKermB5ClTNskLjWTeHbkLaLO8u+ycd5c7SF25TdStTxqMaPUMfWUn+tR1W17XMzCO0I/ltScssBWouoHUvvltpciNWXLD5hsXbXqt+8bVuezcW9e1b6CWpbTD57JNLpMnQjoNfQExMlq2ynY32MsKLwxHV9iNxNEhTjvEDc9d8I2cwKlysycNVdrVhw1V0I26joOtPHJUPR85Zg74vJTZmKKc6noy2x4W/dax2O3odjAnkqLbkW4ujWh5/CUd+o1KHV8WM1pIbXg+k/pwvch+QkVmM1QINrkG2QxoEza5a6fzHQ7RgcZgjQdolxuelMN18hiu24Trfr/xsNPXyeEcY1u/t6i6fnlE7ymj88+JTUaXHmdGKhecD5fY6EYnw/IGzoc7e9fTk1Xe7GVP65f7Sy975jrJuZc9w7yd2//zzezrqV6POTrt43nfuBjmddVu5ZY7ZJnVwVrmZoef3bXOMTHaODyNqebaqaah1I9fShCiTUNo5HRITrliPBWtvfkt/a0yZDeg0QV0P7gvy/nHY3z/BhveAEt3oIY42YccKyRYjexq3+6exrzg2p3t4K4Bzklr2yz32UKzRXZZuH5yhQ7fZTgst+DoXgc5DggGCWjYe9XDonmjxGw04q6xzSyiFz5wsJHl/mwYGpauXj/k7flvdqpuB4zGF0nnvlSYfg87eubOnlnZqumcuWKMgVuXL4/OY4XzqL3p1X+MOd0aqTOGxHJM8Ia/fxvzvD7PKlUV/TSjmYjYsOsxNg55O7fCsm34KzVj0tfvtbPIRja5fd7hKDn4hfPS38aNmcm1ePBo3i0c+R6auN9xSx9vV/tND9sF0R02+Gux9Jr+gY5ZY/fltf12oAXZy75TPLx36dWtBIrV4r8pFWkOZAa/ESr9ln1Dnr702eGPSdSD/zEJVJjn78EGLdlUAe0DyreGXCFMniv6+MsdW+9y/I54ngEibT8/cBjQ8w+Y3KiVOU7JHUbX34X0FmyvEQHG6NuX3Y8quM4EyG/xZtjNWNxrRrpIE+GfjMrK4ArUR0BZJT3/9vCA35Fsdeg4SL2MXmw7vZgf2pmNh75BbkBW+7J49uhwHzI6th10bC79oHaMOVInSA39hHtWHz75NceXVi7WoWICyrrBio3VM+pmqVMr3SoVDayf8Pv9cfsIz8ackHrUKvVwi3EHbWVGrad3kU67SE/vovhPJI4pQr9n0jFT2ObTKacIY86w3XcIHGTmZA8rw9O1x6ZDfk2vF38jpXRLjqxmxdko/KANtIAT9aisg7yaK5f7QLXG8an97hqzimvI/0yH+4ct2GP7sLn2wy8eVhDzN6uz8fuww249T396Y14YK5rqK41PAa1IAa2YDmhT/4rD3P02fot5MIe53kuPAbbbeOHe8uV7z9fvYwq5FSnkTWw5/BhPbtfqKwvb07/HMbrLVbeON+Qxx303WI6y7IDQw2luPc2Nl1w9RbwduKY8rNdnu3A4H8PfAPfOYxTc2n053rbs8B3Zoli4+VVZ8KirXel4/mutPd+DEturjoOhL9r8pnc8UlxTkrPTNzL7kKQO8Z7P7pYa9+grEUOcNcZz/pb8/m9dzZU8yvgm9+Cy1HVSndGtdnar26TOMVZu5nFvSrc3rtF9SHuGv2ndsZR2H5Q6RCqkd1mph3NO2aaAusPqvHE9dtmqat6OHbfqLm1V3I/01yF73LQ374YPwP922bdjiB198pg+bcN5Z5uyqDE13kXd1nqMt9e4YW8s7AI4+nD86/nX97c/nBw/eXT268PyaHL02/G/7r+pn7y31YeT0//8YaHq9PL05LH94W/fvfjp9KcH76Hq4cm3yzsX7vjTw0ev7jx8/gSqik93v9rH5s7n5//+/c4vdwxUvb/4/vPl+1f3zn7/8vLs97PvUGWP1cXr4svZnQfP7ukn5w+g6vLM/ve1efDBX/zkbt/+7R1UHb+7PHv2i7l6/vKdelO5z1D17eQv5c7+uP/4Hw9O7pUPLqDq5OFvxZV1z83jX5+9/3rvLlSVj45f33/0x4N79/96e1WdnECV/3D5z/r0w6sn9u7V1c8v9dGfk7+PXmhlXlwe3dLeTqjw6i0WClisVpafOCxo9eIcC+Xk6Moo5Y9uKUY11BIyVULw1AT0LME6IlvGhoWOwxT6/dEtEOHKaF1AnyJAqHUEC3V0qwwInkcIz6sArzL8kKBPwxY1QE/Q4Qhc69TzDFNbVwKsGVYR+bg+43jNH41WBSBYwUdjlAuVhihhqEFqyLUJ4goh4SZsABYMsZtjiLNC9o0YKYQMnOEpEh8wNqkD/pHqrUGeWRBrYEmQrzN+AZgFsOY0Y5uGt1kA5BgyfILQALJ8gqAuyPQJAgWGBXTYlkdwGidnQRyuMmIcg2V1Fmlm+ZwFmRIGmRJ+B5jldvazwF8E/pbbA/eWl+MqVB1LXiLljGB+SEcRVgh5DZVF5dMiLKoHjh8MsdoHjNLWAYOEkM4wfglYB3wm+r7K7U0kDuCzjEGAgoS1GviExIghGC1kR4SBW8iQEBoYA5wuQdxK3MBiLU9ooRbcMUPcLTx34QCDY2Z8njDqChw1QdA2OGuESBQ4bIbfMkZtggcnDFKDF2eI1RGDXwC3Thi0kKBoAqsBj4+wwilZ2AprWVaP+5nF8+pjWqRHziAcMH4j8Mc0tkdRYr0VbWAiCCEMsQkvyAPfEEsI+jRpjcJCbGEMuoQAw/hC1OPgEb8VbT6J+i+53kcWCwWeDWIVQ5zJBwxaSRh7EhsFWg1c+hAEcSGgMYSeENUYw65JGOSFMMcYRkz4MmEDAlS06gLNCaIhQxwx4ucZg6IhUjJ8lnERbb8wWSx09BBPGWLjiFFCXpupPiZscWfp0NcqWLQO60CLhlDMEITRQXZ0SRCbCcJcPnRFS/ehp4fmCb8WGObFUAYYgwsGMoSwPAxjCOvMaVEjA6F1/SbVO4WeiKXHDYNBDyEKwOYD+DxjHDJhWf8m4RKW6pmnEnWgg25KNFTPU5W4ZT3zUeKYdehbf0+40tG9FujTaqamsmCQNQtf4Yg66LXCIXMBnKoOqvXYm5eO+6ZmcTDG1dwa90od2kJAq1l4T3KxAB7pq1leX4Nr1IqF9DXYZy6cix7AiFYstK/fiu4omuIV+BptJBV+5LFqWD2kJQHTOlmsmjhVvIiabCkVLkQBY52i9TncoVrRAp3CeKxoKIchnS3OUUhXJLpTGP0VSesw+4GEiDDFb472TlO9CRg54HgPhStRQAo1bw5nMFpxKuAMa47nMKy5UMDJOUg7i3JzluAo7GsO5FA4jXwCPhcP0G7Dg4JE5LkpbmvOJqBwngsUQzmdcGyunE9AAalNBdjwuYD9UwH1nAqfRAETAc1ZCBS+ikJBT5ijEj1sLvwQBSKJowUUvooCekvNmQoUznMBd4rmvMVVmLFx4uIwMqX6UtTXmMHxNoMCDRsLtORYOM8FjGeasx1HQSzqzhNL7M6gILRK8S09KSCH0JTaOEUek1IeMFMUjPIcRzmKpjzHgXIR49JrS7ZM+Q1gTBM8Q1wrpTqAca0R05Ioeamtpr7cgfJSSmQAE53k/bGAclPqg4U34glGAE2pTU1RT1NuAxjlptymhsBEKSx1LzSSS5kOYupdhgL6EEpxsHAun3zOT3DLEIMAaT4fMLUJD5AEns5QfkvCUhDTlAkh/i4KFR1ueBWYc5ETrCFcYRuutsgmhXfE2J6yJCygi6HkBAt4gKKMCAtf8xOMR3CcYExWTFkRFlD1lBdBAWknd4kYTYciCBaiH0X8Jj/ACKUpBaopPJCnBohrpXSoJmfPPhQw1fMy6EhDuRFg9AwB15gDwF91DQVcayxQK1qdIw1TkgO4wt1LmU0d/CBjTieoM+CYcSDGbCFizGEixjgcMOZoFK8QY9+IsW/E2Ddi7MuYHB1lV/BvLyHzlfrfn/8HHzFFLwDdAAA="
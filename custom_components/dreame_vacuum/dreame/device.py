@@ -6,11 +6,16 @@ import re
 import copy
 import zlib
 import base64
+import math
 import traceback
+from asyncio import AbstractEventLoop
+from aiohttp import ClientSession
+from collections import deque
 from functools import cmp_to_key
 from datetime import datetime
 from random import randrange
-from threading import Timer
+from threading import Lock, Timer
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 from .types import (
@@ -94,6 +99,18 @@ from .types import (
 )
 from .const import (
     DEVICE_INFO,
+    PROPERTY_CHUNK_SIZE,
+    PROPERTY_CONCURRENCY,
+    PROPERTY_TIER_HOT,
+    PROPERTY_TIER_WARM,
+    PROPERTY_TIER_COLD,
+    PROPERTY_WARM_INTERVAL,
+    PROPERTY_COLD_INTERVAL,
+    PROPERTY_PUSH_TIMEOUT,
+    PROPERTY_WRITE_TIMEOUT,
+    ATTRIBUTE_GROUP_PROPERTIES,
+    ATTRIBUTE_GROUP_STATUS,
+    ATTRIBUTE_GROUP_ROOMS,
     STATE_UNKNOWN,
     STATE_UNAVAILABLE,
     SUCTION_LEVEL_CODE_TO_NAME,
@@ -244,6 +261,7 @@ from .const import (
 )
 from .resources import ERROR_IMAGE
 from .exceptions import (
+    DeviceException,
     DeviceUpdateFailedException,
     InvalidActionException,
     InvalidValueException,
@@ -273,6 +291,13 @@ class DreameVacuumDevice:
         account_type: str = "mi",
         device_id: str = None,
         auth_key: str = None,
+        map_optimizer: str = None,
+        cache_path: str = None,
+        parallel_map_decoding: bool = False,
+        property_chunk_size: int = PROPERTY_CHUNK_SIZE,
+        property_concurrency: int = PROPERTY_CONCURRENCY,
+        session: ClientSession = None,
+        loop: AbstractEventLoop = None,
     ) -> None:
         # Used for easy filtering the device from cloud device list and generating unique ids
         self.info = None
@@ -294,7 +319,15 @@ class DreameVacuumDevice:
         self._ready: bool = False
         # Last settings properties requested time
         self._last_settings_request: float = 0
+        self._last_cold_settings_request: float = 0  # Last rarely changing settings properties requested time
         self._last_map_list_request: float = 0  # Last map list property requested time
+        # Last time a property is received by push or written, used for moving properties between polling tiers
+        self._property_push_time: dict[int, float] = {}
+        self._property_write_time: dict[int, float] = {}
+        # Number of requests saved on each update by the polling tiers for the last hour
+        self._saved_requests: deque[tuple[float, int]] = deque()
+        # Sum of the saved requests, only updated on the update thread so it can be read from any thread
+        self._requests_saved_per_hour: int = 0
         self._last_map_request: float = 0  # Last map request trigger time
         self._last_change: float = 0  # Last property change time
         self._last_update_failed: float = 0  # Last update failed time
@@ -311,6 +344,9 @@ class DreameVacuumDevice:
         self._property_update_callback = {}
         self._update_timer: Timer = None  # Update schedule timer
         self._callback_timer: Timer = None  # Update listener debouncing timer
+        # Properties changed since the update listener is called, None when the changes are not limited to properties
+        self._changed_properties: set[int] | None = set()
+        self._changed_properties_lock: Lock = Lock()
         # Used for requesting consumable properties after reset action otherwise they will only requested when cleaning completed
         self._consumable_change: bool = False
         self._remote_control: bool = False
@@ -319,6 +355,19 @@ class DreameVacuumDevice:
         self._dirty_ai_data: dict[DreameVacuumStrAIProperty | DreameVacuumAIProperty, Any] = None
         self._discard_timeout = 5
         self._restore_timeout = 15
+        # Number of properties requested with a single call and number of calls in flight while polling
+        self._property_chunk_size: int = max(1, property_chunk_size or PROPERTY_CHUNK_SIZE)
+        self._property_concurrency: int = max(1, property_concurrency or PROPERTY_CONCURRENCY)
+        self._property_executor: ThreadPoolExecutor = None
+        self._property_request_stats: dict[str, Any] = {
+            "cycles": 0,
+            "failed": 0,
+            "properties": 0,
+            "chunks": 0,
+            "duration": 0,
+            "average_duration": 0,
+            "max_duration": 0,
+        }
 
         self._name = name
         self.mac = mac
@@ -460,6 +509,28 @@ class DreameVacuumDevice:
             DreameVacuumProperty.AUTO_LDS_LIFTING,
             DreameVacuumProperty.MOP_WASHING_WITH_DETERGENT,
         ]
+        # Settings that are rarely changed and only requested on cold tier interval
+        self._cold_properties = set(
+            [
+                DreameVacuumProperty.DND_TASK,
+                DreameVacuumProperty.SCHEDULE,
+                DreameVacuumProperty.CRUISE_SCHEDULE,
+                DreameVacuumProperty.CHILD_LOCK,
+                DreameVacuumProperty.VOLUME,
+                DreameVacuumProperty.VOICE_PACKET_ID,
+                DreameVacuumProperty.VOICE_ASSISTANT,
+                DreameVacuumProperty.VOICE_ASSISTANT_LANGUAGE,
+                DreameVacuumProperty.TIMEZONE,
+                DreameVacuumProperty.MAP_SAVING,
+                DreameVacuumProperty.OFF_PEAK_CHARGING,
+                DreameVacuumProperty.DND,
+                DreameVacuumProperty.DND_START,
+                DreameVacuumProperty.DND_END,
+                DreameVacuumProperty.DND_DISABLE_RESUME_CLEANING,
+                DreameVacuumProperty.DND_DISABLE_AUTO_EMPTY,
+                DreameVacuumProperty.DND_REDUCE_VOLUME,
+            ]
+        )
 
         self.listen(self._task_status_changed, DreameVacuumProperty.TASK_STATUS)
         self.listen(self._status_changed, DreameVacuumProperty.STATUS)
@@ -507,9 +578,13 @@ class DreameVacuumDevice:
             account_type,
             device_id,
             auth_key,
+            session,
+            loop,
         )
         if self._protocol.cloud:
-            self._map_manager = DreameMapVacuumMapManager(self._protocol)
+            self._map_manager = DreameMapVacuumMapManager(
+                self._protocol, map_optimizer, cache_path, parallel_map_decoding
+            )
 
             self.listen(self._map_list_changed, DreameVacuumProperty.MAP_LIST)
             self.listen(self._recovery_map_list_changed, DreameVacuumProperty.RECOVERY_MAP_LIST)
@@ -549,6 +624,7 @@ class DreameVacuumDevice:
                     prop = DID(param["siid"], param["piid"])
                     if prop is not None:
                         if prop in self._default_properties:
+                            self._property_push_time[prop.value] = time.time()
                             param["did"] = str(prop.value)
                             param["code"] = 0
                             properties.append(param)
@@ -576,6 +652,7 @@ class DreameVacuumDevice:
 
     def _handle_properties(self, properties) -> bool:
         changed = False
+        changed_properties = set()
         callbacks = []
         for prop in properties:
             if not isinstance(prop, dict):
@@ -601,6 +678,9 @@ class DreameVacuumDevice:
                         )
                         del self._dirty_data[did]
                         continue
+                    if self._dirty_data[did].value == value:
+                        # Written value is confirmed, property is not polled on the hot tier anymore
+                        self._property_write_time.pop(did, None)
                     del self._dirty_data[did]
 
                 current_value = self.data.get(did)
@@ -616,6 +696,7 @@ class DreameVacuumDevice:
                         # or did == DreameVacuumProperty.SELF_TEST_STATUS.value
                     ):
                         changed = True
+                        changed_properties.add(did)
                     custom_property = (
                         did == DreameVacuumProperty.AUTO_SWITCH_SETTINGS.value
                         or did == DreameVacuumProperty.AI_DETECTION.value
@@ -655,7 +736,9 @@ class DreameVacuumDevice:
         if changed:
             self._last_change = time.time()
             if self._ready:
-                self._property_changed()
+                self._property_changed(properties=changed_properties)
+            else:
+                self.status.invalidate_attributes(changed_properties)
 
         if not self._ready:
             if self._protocol.dreame_cloud:
@@ -786,16 +869,101 @@ class DreameVacuumDevice:
                 if "aiid" not in mapping and (not self._ready or prop.value in self.data):
                     property_list.append({"did": str(prop.value), **mapping})
 
-        props = property_list.copy()
+        chunks = [
+            property_list[i : i + self._property_chunk_size]
+            for i in range(0, len(property_list), self._property_chunk_size)
+        ]
         results = []
-        while props:
-            result = self._protocol.get_properties(props[:15])
-            if result is not None:
-                results.extend(result)
-                props[:] = props[15:]
+        start = time.perf_counter()
+        try:
+            executor = self._get_property_executor() if len(chunks) > 1 else None
+            if executor:
+                # Keep multiple chunks in flight, responses are merged in request order
+                for result in executor.map(self._request_property_chunk, chunks):
+                    results.extend(result)
+            else:
+                for chunk in chunks:
+                    results.extend(self._request_property_chunk(chunk))
+        except Exception:
+            self._property_request_stats["failed"] = self._property_request_stats["failed"] + 1
+            raise
+        self._update_property_request_stats(len(property_list), len(chunks), time.perf_counter() - start)
 
         return self._handle_properties(results)
 
+    def _schedule_properties(
+        self, now: float, properties: list[DreameVacuumProperty], settings_properties: list[DreameVacuumProperty]
+    ) -> tuple[list[DreameVacuumProperty], int]:
+        """Select the properties to be requested on this update by their polling tiers.
+        Read-only properties are on hot tier and requested on every update, settings are on warm tier and rarely changing settings are on cold tier.
+        A property received by push recently is moved to the next slower tier and a property written recently is moved to the hot tier
+        until the written value is received from the device or PROPERTY_WRITE_TIMEOUT is passed.
+        Also returns the number of properties that would be requested when all settings are requested together, written properties are always included.
+        """
+        # All settings are requested after an action or property write
+        cold = not self._last_settings_request or now - self._last_cold_settings_request > PROPERTY_COLD_INTERVAL
+        due = [True, now - self._last_settings_request > PROPERTY_WARM_INTERVAL, cold]
+        if due[PROPERTY_TIER_WARM]:
+            self._last_settings_request = now
+        if due[PROPERTY_TIER_COLD]:
+            self._last_cold_settings_request = now
+
+        scheduled = {}
+        untiered = {}
+        for tier, props in ((PROPERTY_TIER_HOT, properties), (PROPERTY_TIER_WARM, settings_properties)):
+            for prop in props:
+                if tier == PROPERTY_TIER_HOT or due[PROPERTY_TIER_WARM]:
+                    untiered[prop] = None
+                if now - self._property_write_time.get(prop.value, 0) < PROPERTY_WRITE_TIMEOUT:
+                    prop_tier = PROPERTY_TIER_HOT
+                    untiered[prop] = None
+                else:
+                    prop_tier = PROPERTY_TIER_COLD if prop in self._cold_properties else tier
+                    if now - self._property_push_time.get(prop.value, 0) < PROPERTY_PUSH_TIMEOUT:
+                        prop_tier = min(prop_tier + 1, PROPERTY_TIER_COLD)
+                if due[prop_tier]:
+                    scheduled[prop] = None
+        return list(scheduled), len(untiered)
+
+    def _record_saved_requests(self, now: float, saved: int) -> None:
+        self._saved_requests.append((now, saved))
+        while now - self._saved_requests[0][0] > 3600:
+            self._saved_requests.popleft()
+        self._requests_saved_per_hour = sum(v for _, v in self._saved_requests)
+
+    def _request_property_chunk(self, chunk: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        result = self._protocol.get_properties(chunk)
+        if result is None:
+            # Requesting the same chunk again blocks the update forever when device does not respond
+            raise DeviceException("Unable to get properties") from None
+        return result
+
+    def _get_property_executor(self) -> ThreadPoolExecutor | None:
+        # Local protocol shares a single message id sequence so requests can only be sent in parallel over the cloud
+        if (
+            self._property_executor is None
+            and self._property_concurrency > 1
+            and self._protocol.parallel_requests
+            and not self.disconnected
+        ):
+            self._property_executor = ThreadPoolExecutor(
+                max_workers=self._property_concurrency, thread_name_prefix="dreame_vacuum_properties"
+            )
+        return self._property_executor
+
+    def _update_property_request_stats(self, properties: int, chunks: int, duration: float) -> None:
+        stats = self._property_request_stats
+        duration = round(duration * 1000, 1)
+        stats["cycles"] = stats["cycles"] + 1
+        stats["properties"] = properties
+        stats["chunks"] = chunks
+        stats["duration"] = duration
+        stats["average_duration"] = round(
+            stats["average_duration"] + (duration - stats["average_duration"]) / stats["cycles"], 1
+        )
+        stats["max_duration"] = max(stats["max_duration"], duration)
+        _LOGGER.debug("Requested %s properties in %s chunks: %sms", properties, chunks, duration)
+
     def _update_status(self, task_status: DreameVacuumTaskStatus, status: DreameVacuumStatus) -> None:
         """Update status properties on memory for map renderer to update the image before action is sent to the device."""
         if task_status is not DreameVacuumTaskStatus.COMPLETED:
@@ -835,7 +1003,9 @@ class DreameVacuumDevice:
                     and prop != DreameVacuumProperty.STATE
                     and prop != DreameVacuumProperty.AUTO_EMPTY_STATUS
                 ):
-                    self._property_changed(delay)
+                    self._property_changed(delay, {did})
+                else:
+                    self.status.invalidate_attributes({did})
                 return current_value if current_value is not None else value
         return None
 
@@ -1830,17 +2000,33 @@ class DreameVacuumDevice:
             except Exception as ex:
                 _LOGGER.warning("Get Cleaning History failed!: %s", ex)
 
-    def _property_changed(self, delay=True) -> None:
+    def _property_changed(self, delay=True, properties: set[int] = None) -> None:
         """Call external listener when a property changed"""
+        self.status.invalidate_attributes(properties)
         if self._update_callback:
+            # Listener is notified about every property changed since the last call, or about entire device
+            with self._changed_properties_lock:
+                if properties is None or self._changed_properties is None:
+                    self._changed_properties = None
+                else:
+                    self._changed_properties.update(properties)
+
             if self._callback_timer is not None:
                 self._callback_timer.cancel()
 
             if delay:
-                self._callback_timer = Timer(0.1, self._update_callback)
+                self._callback_timer = Timer(0.1, self._call_update_callback)
                 self._callback_timer.start()
             else:
-                self._update_callback()
+                self._call_update_callback()
+
+    def _call_update_callback(self) -> None:
+        with self._changed_properties_lock:
+            properties = self._changed_properties
+            self._changed_properties = set()
+        if self._update_callback:
+            # Listener receives an immutable copy because it is processed on another thread
+            self._update_callback(properties=frozenset(properties) if properties is not None else None)
 
     def _map_updated(self) -> None:
         """Call external listener when a map updated from local"""
@@ -2277,6 +2463,9 @@ class DreameVacuumDevice:
         self._protocol.disconnect()
         if self._map_manager:
             self._map_manager.disconnect()
+        if self._property_executor:
+            self._property_executor.shutdown(wait=False, cancel_futures=True)
+            self._property_executor = None
         self._property_changed(False)
 
     def listen(self, callback, property: DreameVacuumProperty = None) -> None:
@@ -2593,6 +2782,7 @@ class DreameVacuumDevice:
 
             self._last_change = time.time()
             self._last_settings_request = 0
+            self._property_write_time[prop.value] = self._last_change
 
             try:
                 mapping = self.property_mapping[prop]
@@ -2635,6 +2825,10 @@ class DreameVacuumDevice:
         For example if device is running but not mopping renderer does not show no mopping areas and this function handles that so renderer does not need device data too.
         """
         if map_data:
+            if map_data.saved_map and map_data.pixel_type is None:
+                # Saved map is not decoded yet, it is rendered when map manager decodes it
+                return None
+
             if map_data.need_optimization:
                 map_data = self._map_manager.optimizer.optimize(
                     map_data,
@@ -2642,7 +2836,7 @@ class DreameVacuumDevice:
                 )
                 map_data.need_optimization = False
 
-            render_map_data = copy.deepcopy(map_data)
+            render_map_data = map_data.snapshot()
             if (
                 not self.capability.lidar_navigation
                 and self.status.docked
@@ -2650,10 +2844,14 @@ class DreameVacuumDevice:
                 and map_data.saved_map_status == 1
             ):
                 saved_map_data = self._map_manager.selected_map
-                render_map_data.segments = copy.deepcopy(saved_map_data.segments)
-                render_map_data.data = copy.deepcopy(saved_map_data.data)
-                render_map_data.pixel_type = copy.deepcopy(saved_map_data.pixel_type)
-                render_map_data.dimensions = copy.deepcopy(saved_map_data.dimensions)
+                render_map_data.segments = (
+                    {k: copy.copy(v) for k, v in saved_map_data.segments.items()}
+                    if saved_map_data.segments is not None
+                    else None
+                )
+                render_map_data.data = saved_map_data.data
+                render_map_data.pixel_type = saved_map_data.pixel_type
+                render_map_data.dimensions = saved_map_data.dimensions.copy()
                 render_map_data.charger_position = copy.deepcopy(saved_map_data.charger_position)
                 render_map_data.no_go_areas = saved_map_data.no_go_areas
                 render_map_data.no_mopping_areas = saved_map_data.no_mopping_areas
@@ -2852,8 +3050,7 @@ class DreameVacuumDevice:
                 # App does not render pet obstacles when pet detection turned off
                 # App does not render stain obstacles when stain avoidance turned off
                 if render_map_data.obstacles:
-                    obstacles = copy.deepcopy(render_map_data.obstacles)
-                    for k, v in obstacles.items():
+                    for k, v in list(render_map_data.obstacles.items()):
                         if (
                             (v.type == ObstacleType.PET and self.status.ai_pet_detection == 0)
                             or (
@@ -3076,40 +3273,42 @@ class DreameVacuumDevice:
                     ]
                 )
 
-        if now - self._last_settings_request > 9.5:
-            self._last_settings_request = now
+        # Settings properties
+        settings_properties = []
+        if not self._consumable_change and self.status.washing:
+            settings_properties.extend(
+                [
+                    DreameVacuumProperty.DETERGENT_LEFT,
+                    DreameVacuumProperty.DETERGENT_TIME_LEFT,
+                    DreameVacuumProperty.SQUEEGEE_LEFT,
+                    DreameVacuumProperty.SQUEEGEE_TIME_LEFT,
+                    DreameVacuumProperty.ONBOARD_DIRTY_WATER_TANK_LEFT,
+                    DreameVacuumProperty.ONBOARD_DIRTY_WATER_TANK_TIME_LEFT,
+                    DreameVacuumProperty.DIRTY_WATER_TANK_LEFT,
+                    DreameVacuumProperty.DIRTY_WATER_TANK_TIME_LEFT,
+                    DreameVacuumProperty.SCALE_INHIBITOR_LEFT,
+                    DreameVacuumProperty.SCALE_INHIBITOR_TIME_LEFT,
+                    DreameVacuumProperty.DEODORIZER_LEFT,
+                    DreameVacuumProperty.DEODORIZER_TIME_LEFT,
+                ]
+            )
 
-            if not self._consumable_change and self.status.washing:
-                properties.extend(
-                    [
-                        DreameVacuumProperty.DETERGENT_LEFT,
-                        DreameVacuumProperty.DETERGENT_TIME_LEFT,
-                        DreameVacuumProperty.SQUEEGEE_LEFT,
-                        DreameVacuumProperty.SQUEEGEE_TIME_LEFT,
-                        DreameVacuumProperty.ONBOARD_DIRTY_WATER_TANK_LEFT,
-                        DreameVacuumProperty.ONBOARD_DIRTY_WATER_TANK_TIME_LEFT,
-                        DreameVacuumProperty.DIRTY_WATER_TANK_LEFT,
-                        DreameVacuumProperty.DIRTY_WATER_TANK_TIME_LEFT,
-                        DreameVacuumProperty.SCALE_INHIBITOR_LEFT,
-                        DreameVacuumProperty.SCALE_INHIBITOR_TIME_LEFT,
-                        DreameVacuumProperty.DEODORIZER_LEFT,
-                        DreameVacuumProperty.DEODORIZER_TIME_LEFT,
-                    ]
-                )
+        settings_properties.extend(self._read_write_properties)
 
-            properties.extend(self._read_write_properties)
+        if not self.capability.dnd_task:
+            settings_properties.extend(
+                [
+                    DreameVacuumProperty.DND,
+                    DreameVacuumProperty.DND_START,
+                    DreameVacuumProperty.DND_END,
+                ]
+            )
 
-            if not self.capability.dnd_task:
-                properties.extend(
-                    [
-                        DreameVacuumProperty.DND,
-                        DreameVacuumProperty.DND_START,
-                        DreameVacuumProperty.DND_END,
-                    ]
-                )
+        properties, untiered_count = self._schedule_properties(now, properties, settings_properties)
 
         if self._map_manager and not self.status.running and now - self._last_map_list_request > 60:
             properties.extend([DreameVacuumProperty.MAP_LIST, DreameVacuumProperty.RECOVERY_MAP_LIST])
+            untiered_count = untiered_count + 2
             self._last_map_list_request = time.time()
 
         try:
@@ -3118,6 +3317,11 @@ class DreameVacuumDevice:
 
             if not self._protocol.dreame_cloud or force_request_properties:
                 self._request_properties(properties)
+                self._record_saved_requests(
+                    now,
+                    math.ceil(untiered_count / self._property_chunk_size)
+                    - math.ceil(len(properties) / self._property_chunk_size),
+                )
             elif self.status.map_backup_status:
                 self._request_properties([DreameVacuumProperty.MAP_BACKUP_STATUS])
             elif self.status.map_recovery_status:
@@ -6113,6 +6317,24 @@ class DreameVacuumDevice:
             return 3 if self.status.running else 10 if self.status.active else 30
         return -1
 
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return runtime statistics of the device for diagnostics."""
+        return {
+            "map_manager": self._map_manager.diagnostics if self._map_manager else None,
+            "property_requests": {
+                **self._property_request_stats,
+                "chunk_size": self._property_chunk_size,
+                "concurrency": self._property_concurrency if self._property_executor else 1,
+                "saved_per_hour": self.requests_saved_per_hour,
+            },
+        }
+
+    @property
+    def requests_saved_per_hour(self) -> int:
+        """Return the number of property requests saved by the polling tiers in the last hour."""
+        return self._requests_saved_per_hour
+
     @property
     def name(self) -> str:
         """Return the name of the device."""
@@ -6217,6 +6439,10 @@ class DreameVacuumDeviceStatus:
         self.off_peak_charging_config = None
         self.shortcuts = None
 
+        self._attributes = None
+        self._attribute_groups: dict[str, dict[str, Any]] = {}
+        self._attributes_version = 0
+
     def _get_property(self, prop: DreameVacuumProperty) -> Any:
         """Helper function for accessing a property from device"""
         return self._device.get_property(prop)
@@ -8314,9 +8540,43 @@ class DreameVacuumDeviceStatus:
                 details[ATTR_ACTIVE_CRUISE_POINTS] = map_data.active_cruise_points
         return details
 
+    def invalidate_attributes(self, properties: set[int] = None) -> None:
+        """Drop the cached attribute groups depending on the changed properties"""
+        self._attributes_version = self._attributes_version + 1
+        if properties is None:
+            self._attribute_groups = {}
+        else:
+            # Rooms are only changed with the map data which is notified without properties
+            self._attribute_groups.pop(ATTRIBUTE_GROUP_PROPERTIES, None)
+            self._attribute_groups.pop(ATTRIBUTE_GROUP_STATUS, None)
+
+    def _cached_attributes(self, group: str, builder) -> dict[str, Any]:
+        attributes = self._attribute_groups.get(group)
+        if attributes is None:
+            version = self._attributes_version
+            attributes = builder()
+            # Do not store a group that is invalidated while it was being generated
+            if self._device._ready and version == self._attributes_version:
+                self._attribute_groups[group] = attributes
+        return attributes
+
     @property
     def attributes(self) -> dict[str, Any] | None:
         """Return the attributes of the device."""
+        attributes = {
+            **self._cached_attributes(ATTRIBUTE_GROUP_PROPERTIES, self._property_attributes),
+            **self._cached_attributes(ATTRIBUTE_GROUP_STATUS, self._status_attributes),
+        }
+        attributes[ATTR_FIRMWARE_VERSION] = self._device.info.version
+        attributes[ATTR_AP] = self._device.info.ap
+        attributes[ATTR_CAPABILITIES] = self._capability.list
+
+        # Return the same object when nothing is changed so listeners can skip the state write
+        if attributes != self._attributes:
+            self._attributes = attributes
+        return self._attributes
+
+    def _property_attributes(self) -> dict[str, Any]:
         properties = [
             DreameVacuumProperty.STATUS,
             DreameVacuumProperty.CLEANING_MODE,
@@ -8813,7 +9073,10 @@ class DreameVacuumDeviceStatus:
                 elif prop in boolean_properties:
                     value = bool(value > 0)
                 attributes[prop_name] = value
+        return attributes
 
+    def _status_attributes(self) -> dict[str, Any]:
+        attributes = {}
         if self._capability.dnd_task and self.dnd_tasks is not None:
             attributes[ATTR_DND] = {}
             for dnd_task in self.dnd_tasks:
@@ -8890,11 +9153,7 @@ class DreameVacuumDeviceStatus:
             attributes[ATTR_SELECTED_MAP] = self.selected_map.map_name if self.selected_map else None
             attributes[ATTR_SELECTED_MAP_ID] = self.selected_map.map_id if self.selected_map else None
             attributes[ATTR_SELECTED_MAP_INDEX] = self.current_map.map_index if self.current_map else None
-            attributes[ATTR_ROOMS] = {}
-            for k, v in self.map_data_list.items():
-                attributes[ATTR_ROOMS][v.map_name] = [
-                    {ATTR_ID: j, ATTR_NAME: s.name, ATTR_ICON: s.icon} for (j, s) in sorted(v.segments.items())
-                ]
+            attributes[ATTR_ROOMS] = self._cached_attributes(ATTRIBUTE_GROUP_ROOMS, self._room_attributes)
 
         if self._capability.carpet_recognition:
             attributes[ATTR_CARPET_AVOIDANCE] = self.carpet_avoidance
@@ -8904,11 +9163,16 @@ class DreameVacuumDeviceStatus:
 
         if self._capability.shortcuts:
             attributes[ATTR_SHORTCUT_TASK] = self.shortcut_task
-        attributes[ATTR_FIRMWARE_VERSION] = self._device.info.version
-        attributes[ATTR_AP] = self._device.info.ap
-        attributes[ATTR_CAPABILITIES] = self._capability.list
         return attributes
 
+    def _room_attributes(self) -> dict[str, Any]:
+        rooms = {}
+        for k, v in self.map_data_list.items():
+            rooms[v.map_name] = [
+                {ATTR_ID: j, ATTR_NAME: s.name, ATTR_ICON: s.icon} for (j, s) in sorted(v.segments.items())
+            ]
+        return rooms
+
     def consumable_life_warning_description(self, consumable_property) -> str:
         description = CONSUMABLE_TO_LIFE_WARNING_DESCRIPTION.get(consumable_property)
         if description:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import io
+import os
 import math
 import time
 import base64
@@ -9,6 +10,7 @@ import re
 import logging
 import traceback
 import copy
+import pickle
 import numpy as np
 import hashlib
 import textwrap
@@ -32,7 +34,9 @@ from time import sleep
 from io import BytesIO
 from typing import Optional, Tuple
 from functools import cmp_to_key
-from threading import Timer
+from threading import Timer, Lock
+from multiprocessing import get_context
+from concurrent.futures import Executor, ProcessPoolExecutor
 from .resources import *
 from .protocol import DreameVacuumProtocol
 from .exceptions import DeviceUpdateFailedException
@@ -57,6 +61,7 @@ from .types import (
     MapFrameType,
     MapPixelType,
     Path,
+    PathList,
     Area,
     Wall,
     Carpet,
@@ -70,12 +75,15 @@ from .types import (
     MapImageDimensions,
     MapRendererLayer,
     MapRendererColorScheme,
+    MapRendererEncoder,
     MapRendererConfig,
     MapRendererData,
     MapRendererResources,
     RecoveryMapInfo,
     MAP_COLOR_SCHEME_LIST,
     MAP_ICON_SET_LIST,
+    MAP_OPTIMIZER_LIST,
+    MAP_ENCODER_LIST,
     SEGMENT_TYPE_CODE_TO_NAME,
     SEGMENT_TYPE_CODE_TO_HA_ICON,
     FURNITURE_TYPE_TO_DIMENSIONS,
@@ -141,13 +149,141 @@ from .const import (
     MAP_DATA_JSON_PARAMETER_FLOOR,
     MAP_DATA_JSON_PARAMETER_WALL,
     MAP_DATA_JSON_PARAMETER_SEGMENT,
+    MAP_DATA_JSON_PARAMETER_MAP_VERSION,
+    MAP_DATA_JSON_PARAMETER_BASE_VERSION,
+    MAP_DATA_JSON_PARAMETER_APPENDED_ENTITIES,
+    MAP_DATA_JSON_PARAMETER_INDEX,
+    MAP_DATA_JSON_PARAMETER_OFFSET,
+    MAP_DATA_JSON_DELTA_CLASS,
+    MAP_DATA_STRING_ENCODING_ZLIB,
+    MAP_CACHE_SIZE,
+    MAP_FRAME_CACHE_SIZE,
+    MAP_SAVED_MAP_MEMORY_LIMIT,
+    MAP_DECODE_PROCESS_COUNT,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class DreameVacuumMapCache:
+    """Size bounded LRU disk cache for downloaded cloud objects and maps decoded from them.
+    Entries are keyed by object name and key, payload md5 is stored with the entry and validated on read.
+    """
+
+    # Increase when stored MapData structure changes to invalidate the decoded entries
+    VERSION = 2
+
+    def __init__(self, path: str, max_size: int = MAP_CACHE_SIZE) -> None:
+        self._path = path
+        self._max_size = max_size
+        self._size = 0
+        self._entries: dict[str, int] = None  # File name and size, ordered by last access
+        self._lock = Lock()
+
+    def _load(self) -> None:
+        if self._entries is not None:
+            return
+
+        self._entries = {}
+        try:
+            os.makedirs(self._path, exist_ok=True)
+            files = []
+            for name in os.listdir(self._path):
+                if name.endswith(".bin"):
+                    stat = os.stat(os.path.join(self._path, name))
+                    files.append((stat.st_mtime, name, stat.st_size))
+            for _, name, size in sorted(files):
+                self._entries[name] = size
+                self._size = self._size + size
+        except OSError as ex:
+            _LOGGER.warning("Map cache load failed: %s", ex)
+
+    def _file_name(self, type: str, object_name: str, key: Any) -> str:
+        version = self.VERSION if type == "map" else 0
+        return f"{type}-{hashlib.sha1(f'{object_name}:{key}:{version}'.encode('utf-8')).hexdigest()}.bin"
+
+    def _remove(self, name: str) -> None:
+        self._size = self._size - self._entries.pop(name, 0)
+        try:
+            os.remove(os.path.join(self._path, name))
+        except OSError:
+            pass
+
+    def _get(self, type: str, object_name: str, key: Any) -> bytes | None:
+        with self._lock:
+            self._load()
+            name = self._file_name(type, object_name, key)
+            if name not in self._entries:
+                return None
+
+            path = os.path.join(self._path, name)
+            try:
+                with open(path, "rb") as file:
+                    content = file.read()
+                data = zlib.decompress(content[16:])
+                if hashlib.md5(data).digest() != content[:16]:
+                    raise ValueError("md5 mismatch")
+                os.utime(path)
+            except Exception as ex:
+                _LOGGER.warning("Map cache entry %s is invalid: %s", name, ex)
+                self._remove(name)
+                return None
+
+            self._entries[name] = self._entries.pop(name)
+            return data
+
+    def _set(self, type: str, object_name: str, key: Any, data: bytes) -> None:
+        content = hashlib.md5(data).digest() + zlib.compress(data, 1)
+        if len(content) > self._max_size:
+            return
+
+        with self._lock:
+            self._load()
+            name = self._file_name(type, object_name, key)
+            if name in self._entries:
+                self._remove(name)
+
+            while self._entries and self._size + len(content) > self._max_size:
+                self._remove(next(iter(self._entries)))
+
+            path = os.path.join(self._path, name)
+            try:
+                with open(f"{path}.tmp", "wb") as file:
+                    file.write(content)
+                os.replace(f"{path}.tmp", path)
+            except OSError as ex:
+                _LOGGER.warning("Map cache write failed: %s", ex)
+                return
+
+            self._entries[name] = len(content)
+            self._size = self._size + len(content)
+
+    def get_file(self, object_name: str, key: Any = None) -> bytes | None:
+        return self._get("file", object_name, key)
+
+    def set_file(self, object_name: str, key: Any, data: bytes) -> None:
+        self._set("file", object_name, key, data)
+
+    def get_map(self, object_name: str, key: Any = None) -> MapData | None:
+        data = self._get("map", object_name, key)
+        if data is not None:
+            try:
+                return pickle.loads(data)
+            except Exception as ex:
+                _LOGGER.warning("Map cache entry %s decoding failed: %s", object_name, ex)
+
+    def set_map(self, object_name: str, key: Any, map_data: MapData) -> None:
+        self._set("map", object_name, key, pickle.dumps(map_data, protocol=pickle.HIGHEST_PROTOCOL))
+
+
 class DreameMapVacuumMapManager:
-    def __init__(self, _protocol: DreameVacuumProtocol) -> None:
+    def __init__(
+        self,
+        _protocol: DreameVacuumProtocol,
+        map_optimizer: str = None,
+        cache_path: str = None,
+        parallel_map_decoding: bool = False,
+    ) -> None:
         self._map_list_object_name: str = None
         self._map_list_md5: str = None
         self._recovery_map_list_object_name: str = None
@@ -164,12 +300,19 @@ class DreameMapVacuumMapManager:
         self._ready: bool = False
         self._connected: bool = True
         self._vslam_map: bool = False
+        self._frame_cache_hits: int = 0
+        self._frame_cache_misses: int = 0
+        self._frame_cache_skipped: int = 0
+        self._parallel_map_decoding: bool = parallel_map_decoding
+        self._decode_executor: ProcessPoolExecutor = None
+        self._saved_map_lock = Lock()
 
         self._init_data()
 
         self._protocol = _protocol
         self.editor = DreameMapVacuumMapEditor(self)
-        self.optimizer = DreameVacuumMapOptimizer()
+        self.optimizer = DreameVacuumMapOptimizer(map_optimizer)
+        self._cache = DreameVacuumMapCache(cache_path) if cache_path else None
 
     def _init_data(self) -> None:
         self._map_data: MapData = None
@@ -178,6 +321,14 @@ class DreameMapVacuumMapManager:
         self._current_timestamp_ms: int = None
         self._file_urls: dict[str, str] = {}
         self._saved_map_data: dict[int, MapData] = {}
+        # Raw map strings of the saved maps for decoding them when they are first accessed
+        self._saved_map_raw: dict[int, Tuple[str, str, int]] = {}
+        # Decoded saved maps in least recently used order
+        self._saved_map_loaded: dict[int, int] = {}
+        # Saved maps that are accessed before they are decoded
+        self._saved_map_requests: set[int] = set()
+        # Saved maps that are never decoded and only have the info from the map list
+        self._saved_map_headers: set[int] = set()
         self._map_list: list[int] = []
         self._need_map_request: bool = False
         self._need_new_map: bool = False
@@ -200,6 +351,8 @@ class DreameMapVacuumMapManager:
         self._new_map_request_time: int = None
         self._aes_iv: str = None
         self._capability: DreameVacuumDeviceCapability = None
+        # Decoded partial maps of the recently received payloads for dropping the duplicates
+        self._frame_cache: dict[str, MapDataPartial] = {}
 
     def _request_map_from_cloud(self) -> bool:
         if self._protocol.cloud.dreame_cloud:
@@ -252,12 +405,17 @@ class DreameMapVacuumMapManager:
             self._latest_map_data_time = map_data_result[0][MAP_PARAMETER_TIME] + 1
 
             for data in map_data_result:
-                partial_map_data.append(
-                    self._decode_map_partial(
-                        json.loads(data[MAP_PARAMETER_VALUE if MAP_PARAMETER_VALUE in data else "val"])[0],
+                raw_map = json.loads(data[MAP_PARAMETER_VALUE if MAP_PARAMETER_VALUE in data else "val"])[0]
+                digest, partial_map = self._get_cached_partial_map(raw_map)
+                if partial_map is None:
+                    partial_map = self._decode_map_partial(
+                        raw_map,
                         data[MAP_PARAMETER_TIME] * 1000 if data.get(MAP_PARAMETER_TIME) else None,
                     )
-                )
+                    self._cache_partial_map(digest, partial_map)
+                elif self._skip_duplicate_frame(partial_map):
+                    continue
+                partial_map_data.append(partial_map)
 
         object_name = None
         object_name_timestamp = None
@@ -548,16 +706,18 @@ class DreameMapVacuumMapManager:
 
         return len(self._map_data_queue[self._latest_map_id])
 
-    def _get_object_file_data(self, object_name: str = "", timestamp=None) -> Tuple[Any, Optional[str]]:
+    def _get_object_file_data(
+        self, object_name: str = "", timestamp=None, stream: bool = False
+    ) -> Tuple[Any, Optional[str]]:
         key = None
         if object_name and "," in object_name:
             values = object_name.split(",")
             object_name = values[0]
             key = values[1]
-        response = self._get_interim_file_data(object_name, timestamp)
+        response = self._get_interim_file_data(object_name, timestamp, stream)
         return response, key
 
-    def _get_interim_file_data(self, object_name: str = "", timestamp=None) -> str | None:
+    def _get_interim_file_data(self, object_name: str = "", timestamp=None, stream: bool = False) -> str | None:
         if self._protocol.cloud.logged_in:
             if object_name is None or object_name == "":
                 _LOGGER.info("Get object name from cloud")
@@ -580,7 +740,9 @@ class DreameMapVacuumMapManager:
             url = self._get_file_url(object_name)
             if url:
                 _LOGGER.info("Request map data from cloud %s", url)
-                response = self._protocol.cloud.get_file(url)
+                response = (
+                    self._protocol.cloud.get_file_stream(url) if stream else self._protocol.cloud.get_file(url)
+                )
                 if response is not None:
                     return response
                 _LOGGER.warning("Request map data from cloud failed %s", url)
@@ -609,8 +771,206 @@ class DreameMapVacuumMapManager:
                 url = self._file_urls[object_name][MAP_PARAMETER_URL]
         return url
 
+    def _get_cached_partial_map(self, payload: str) -> Tuple[str, Optional[MapDataPartial]]:
+        digest = hashlib.md5(payload.encode("utf8")).hexdigest()
+        partial_map = self._frame_cache.get(digest)
+        if partial_map is None:
+            self._frame_cache_misses = self._frame_cache_misses + 1
+        else:
+            self._frame_cache_hits = self._frame_cache_hits + 1
+        return digest, partial_map
+
+    def _cache_partial_map(self, digest: str, partial_map: MapDataPartial) -> None:
+        if partial_map is not None and partial_map.raw is not None:
+            while len(self._frame_cache) >= MAP_FRAME_CACHE_SIZE:
+                del self._frame_cache[next(iter(self._frame_cache))]
+            self._frame_cache[digest] = partial_map
+
+    def _skip_duplicate_frame(self, partial_map: MapDataPartial) -> bool:
+        # Same payload is received again after its frame is added to the current map
+        if (
+            partial_map.map_id == self._current_map_id
+            and self._current_frame_id is not None
+            and partial_map.frame_id <= self._current_frame_id
+        ):
+            self._frame_cache_skipped = self._frame_cache_skipped + 1
+            _LOGGER.debug("Skip duplicate frame %s:%s", partial_map.map_id, partial_map.frame_id)
+            return True
+        return False
+
+    def _get_saved_map(self, map_id: int) -> MapData | None:
+        # Called from properties, saved maps are never decoded here but requested from the update thread instead
+        saved_map_data = self._saved_map_data.get(map_id)
+        if saved_map_data is None:
+            return None
+
+        with self._saved_map_lock:
+            if map_id in self._saved_map_loaded:
+                self._saved_map_loaded[map_id] = self._saved_map_loaded.pop(map_id)
+                return saved_map_data
+        if saved_map_data.pixel_type is None:
+            self._request_saved_map(map_id)
+        return saved_map_data
+
+    def _request_saved_map(self, map_id: int) -> None:
+        # Requested maps are decoded one batch after another on a single timer thread
+        with self._saved_map_lock:
+            if map_id in self._saved_map_raw and map_id not in self._saved_map_requests and not self._disconnected:
+                start = not self._saved_map_requests
+                self._saved_map_requests.add(map_id)
+                if start:
+                    Timer(0, self._decode_requested_saved_maps).start()
+
+    def _decode_saved_map(self, map_id: int) -> MapData | None:
+        saved_map_data = self._saved_map_data.get(map_id)
+        if (
+            saved_map_data is not None
+            and saved_map_data.pixel_type is None
+            and map_id not in self._saved_map_loaded
+            and map_id in self._saved_map_raw
+        ):
+            digest, raw_map, rotation = self._saved_map_raw[map_id]
+            saved_map_data = self._load_saved_map(
+                map_id,
+                saved_map_data,
+                DreameVacuumMapDecoder.decode_saved_maps([(raw_map, rotation)], self._vslam_map, self._aes_iv)[0],
+            )
+        return saved_map_data
+
+    def _decode_requested_saved_maps(self) -> None:
+        while True:
+            with self._saved_map_lock:
+                map_ids = list(self._saved_map_requests)
+            try:
+                self._get_saved_maps(map_ids)
+            except Exception:
+                _LOGGER.warning("Decode saved maps failed: %s", traceback.format_exc())
+
+            # Render the decoded maps and update the segments of the map list
+            for map_id in map_ids:
+                if map_id in self._saved_map_loaded:
+                    self.editor.refresh_map(map_id)
+
+            with self._saved_map_lock:
+                self._saved_map_requests.difference_update(map_ids)
+                if not self._saved_map_requests or self._disconnected:
+                    self._saved_map_requests.clear()
+                    return
+
+    def _get_saved_maps(self, map_ids: list[int]) -> None:
+        # Only called from the update and timer threads of the map manager, waits for the decode executor
+        map_ids = [
+            map_id
+            for map_id in map_ids
+            if map_id in self._saved_map_raw
+            and map_id not in self._saved_map_loaded
+            and self._saved_map_data[map_id].pixel_type is None
+        ]
+        if len(map_ids) > 1:
+            executor = self._get_decode_executor()
+            if executor:
+                _LOGGER.debug("Decode saved maps in parallel: %s", map_ids)
+                results = DreameVacuumMapDecoder.decode_saved_maps(
+                    [self._saved_map_raw[map_id][1:] for map_id in map_ids], self._vslam_map, self._aes_iv, executor
+                )
+                for map_id, saved_map_data in zip(map_ids, results):
+                    self._load_saved_map(map_id, self._saved_map_data[map_id], saved_map_data)
+                return
+
+        for map_id in map_ids:
+            self._decode_saved_map(map_id)
+
+    def _get_decode_executor(self) -> Executor | None:
+        if self._decode_executor is None and self._parallel_map_decoding and not self._disconnected:
+            # Calling thread also decodes a map
+            processes = min((os.cpu_count() or 1) - 1, MAP_DECODE_PROCESS_COUNT)
+            if processes > 0:
+                # Forking a multi threaded process is not safe
+                self._decode_executor = ProcessPoolExecutor(processes, mp_context=get_context("spawn"))
+        return self._decode_executor
+
+    def _load_saved_map(self, map_id: int, saved_map_info: MapData, saved_map_data: MapData | None) -> MapData:
+        if saved_map_data is None:
+            return saved_map_info
+
+        _LOGGER.debug("Decode saved map %s: %s", map_id, saved_map_info.map_name)
+        saved_map_data.object_name = saved_map_info.object_name
+        saved_map_data.custom_name = saved_map_info.custom_name
+        saved_map_data.map_name = saved_map_info.map_name
+        saved_map_data.map_index = saved_map_info.map_index
+        saved_map_data.recovery_map_list = saved_map_info.recovery_map_list
+        saved_map_data.cleanset = saved_map_info.cleanset
+        saved_map_data.last_updated = saved_map_info.last_updated
+        if map_id not in self._saved_map_headers:
+            # Map has been decoded and evicted before, keep the changes made on it since then
+            saved_map_data.segments = saved_map_info.segments
+        if saved_map_data.rotation != saved_map_info.rotation:
+            # Rotation may be changed before the map is decoded
+            saved_map_data.rotation = saved_map_info.rotation
+            DreameVacuumMapDecoder.set_floor_material(saved_map_data)
+        if saved_map_data.wifi_map_data:
+            saved_map_data.wifi_map_data.last_updated = saved_map_data.last_updated
+
+        with self._saved_map_lock:
+            self._saved_map_data[map_id] = saved_map_data
+            self._saved_map_headers.discard(map_id)
+            self._saved_map_loaded[map_id] = DreameMapVacuumMapManager._saved_map_size(saved_map_data)
+            self._evict_saved_maps()
+        return saved_map_data
+
+    def _evict_saved_maps(self) -> None:
+        size = sum(self._saved_map_loaded.values())
+        for map_id in list(self._saved_map_loaded.keys()):
+            if size <= MAP_SAVED_MAP_MEMORY_LIMIT:
+                break
+            if map_id == self._selected_map_id:
+                continue
+
+            size = size - self._saved_map_loaded.pop(map_id)
+            # Keep everything except the image data which can be decoded again from the raw map
+            saved_map_info = copy.copy(self._saved_map_data[map_id])
+            saved_map_info.data = None
+            saved_map_info.pixel_type = None
+            saved_map_info.carpet_pixels = None
+            saved_map_info.wifi_map_data = None
+            if saved_map_info.segments is None:
+                saved_map_info.segments = {}
+            self._saved_map_data[map_id] = saved_map_info
+            _LOGGER.debug("Evict saved map %s", map_id)
+
+    @staticmethod
+    def _saved_map_size(map_data: MapData) -> int:
+        size = 0
+        for item in (map_data, map_data.wifi_map_data):
+            if item is not None:
+                if item.pixel_type is not None:
+                    size = size + item.pixel_type.nbytes
+                if item.data is not None:
+                    size = size + len(item.data)
+        return size
+
+    def _skip_frame(self, map_id: int, frame_id: int, frame_type: int) -> bool:
+        # P frames that are older than the current frame are always skipped by _add_map_data
+        return bool(
+            frame_type == MapFrameType.P.value
+            and self._current_map_id == map_id
+            and self._current_frame_id is not None
+            and frame_id < self._current_frame_id
+        )
+
     def _decode_map_partial(self, raw_map, timestamp=None, key=None) -> MapDataPartial | None:
-        partial_map = DreameVacuumMapDecoder.decode_map_partial(raw_map, self._aes_iv, key)
+        if isinstance(raw_map, str):
+            partial_map = DreameVacuumMapDecoder.decode_map_partial(raw_map, self._aes_iv, key)
+        else:
+            partial_map = DreameVacuumMapDecoder.decode_map_partial_stream(
+                raw_map, self._aes_iv, key, self._skip_frame
+            )
+            if hasattr(raw_map, "close"):
+                raw_map.close()
+            if partial_map is not None and partial_map.raw is None:
+                # Skipped frame with only header data
+                return partial_map
+
         if partial_map is not None:
             # After restart or unsuccessful start robot returns timestamp_ms as uptime and that messes up with the latest map/frame id detection.
             # I could not figure out how app handles with this issue but i have added this code to update time stamp as request/object time.
@@ -655,32 +1015,50 @@ class DreameMapVacuumMapManager:
         if object_name is not None:
             self._need_new_map = False
             _LOGGER.info("New object name received: %s", object_name)
-            response, key = self._get_object_file_data(object_name, object_name_timestamp)
-            if response:
-                partial_map = self._decode_map_partial(response.decode(), object_name_timestamp, key)
-                if partial_map:
-                    if self._map_data is None or partial_map.frame_type == MapFrameType.I.value:
-                        return self._add_map_data(partial_map)
+            digest, partial_map = self._get_cached_partial_map(object_name)
+            if partial_map is None:
+                response, key = self._get_object_file_data(object_name, object_name_timestamp, True)
+                if response:
+                    partial_map = self._decode_map_partial(response, object_name_timestamp, key)
+                    self._cache_partial_map(digest, partial_map)
+            elif self._skip_duplicate_frame(partial_map):
+                return True
 
-                    self._queue_partial_map(partial_map)
-                    next_partial_map = self._unqueue_next_partial_map()
-                    if next_partial_map:
-                        self._add_map_data(next_partial_map)
-                    else:
-                        self._delete_invalid_partial_maps()
-                        if self._partial_map_queue_size() > 8:
-                            if self._protocol.dreame_cloud:
-                                self._request_map()
-                            else:
-                                self.request_new_map()
+            if partial_map:
+                if self._map_data is None or partial_map.frame_type == MapFrameType.I.value:
+                    return self._add_map_data(partial_map)
+
+                self._queue_partial_map(partial_map)
+                next_partial_map = self._unqueue_next_partial_map()
+                if next_partial_map:
+                    self._add_map_data(next_partial_map)
+                else:
+                    self._delete_invalid_partial_maps()
+                    if self._partial_map_queue_size() > 8:
+                        if self._protocol.dreame_cloud:
+                            self._request_map()
+                        else:
+                            self.request_new_map()
 
     def _add_map_data_file(self, object_name: str, timestamp) -> None:
-        response, key = self._get_object_file_data(object_name, timestamp)
-        if response is not None:
-            self._add_raw_map_data(response.decode(), timestamp, key)
+        digest, partial_map = self._get_cached_partial_map(object_name)
+        if partial_map is None:
+            response, key = self._get_object_file_data(object_name, timestamp, True)
+            if response is not None:
+                partial_map = self._decode_map_partial(response, timestamp, key)
+                self._cache_partial_map(digest, partial_map)
+                self._add_map_data(partial_map)
+        elif not self._skip_duplicate_frame(partial_map):
+            self._add_map_data(partial_map)
 
     def _add_raw_map_data(self, raw_map: str, timestamp=None, key=None) -> bool:
-        return self._add_map_data(self._decode_map_partial(raw_map, timestamp, key))
+        digest, partial_map = self._get_cached_partial_map(raw_map)
+        if partial_map is None:
+            partial_map = self._decode_map_partial(raw_map, timestamp, key)
+            self._cache_partial_map(digest, partial_map)
+        elif self._skip_duplicate_frame(partial_map):
+            return True
+        return self._add_map_data(partial_map)
 
     def _add_map_data(self, partial_map: MapDataPartial) -> None:
         if partial_map is None:
@@ -850,6 +1228,8 @@ class DreameMapVacuumMapManager:
                         if saved_map_data.wifi_map_data:
                             saved_map_data.wifi_map_data.last_updated = saved_map_data.last_updated
                         self._saved_map_data[saved_map_data.map_id] = saved_map_data
+                        self._saved_map_headers.discard(saved_map_data.map_id)
+                        self._saved_map_loaded.pop(saved_map_data.map_id, None)
                         if not self._protocol.dreame_cloud:
                             self.request_next_map_list()
 
@@ -864,6 +1244,7 @@ class DreameMapVacuumMapManager:
                         if saved_map_data.wifi_map_data:
                             saved_map_data.wifi_map_data.last_updated = saved_map_data.last_updated
                         self._saved_map_data[saved_map_data.map_id] = saved_map_data
+                        self._saved_map_headers.discard(saved_map_data.map_id)
 
                         _LOGGER.info("Add saved map from new map %s", saved_map_data.map_id)
                         self._refresh_map_list()
@@ -1052,13 +1433,23 @@ class DreameMapVacuumMapManager:
             timestamp = int(time.time() * 1000)
 
             if raw_map_data:
-                partial_map_data = [self._decode_map_partial(raw_map_data, timestamp)]
+                digest, partial_map = self._get_cached_partial_map(raw_map_data)
+                if partial_map is None:
+                    partial_map = self._decode_map_partial(raw_map_data, timestamp)
+                    self._cache_partial_map(digest, partial_map)
+                elif self._skip_duplicate_frame(partial_map):
+                    if object_name is None:
+                        return
+                    partial_map = None
+
+                if partial_map is not None:
+                    partial_map_data = [partial_map]
             self._add_cloud_map_data(partial_map_data, object_name, timestamp)
 
     def get_map(self, map_index: int = 0) -> MapData | None:
         if map_index:
             if map_index <= len(self._map_list):
-                return self._saved_map_data[self._map_list[map_index - 1]]
+                return self._get_saved_map(self._map_list[map_index - 1])
             return None
         return self._map_data
 
@@ -1079,6 +1470,11 @@ class DreameMapVacuumMapManager:
                         if self._protocol.dreame_cloud
                         else obstacle.file_name
                     )
+                    if self._cache:
+                        image = self._cache.get_file(object_name, obstacle.key)
+                        if image is not None:
+                            return (image, obstacle)
+
                     _LOGGER.info(
                         "Obstacle image object name: %s",
                         object_name,
@@ -1098,16 +1494,16 @@ class DreameMapVacuumMapManager:
                             )
                             decryptor = cipher.decryptor()
                             unpadder = padding.PKCS7(128).unpadder()
-                            return (
-                                (
-                                    unpadder.update(
-                                        decryptor.update(base64.b64decode(response[response.find(",") + 1 :]))
-                                        + decryptor.finalize()
-                                    )
-                                    + unpadder.finalize()
-                                ),
-                                obstacle,
+                            image = (
+                                unpadder.update(
+                                    decryptor.update(base64.b64decode(response[response.find(",") + 1 :]))
+                                    + decryptor.finalize()
+                                )
+                                + unpadder.finalize()
                             )
+                            if self._cache:
+                                self._cache.set_file(object_name, obstacle.key, image)
+                            return (image, obstacle)
                 except Exception as ex:
                     _LOGGER.warning(
                         "Obstacle (%s) image decryption failed: %s",
@@ -1119,27 +1515,42 @@ class DreameMapVacuumMapManager:
     def get_history_map(self, object_name, key=None):
         if object_name and len(object_name):
             try:
-                _LOGGER.info(
-                    "History map object name: %s",
-                    object_name,
-                )
-                response = self._get_file_url(object_name, self._protocol.cloud.dreame_cloud)
-                if response:
-                    response = self._protocol.cloud.get_file(response)
+                response = None
+                # Cached history map is optimized, it cannot be used after the optimizer engine is changed
+                map_key = (key, self.optimizer.engine)
+                if self._cache:
+                    map_data = self._cache.get_map(object_name, map_key)
+                    if map_data is not None:
+                        return map_data
+                    response = self._cache.get_file(object_name, key)
+
+                if response is None:
+                    _LOGGER.info(
+                        "History map object name: %s",
+                        object_name,
+                    )
+                    response = self._get_file_url(object_name, self._protocol.cloud.dreame_cloud)
                     if response:
-                        map_data, saved_map_data = DreameVacuumMapDecoder.decode_map(
-                            response.decode(), self._vslam_map, None, self._aes_iv, key
+                        response = self._protocol.cloud.get_file(response)
+                        if response and self._cache:
+                            self._cache.set_file(object_name, key, response)
+
+                if response:
+                    map_data, saved_map_data = DreameVacuumMapDecoder.decode_map(
+                        response.decode(), self._vslam_map, None, self._aes_iv, key
+                    )
+                    if map_data:
+                        DreameVacuumMapDecoder.set_segment_cleanset(map_data, map_data.cleanset, self._capability)
+                        DreameVacuumMapDecoder.set_carpet_cleanset(
+                            map_data, map_data.carpet_cleanset, self._capability
                         )
-                        if map_data:
-                            DreameVacuumMapDecoder.set_segment_cleanset(map_data, map_data.cleanset, self._capability)
-                            DreameVacuumMapDecoder.set_carpet_cleanset(
-                                map_data, map_data.carpet_cleanset, self._capability
-                            )
-                            map_data.history_map = True
-                            if map_data.need_optimization:
-                                map_data = self.optimizer.optimize(map_data, saved_map_data)
-                                map_data.need_optimization = False
-                            return map_data
+                        map_data.history_map = True
+                        if map_data.need_optimization:
+                            map_data = self.optimizer.optimize(map_data, saved_map_data)
+                            map_data.need_optimization = False
+                        if self._cache:
+                            self._cache.set_map(object_name, map_key, map_data)
+                        return map_data
             except Exception as ex:
                 _LOGGER.warning(
                     "History map decoding failed: %s",
@@ -1152,25 +1563,39 @@ class DreameMapVacuumMapManager:
             index = int(index) - 1
             if recovery_map_list and len(recovery_map_list) > index:
                 if recovery_map_list[index].map_data is None:
+                    map_object_name = recovery_map_list[index].map_object_name
+                    rotation = self._saved_map_data[map_id].rotation
+                    if self._cache and map_object_name is not None:
+                        recovery_map_list[index].map_data = self._cache.get_map(map_object_name, rotation)
+
                     if (
-                        recovery_map_list[index].raw_map is None
-                        and recovery_map_list[index].map_object_name is not None
+                        recovery_map_list[index].map_data is None
+                        and recovery_map_list[index].raw_map is None
+                        and map_object_name is not None
                     ):
                         try:
-                            response = self._get_interim_file_data(recovery_map_list[index].map_object_name)
+                            response = self._cache.get_file(map_object_name) if self._cache else None
+                            if response is None:
+                                response = self._get_interim_file_data(map_object_name)
+                                if response and self._cache:
+                                    self._cache.set_file(map_object_name, None, response)
                             if response:
                                 recovery_map_list[index].raw_map = response.decode()
                         except Exception as ex:
                             _LOGGER.warning("Get Recovery Map Object failed: %s", ex)
                             return
 
-                    if recovery_map_list[index].raw_map:
+                    if recovery_map_list[index].map_data is None and recovery_map_list[index].raw_map:
                         recovery_map_list[index].map_data = DreameVacuumMapDecoder.decode_saved_map(
                             recovery_map_list[index].raw_map,
                             self._vslam_map,
-                            self._saved_map_data[map_id].rotation,
+                            rotation,
                             self._aes_iv,
                         )
+                        if self._cache and map_object_name is not None and recovery_map_list[index].map_data:
+                            self._cache.set_map(map_object_name, rotation, recovery_map_list[index].map_data)
+
+                    if recovery_map_list[index].map_data:
                         recovery_map_list[index].map_data.last_updated = recovery_map_list[index].date.timestamp()
                         recovery_map_list[index].map_data.recovery_map_type = recovery_map_list[index].map_type
                         recovery_map_list[index].map_data.recovery_map = True
@@ -1183,6 +1608,11 @@ class DreameMapVacuumMapManager:
             if recovery_map_list and len(recovery_map_list) > index:
                 object_name = recovery_map_list[index].object_name
                 if object_name and object_name != "":
+                    if self._cache:
+                        response = self._cache.get_file(object_name)
+                        if response is not None:
+                            return response, None, object_name
+
                     _LOGGER.info(
                         "Recovery map object name: %s",
                         object_name,
@@ -1193,8 +1623,11 @@ class DreameMapVacuumMapManager:
                     )
                     _LOGGER.info("Recovery map file url: %s = %s", object_name, map_url)
                     if map_url:
+                        response = self._protocol.cloud.get_file(map_url)
+                        if response and self._cache:
+                            self._cache.set_file(object_name, None, response)
                         return (
-                            self._protocol.cloud.get_file(map_url),
+                            response,
                             map_url,
                             object_name,
                         )
@@ -1214,6 +1647,9 @@ class DreameMapVacuumMapManager:
         self._update_callback = None
         self._change_callback = None
         self._error_callback = None
+        if self._decode_executor:
+            self._decode_executor.shutdown(wait=False, cancel_futures=True)
+            self._decode_executor = None
 
     def schedule_update(self, wait: float = None) -> None:
         if wait == None:
@@ -1440,6 +1876,7 @@ class DreameMapVacuumMapManager:
                 now = time.time()
                 map_list = {}
                 if saved_map_list:
+                    saved_map_ids = {v[0]: k for k, v in self._saved_map_raw.items()}
                     for v in saved_map_list:
                         raw_map = None
                         if v.get(MAP_PARAMETER_MAP):
@@ -1454,65 +1891,83 @@ class DreameMapVacuumMapManager:
                                 return
 
                         if raw_map:
-                            try:
-                                saved_map_data = DreameVacuumMapDecoder.decode_saved_map(
-                                    raw_map,
-                                    self._vslam_map,
-                                    int(v[MAP_PARAMETER_ANGLE]) if v.get(MAP_PARAMETER_ANGLE) else 0,
-                                    self._aes_iv,
-                                )
-                            except Exception as ex:
-                                _LOGGER.error("Parse saved map failed: %s", traceback.format_exc())
-                                return
-
-                            if saved_map_data is not None:
-                                name = v.get(MAP_PARAMETER_NAME)
-                                saved_map_data.object_name = v.get("mapobj")
-                                if name:
-                                    saved_map_data.custom_name = name
-                                    saved_map_data.map_name = name
-                                map_list[saved_map_data.map_id] = saved_map_data
-
-                    for map_id, saved_map_data in sorted(map_list.items()):
+                            # Only the map header is decoded here, saved maps are decoded when they are accessed
+                            digest = hashlib.md5(raw_map.encode("utf8")).hexdigest()
+                            map_id = saved_map_ids.get(digest)
+                            if map_id is None:
+                                try:
+                                    partial_map = DreameVacuumMapDecoder.decode_map_partial(raw_map, self._aes_iv)
+                                except Exception as ex:
+                                    _LOGGER.error("Parse saved map failed: %s", traceback.format_exc())
+                                    return
+
+                                if partial_map is None:
+                                    continue
+                                map_id = partial_map.map_id
+
+                            saved_map_info = MapData()
+                            saved_map_info.map_id = map_id
+                            saved_map_info.saved_map = True
+                            saved_map_info.rotation = int(v[MAP_PARAMETER_ANGLE]) if v.get(MAP_PARAMETER_ANGLE) else 0
+                            saved_map_info.segments = {}
+                            saved_map_info.object_name = v.get("mapobj")
+                            name = v.get(MAP_PARAMETER_NAME)
+                            if name:
+                                saved_map_info.custom_name = name
+                                saved_map_info.map_name = name
+                            map_list[map_id] = (saved_map_info, (digest, raw_map, saved_map_info.rotation))
+
+                    for map_id, (saved_map_info, saved_map_raw) in sorted(map_list.items()):
                         if map_id in self._saved_map_data:
+                            saved_map_data = self._saved_map_data[map_id]
                             if self._selected_map_id == map_id and self._map_data:
-                                saved_map_data.cleanset = self._map_data.cleanset
+                                saved_map_info.cleanset = self._map_data.cleanset
                             else:
-                                saved_map_data.cleanset = self._saved_map_data[map_id].cleanset
+                                saved_map_info.cleanset = saved_map_data.cleanset
 
-                            if self._saved_map_data[map_id] != saved_map_data:
+                            if (
+                                self._saved_map_raw.get(map_id) != saved_map_raw
+                                or saved_map_data.custom_name != saved_map_info.custom_name
+                            ):
                                 _LOGGER.info("Saved map changed: %s", map_id)
                                 changed = True
-                                saved_map_data.last_updated = now
-                                if saved_map_data.wifi_map_data:
-                                    saved_map_data.wifi_map_data.last_updated = saved_map_data.last_updated
-                                saved_map_data.recovery_map_list = self._saved_map_data[map_id].recovery_map_list
+                                saved_map_info.last_updated = now
+                                saved_map_info.recovery_map_list = saved_map_data.recovery_map_list
                                 if self._map_data is None or self._selected_map_id != map_id:
-                                    self._saved_map_data[map_id] = saved_map_data
+                                    self._saved_map_data[map_id] = saved_map_info
+                                    self._saved_map_headers.add(map_id)
+                                    self._saved_map_loaded.pop(map_id, None)
                                 else:
-                                    self._saved_map_data[map_id].custom_name = saved_map_data.custom_name
-                                    self._saved_map_data[map_id].rotation = saved_map_data.rotation
+                                    saved_map_data.custom_name = saved_map_info.custom_name
+                                    saved_map_data.rotation = saved_map_info.rotation
                             else:
                                 _LOGGER.info("Saved map not changed: %s", map_id)
                         else:
-                            saved_map_data.last_updated = now
-                            if saved_map_data.wifi_map_data:
-                                saved_map_data.wifi_map_data.last_updated = saved_map_data.last_updated
-                            self._saved_map_data[map_id] = saved_map_data
+                            saved_map_info.last_updated = now
+                            self._saved_map_data[map_id] = saved_map_info
+                            self._saved_map_headers.add(map_id)
                             _LOGGER.info("Add saved map: %s", map_id)
                             changed = True
+                        self._saved_map_raw[map_id] = saved_map_raw
 
                 selected_map_id = map_info[MAP_PARAMETER_CURR_ID]
                 current_map_list = self._saved_map_data.copy()
                 for map_id in current_map_list.keys():
                     if map_id not in map_list and map_id != selected_map_id:
                         del self._saved_map_data[map_id]
+                        self._saved_map_raw.pop(map_id, None)
+                        self._saved_map_loaded.pop(map_id, None)
+                        self._saved_map_headers.discard(map_id)
                         changed = True
 
                 if selected_map_id in self._saved_map_data and self._selected_map_id != selected_map_id:
                     self._selected_map_id = selected_map_id
                     changed = True
 
+                # Only the selected map is decoded here and always kept decoded,
+                # other maps are decoded on the timer thread when they are first accessed.
+                self._decode_saved_map(selected_map_id)
+
                 if changed == True:
                     self._refresh_map_list()
                     if self._map_data:
@@ -1603,22 +2058,43 @@ class DreameMapVacuumMapManager:
     def ready(self) -> bool:
         return self._ready
 
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "frame_cache": {
+                "size": len(self._frame_cache),
+                "hits": self._frame_cache_hits,
+                "misses": self._frame_cache_misses,
+                "skipped": self._frame_cache_skipped,
+            },
+            "saved_maps": {
+                "count": len(self._saved_map_data),
+                "decoded": len(self._saved_map_loaded),
+                "not_decoded": len(self._saved_map_headers),
+                "size": sum(self._saved_map_loaded.values()),
+            },
+        }
+
     @property
     def map_list(self) -> list[int] | None:
         return self._saved_map_data.keys()
 
     @property
     def map_data_list(self) -> dict[int, MapData] | None:
+        # Maps that are not decoded yet are returned with the map list info and without segments until they are decoded,
+        # evicted maps are returned without the image data
+        for map_id in list(self._saved_map_headers):
+            self._request_saved_map(map_id)
         return self._saved_map_data
 
     @property
     def selected_map(self) -> MapData | None:
         if self._map_data:
             if self._selected_map_id is not None and self._selected_map_id in self._saved_map_data:
-                return self._saved_map_data[self._selected_map_id]
+                return self._get_saved_map(self._selected_map_id)
 
             if self._map_list and len(self._map_list) == 1 and self._map_list[0] in self._saved_map_data:
-                return self._saved_map_data[self._map_list[0]]
+                return self._get_saved_map(self._map_list[0])
 
     @property
     def cleaning_sequence(self) -> list | None:
@@ -1784,7 +2260,7 @@ class DreameMapVacuumMapEditor:
 
     def set_current_map(self, map_id: int) -> None:
         if map_id and map_id in self._saved_map_data:
-            saved_map_data = copy.deepcopy(self._saved_map_data[map_id])
+            saved_map_data = copy.deepcopy(self.map_manager._decode_saved_map(map_id))
             saved_map_data.docked = self._map_data.docked
             saved_map_data.timestamp_ms = self._current_timestamp_ms
             saved_map_data.frame_id = None
@@ -1960,6 +2436,7 @@ class DreameMapVacuumMapEditor:
             self.map_manager._selected_map_id = None
             self.map_manager._updated_frame_id = None
             self.map_manager._saved_map_data = {}
+            self.map_manager._saved_map_headers = set()
             self.map_manager._refresh_map_list()
             self.map_manager.request_next_map_list()
         else:
@@ -2057,6 +2534,7 @@ class DreameMapVacuumMapEditor:
                 new_map.saved_map = True
                 new_map.cleanset = {}
                 self.map_manager._saved_map_data[new_map.map_id] = new_map
+                self.map_manager._saved_map_headers.discard(new_map.map_id)
                 del self.map_manager._saved_map_data[map_id]
                 self.map_manager._refresh_map_list()
 
@@ -2118,6 +2596,7 @@ class DreameMapVacuumMapEditor:
                 recovery_map_data.wifi_map.last_updated = time.time()
 
             self._saved_map_data[recovery_map_info.map_id] = recovery_map_data
+            self.map_manager._saved_map_headers.discard(recovery_map_info.map_id)
             self.refresh_map(recovery_map_info.map_id)
             if recovery_map_info.map_id == self._selected_map_id:
                 self.set_current_map(recovery_map_info.map_id)
@@ -2683,6 +3162,62 @@ class DreameMapVacuumMapEditor:
 class DreameVacuumMapDecoder:
     HEADER_SIZE = 27
 
+    # Pixel type lookup tables for I frames indexed by the raw pixel value, generated as implemented on the app
+    _FRAME_MAP_PIXEL_TYPE = np.array(
+        [
+            (
+                MapPixelType.WALL.value
+                if (pixel >> 2) == 63
+                else (
+                    MapPixelType.FLOOR.value
+                    if (pixel >> 2) == 62
+                    else (
+                        MapPixelType.UNKNOWN.value
+                        if (pixel >> 2) == 61
+                        else (
+                            (pixel >> 2)
+                            if (pixel >> 2) > 0
+                            else (
+                                MapPixelType.NEW_SEGMENT.value
+                                if pixel == 1 or pixel == 3
+                                else MapPixelType.WALL.value if pixel == 2 else MapPixelType.OUTSIDE.value
+                            )
+                        )
+                    )
+                )
+            )
+            for pixel in range(256)
+        ],
+        dtype=np.uint8,
+    )
+    _NEW_MAP_PIXEL_TYPE = np.array(
+        [
+            (
+                MapPixelType.NEW_SEGMENT.value
+                if (pixel & 0x3F) == 1 or (pixel & 0x3F) == 3
+                else MapPixelType.WALL.value if (pixel & 0x3F) == 2 else MapPixelType.OUTSIDE.value
+            )
+            for pixel in range(256)
+        ],
+        dtype=np.uint8,
+    )
+    _VSLAM_MAP_PIXEL_TYPE = np.array(
+        [
+            (
+                MapPixelType.OUTSIDE.value
+                if (pixel & 0x3F) == 0
+                else MapPixelType.WALL.value if (pixel & 0x3F) == 2 else MapPixelType.NEW_SEGMENT.value
+            )
+            for pixel in range(256)
+        ],
+        dtype=np.uint8,
+    )
+    _LIDAR_MAP_PIXEL_TYPE = np.array(
+        [MapPixelType.WALL.value if pixel >> 7 else (pixel & 0x3F) for pixel in range(256)],
+        dtype=np.uint8,
+    )
+    _WIFI_PIXEL_TYPES = np.array([pixel_type.value for pixel_type in MapPixelType if pixel_type.value < 16])
+
     @staticmethod
     def _read_int_8(data: bytes, offset: int = 0) -> int:
         return int.from_bytes(data[offset : offset + 1], byteorder="big", signed=True)
@@ -2773,52 +3308,51 @@ class DreameVacuumMapDecoder:
 
         return (MapPixelType.OUTSIDE.value, False)
 
+    @staticmethod
+    def _get_pixel_type_table(map_data: MapData, vslam_map: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        # Pixel type and carpet lookup tables for every possible raw pixel value
+        pixel_types = np.zeros(256, dtype=np.uint8)
+        carpets = np.zeros(256, dtype=bool)
+        for pixel in range(256):
+            pixel_types[pixel], carpets[pixel] = DreameVacuumMapDecoder._get_pixel_type(map_data, pixel, vslam_map)
+        return pixel_types, carpets
+
+    @staticmethod
+    def _get_lidar_pixel_type_table(hidden_segments) -> np.ndarray:
+        if not hidden_segments:
+            return DreameVacuumMapDecoder._LIDAR_MAP_PIXEL_TYPE
+
+        table = DreameVacuumMapDecoder._LIDAR_MAP_PIXEL_TYPE.copy()
+        for pixel in range(0x80, 0x100):
+            segment_id = pixel & 0x3F
+            if segment_id and segment_id in hidden_segments:
+                table[pixel] = MapPixelType.HIDDEN_WALL.value
+        return table
+
     @staticmethod
     def _get_segment_center(map_data, segment_id: int, center: int, vertical: bool) -> int | None:
         # Find center point implemented as on the app
-        lines = []
-        zero_pixels = -1
-        segment_pixel = 0
-        line = None
-
-        for k in range(map_data.dimensions.height if vertical else map_data.dimensions.width):
-            pixel_type = (
-                map_data.data[
-                    (k * map_data.dimensions.width + center) if vertical else (center * map_data.dimensions.width + k)
-                ]
-                & 0x3F
-            )
-            if pixel_type == segment_id:
-                segment_pixel = k
-                zero_pixels = 0
-                if line is None:
-                    line = [segment_pixel]
-            elif pixel_type == 0:
-                if zero_pixels >= 0:
-                    zero_pixels = zero_pixels + 1
-                    if zero_pixels >= 4 and line is not None:
-                        line.append(segment_pixel)
-                        lines.append(line)
-                        line = None
-            elif line is not None:
-                line.append(segment_pixel)
-                lines.append(line)
-                line = None
-
-        if line is not None:
-            line.append(segment_pixel)
-            lines.append(line)
-            line = None
-
-        if lines:
-            maxLine = lines[0]
-            if len(lines) > 1:
-                for item in lines[1:]:
-                    if item[1] - item[0] > maxLine[1] - maxLine[0]:
-                        maxLine = item
-
-            return int(math.ceil((maxLine[1] - maxLine[0]) / 2 + maxLine[0]))
-        return None
+        width = map_data.dimensions.width
+        data = np.frombuffer(map_data.data, dtype=np.uint8, count=width * map_data.dimensions.height).reshape(
+            map_data.dimensions.height, width
+        )
+        values = (data[:, center] if vertical else data[center, :]) & 0x3F
+
+        segment_pixels = np.flatnonzero(values == segment_id)
+        if not len(segment_pixels):
+            return None
+
+        # A line ends when a pixel from another segment or at least four empty pixels are found after it
+        other_pixels = np.cumsum((values != segment_id) & (values != 0))
+        gaps = segment_pixels[1:] - segment_pixels[:-1] - 1
+        breaks = np.flatnonzero(
+            (other_pixels[segment_pixels[1:]] != other_pixels[segment_pixels[:-1]]) | (gaps >= 4)
+        )
+        starts = segment_pixels[np.concatenate(([0], breaks + 1))]
+        ends = segment_pixels[np.concatenate((breaks, [len(segment_pixels) - 1]))]
+
+        index = int(np.argmax(ends - starts))
+        return int(math.ceil((int(ends[index]) - int(starts[index])) / 2 + int(starts[index])))
 
     @staticmethod
     def decode_map_partial(raw_data, iv=None, key=None) -> MapDataPartial | None:
@@ -2861,6 +3395,79 @@ class DreameVacuumMapDecoder:
             _LOGGER.error("Map data decompression failed: %s\n%s", ex, raw_data)
             return None
 
+        return DreameVacuumMapDecoder._decode_raw_map_partial(raw_map)
+
+    @staticmethod
+    def decode_map_partial_stream(chunks, iv=None, key=None, skip_frame=None) -> MapDataPartial | None:
+        """Decode map data file while it is being downloaded, chunks are base64 decoded, decrypted and decompressed as they arrive.
+        Header is parsed as soon as it is decompressed and the rest of the file is not downloaded when skip_frame returns true for it.
+        """
+        if key is None:
+            # Key can be at the end of the file so it cannot be decrypted before all chunks are received
+            try:
+                raw_data = b"".join(chunk.encode("utf8") if isinstance(chunk, str) else chunk for chunk in chunks)
+            except Exception as ex:
+                _LOGGER.error("Map data download failed: %s", ex)
+                return None
+            return DreameVacuumMapDecoder.decode_map_partial(raw_data.decode("utf8"), iv)
+
+        try:
+            decryptor = Cipher(
+                algorithms.AES(hashlib.sha256(key.encode()).hexdigest()[0:32].encode("utf8")),
+                modes.CBC(("" if iv is None else iv).encode("utf8")),
+                backend=default_backend(),
+            ).decryptor()
+        except Exception as ex:
+            _LOGGER.error(
+                f"Map data decryption failed: {ex}. Private key might be missing, please report this issue with your device model https://github.com/Tasshack/dreame-vacuum/issues/new?assignees=Tasshack&labels=bug&template=bug_report.md&title=Map%20data%20decryption%20failed"
+            )
+            return None
+
+        decompressor = zlib.decompressobj()
+        translation = bytes.maketrans(b"_-", b"/+")
+        pending = b""
+        raw_map = []
+        size = 0
+        header = None
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf8")
+                # Base64 is decoded in groups of four characters, remainder is kept for the next chunk
+                pending = pending + chunk.translate(translation, b" \t\r\n")
+                length = len(pending) - (len(pending) % 4)
+                data = decompressor.decompress(decryptor.update(base64.b64decode(pending[:length])))
+                pending = pending[length:]
+                if data:
+                    raw_map.append(data)
+                    size = size + len(data)
+
+                if header is None and size >= DreameVacuumMapDecoder.HEADER_SIZE:
+                    raw_map = [b"".join(raw_map)]
+                    header = DreameVacuumMapDecoder._decode_raw_map_partial(
+                        raw_map[0][: DreameVacuumMapDecoder.HEADER_SIZE]
+                    )
+                    if skip_frame and skip_frame(header.map_id, header.frame_id, header.frame_type):
+                        _LOGGER.debug("Skip downloading frame %s:%s", header.map_id, header.frame_id)
+                        header.raw = None
+                        return header
+
+            data = decompressor.decompress(decryptor.update(base64.b64decode(pending)) + decryptor.finalize())
+            raw_map.append(data + decompressor.flush())
+            if not decompressor.eof:
+                raise zlib.error("incomplete or truncated stream")
+            raw_map = b"".join(raw_map)
+            if len(raw_map) < DreameVacuumMapDecoder.HEADER_SIZE:
+                _LOGGER.error("Wrong header size for map")
+                return None
+        except Exception as ex:
+            _LOGGER.error("Map data decompression failed: %s", ex)
+            return None
+
+        return DreameVacuumMapDecoder._decode_raw_map_partial(raw_map)
+
+    @staticmethod
+    def _decode_raw_map_partial(raw_map) -> MapDataPartial:
         partial_map = MapDataPartial()
         partial_map.map_id = DreameVacuumMapDecoder._read_int_16_le(raw_map)
         partial_map.frame_id = DreameVacuumMapDecoder._read_int_16_le(raw_map, 2)
@@ -2898,6 +3505,36 @@ class DreameVacuumMapDecoder:
     def decode_saved_map(raw_map: str, vslam_map: bool, rotation: int = 0, iv: str = None) -> MapData | None:
         return DreameVacuumMapDecoder.decode_map(raw_map, vslam_map, rotation, iv)[0]
 
+    @staticmethod
+    def decode_saved_maps(
+        raw_maps: list[Tuple[str, int]], vslam_map: bool, iv: str = None, executor: Executor = None
+    ) -> list[MapData | None]:
+        # Blocks until all maps are decoded, must not be called from the event loop.
+        # Decoded map data is pickled back from the worker processes when an executor is used.
+        if executor is None:
+            results = []
+            for raw_map, rotation in raw_maps:
+                try:
+                    results.append(DreameVacuumMapDecoder.decode_saved_map(raw_map, vslam_map, rotation, iv))
+                except Exception:
+                    _LOGGER.error("Parse saved map failed: %s", traceback.format_exc())
+                    results.append(None)
+            return results
+
+        # Calling thread decodes the first map instead of waiting idle for the workers
+        futures = [
+            executor.submit(DreameVacuumMapDecoder.decode_saved_map, raw_map, vslam_map, rotation, iv)
+            for raw_map, rotation in raw_maps[1:]
+        ]
+        results = DreameVacuumMapDecoder.decode_saved_maps(raw_maps[:1], vslam_map, iv)
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception:
+                _LOGGER.error("Parse saved map failed: %s", traceback.format_exc())
+                results.append(None)
+        return results
+
     @staticmethod
     def decode_map_data_from_partial(
         partial_map: MapDataPartial, vslam_map: bool, rotation: int = 0
@@ -3019,33 +3656,7 @@ class DreameVacuumMapDecoder:
                     map_data.index = 0
 
                 if data_json.get("tr"):
-                    matches = [
-                        m.groupdict()
-                        for m in re.compile(r"(?P<operator>[MWSLl])(?P<x>-?\d+),(?P<y>-?\d+)").finditer(
-                            data_json["tr"]
-                        )
-                    ]
-                    current_position = Point(0, 0)
-                    map_data.path = []
-                    for match in matches:
-                        operator = match["operator"]
-                        x = int(match["x"])
-                        y = int(match["y"])
-
-                        if operator == "L":
-                            current_position = Path(
-                                current_position.x + x,
-                                current_position.y + y,
-                                PathType.LINE,
-                            )
-                        else:
-                            # You will only get "l" paths with in a P frame.
-                            # It means path is connected with the path from previous frame and it should be rendered as a line.
-                            if operator == "l":
-                                operator = "L"
-                            current_position = Path(x, y, PathType(operator))
-
-                        map_data.path.append(current_position)
+                    map_data.path = PathList.from_string(data_json["tr"])
 
                 if data_json.get("sa") and isinstance(data_json["sa"], list):
                     map_data.active_segments = [sa[0] for sa in data_json["sa"]]
@@ -3098,103 +3709,54 @@ class DreameVacuumMapDecoder:
             if (width * height) > 0:
                 map_data.data = raw[DreameVacuumMapDecoder.HEADER_SIZE : image_size]
                 map_data.empty_map = bool(width == 2 and height == 2)
-                if map_data.empty_map:
-                    for y in range(height):
-                        for x in range(width):
-                            if map_data.data[(width * y) + x] > 0:
-                                map_data.empty_map = False
-                                break
+                # Raw image data as a (width, height) view so it can be indexed the same way as pixel_type
+                data = np.frombuffer(map_data.data, dtype=np.uint8, count=width * height).reshape(height, width).T
+                if map_data.empty_map and data.any():
+                    map_data.empty_map = False
 
                 np.seterr(over="ignore")
                 map_data.pixel_type = np.full((width, height), MapPixelType.OUTSIDE.value, dtype=np.uint8)
                 if not map_data.empty_map:
                     map_data.empty_map = True
                     if map_data.frame_type == MapFrameType.W.value:
-                        try:
-                            for y in range(height):
-                                for x in range(width):
-                                    pixel = map_data.data[(width * y) + x] & 15
-                                    if pixel > 0:
-                                        map_data.empty_map = False
-                                        map_data.pixel_type[x, y] = MapPixelType(pixel)
-                        except:
-                            pass
+                        pixels = data & 15
+                        # Pixel types are written in row order until the first unknown value is found
+                        invalid = np.isin(pixels, DreameVacuumMapDecoder._WIFI_PIXEL_TYPES, invert=True) & (pixels > 0)
+                        row_order = pixels.T.ravel()
+                        if invalid.any():
+                            end = int(np.argmax(invalid.T.ravel()))
+                            row_order = row_order.copy()
+                            row_order[end:] = 0
+                            map_data.empty_map = False
+                        written = row_order.reshape(height, width).T
+                        if written.any():
+                            map_data.empty_map = False
+                            map_data.pixel_type[:] = written
                     elif map_data.frame_type == MapFrameType.I.value:
                         if map_data.frame_map:
-                            for y in range(height):
-                                for x in range(width):
-                                    pixel = map_data.data[(width * y) + x]
-                                    if pixel > 0:
-                                        if pixel & 0x03 == 3:
-                                            carpet_pixels.append((x, y))
-                                        map_data.empty_map = False
-                                        segment_id = pixel >> 2
-                                        if 0 < segment_id < 64:
-                                            if segment_id == 63:
-                                                map_data.pixel_type[x, y] = MapPixelType.WALL.value
-                                            elif segment_id == 62:
-                                                map_data.pixel_type[x, y] = MapPixelType.FLOOR.value
-                                            elif segment_id == 61:
-                                                map_data.pixel_type[x, y] = MapPixelType.UNKNOWN.value
-                                            else:
-                                                map_data.pixel_type[x, y] = segment_id
-                                        else:
-                                            segment_id = pixel & 0x3F
-                                            if segment_id == 1 or segment_id == 3:
-                                                map_data.pixel_type[x, y] = MapPixelType.NEW_SEGMENT.value
-                                            elif segment_id == 2:
-                                                map_data.pixel_type[x, y] = MapPixelType.WALL.value
+                            carpet = (data & 0x03) == 3
+                            map_data.empty_map = not data.any()
+                            map_data.pixel_type[:] = DreameVacuumMapDecoder._FRAME_MAP_PIXEL_TYPE[data]
                         elif map_data.saved_map_status == 1 or map_data.saved_map_status == 0:
-                            for y in range(height):
-                                for x in range(width):
-                                    pixel = map_data.data[(width * y) + x]
-                                    if pixel > 0:
-                                        if pixel & 0x03 == 3:
-                                            carpet_pixels.append((x, y))
-                                        segment_id = pixel & 0x3F
-                                        # as implemented on the app
-                                        if segment_id == 1 or segment_id == 3:
-                                            map_data.empty_map = False
-                                            map_data.pixel_type[x, y] = MapPixelType.NEW_SEGMENT.value
-                                        elif segment_id == 2:
-                                            map_data.empty_map = False
-                                            map_data.pixel_type[x, y] = MapPixelType.WALL.value
+                            carpet = (data & 0x03) == 3
+                            map_data.pixel_type[:] = DreameVacuumMapDecoder._NEW_MAP_PIXEL_TYPE[data]
+                            map_data.empty_map = not map_data.pixel_type.any()
                         elif (
                             vslam_map and not map_data.saved_map and not map_data.recovery_map
                         ) or map_data.saved_map_status == 2:
-                            for y in range(height):
-                                for x in range(width):
-                                    pixel = map_data.data[(width * y) + x]
-                                    if pixel & 0x03 == 3:
-                                        carpet_pixels.append((x, y))
-                                    segment_id = pixel & 0x3F
-                                    if segment_id > 0:
-                                        map_data.empty_map = False
-                                        if segment_id == 2:
-                                            map_data.pixel_type[x, y] = MapPixelType.WALL.value
-                                        else:
-                                            map_data.pixel_type[x, y] = MapPixelType.NEW_SEGMENT.value
+                            carpet = (data & 0x03) == 3
+                            map_data.pixel_type[:] = DreameVacuumMapDecoder._VSLAM_MAP_PIXEL_TYPE[data]
+                            map_data.empty_map = not map_data.pixel_type.any()
                         else:
-                            for y in range(height):
-                                for x in range(width):
-                                    pixel = map_data.data[(width * y) + x]
-                                    if pixel > 0:
-                                        if (pixel & 0x40) == 64:
-                                            carpet_pixels.append((x, y))
-                                        map_data.empty_map = False
-                                        segment_id = pixel & 0x3F
-                                        if pixel >> 7:
-                                            map_data.pixel_type[x, y] = (
-                                                MapPixelType.HIDDEN_WALL.value
-                                                if map_data.hidden_segments
-                                                and segment_id
-                                                and segment_id in map_data.hidden_segments
-                                                else MapPixelType.WALL.value
-                                            )
-                                        else:
-                                            if segment_id > 0:
-                                                map_data.pixel_type[x, y] = segment_id
-
+                            carpet = (data & 0x40) == 64
+                            map_data.empty_map = not data.any()
+                            map_data.pixel_type[:] = DreameVacuumMapDecoder._get_lidar_pixel_type_table(
+                                map_data.hidden_segments
+                            )[data]
+
+                        # Carpet pixels are listed in row order as (x, y)
+                        y_coords, x_coords = np.nonzero(carpet.T)
+                        carpet_pixels = list(zip(x_coords.tolist(), y_coords.tolist()))
                         if carpet_pixels:
                             map_data.carpet_pixels = carpet_pixels
 
@@ -3960,7 +4522,7 @@ class DreameVacuumMapDecoder:
             height = int((max_top - top) / grid_size)
 
             # Create new buffer
-            data = np.zeros((width * height), np.uint8)
+            data = np.zeros((height, width), np.uint8)
             pixel_type = np.full((width, height), MapPixelType.OUTSIDE.value, dtype=np.uint8)
 
             # Calculate old image offset
@@ -3968,43 +4530,61 @@ class DreameVacuumMapDecoder:
             top_offset = int((current_dimensions.top - top) / current_dimensions.grid_size)
 
             # Copy old image to buffer
-            for y in range(current_dimensions.height):
-                for x in range(current_dimensions.width):
-                    data[(width * (top_offset + y)) + left_offset + x] = current_map_data.data[
-                        (current_dimensions.width * y) + x
-                    ]
-                    pixel_type[left_offset + x, top_offset + y] = current_map_data.pixel_type[x, y]
+            current_width = current_dimensions.width
+            current_height = current_dimensions.height
+            data[top_offset : top_offset + current_height, left_offset : left_offset + current_width] = np.frombuffer(
+                current_map_data.data, dtype=np.uint8, count=current_width * current_height
+            ).reshape(current_height, current_width)
+            pixel_type[left_offset : left_offset + current_width, top_offset : top_offset + current_height] = (
+                current_map_data.pixel_type[:current_width, :current_height]
+            )
 
             # Calculate new image offset
             left_offset = int((new_dimensions.left - left) / grid_size)
             top_offset = int((new_dimensions.top - top) / grid_size)
 
             # Copy new image to buffer at calculated offset
-            for y in range(new_dimensions.height):
-                for x in range(new_dimensions.width):
-                    current_index = (new_dimensions.width * y) + x
-                    if map_data.data[current_index]:
-                        new_index = (width * (top_offset + y)) + left_offset + x
-                        # Add current buffer value to new buffer value for finding the new pixel value
-                        data[new_index] = data[new_index] + map_data.data[current_index]
-                        # Calculate the new pixel type from updated buffer value
-                        pixel_type[left_offset + x, top_offset + y], carpet = DreameVacuumMapDecoder._get_pixel_type(
-                            current_map_data,
-                            int(data[new_index]),
-                            vslam_map,
-                        )
-                        if carpet and current_map_data.carpet_pixels is None:
-                            current_map_data.carpet_pixels = []
-
-                        if current_map_data.carpet_pixels is not None:
-                            coord = (left_offset + x, top_offset + y)
-                            if not carpet and coord in current_map_data.carpet_pixels:
-                                current_map_data.carpet_pixels.remove(coord)
-                            elif carpet and coord not in current_map_data.carpet_pixels:
+            new_data = np.frombuffer(
+                map_data.data, dtype=np.uint8, count=new_dimensions.width * new_dimensions.height
+            ).reshape(new_dimensions.height, new_dimensions.width)
+            y_coords, x_coords = np.nonzero(new_data)
+            if len(y_coords):
+                buffer = data[
+                    top_offset : top_offset + new_dimensions.height, left_offset : left_offset + new_dimensions.width
+                ]
+                # Add current buffer value to new buffer value for finding the new pixel value
+                buffer[y_coords, x_coords] += new_data[y_coords, x_coords]
+                # Calculate the new pixel type from updated buffer value
+                pixel_types, carpets = DreameVacuumMapDecoder._get_pixel_type_table(current_map_data, vslam_map)
+                values = buffer[y_coords, x_coords]
+                x_coords = x_coords + left_offset
+                y_coords = y_coords + top_offset
+                pixel_type[x_coords, y_coords] = pixel_types[values]
+
+                carpet = carpets[values]
+                if carpet.any() and current_map_data.carpet_pixels is None:
+                    current_map_data.carpet_pixels = []
+
+                if current_map_data.carpet_pixels is not None:
+                    carpet_pixels = current_map_data.carpet_pixels
+                    removed = set(zip(x_coords[~carpet].tolist(), y_coords[~carpet].tolist()))
+                    if removed:
+                        current_map_data.carpet_pixels = []
+                        for coord in carpet_pixels:
+                            if coord in removed:
+                                removed.discard(coord)
+                            else:
                                 current_map_data.carpet_pixels.append(coord)
 
+                    existing = set(carpet_pixels)
+                    current_map_data.carpet_pixels.extend(
+                        coord
+                        for coord in zip(x_coords[carpet].tolist(), y_coords[carpet].tolist())
+                        if coord not in existing
+                    )
+
             # Update size and buffer
-            current_map_data.data = bytes(data)
+            current_map_data.data = data.tobytes()
             current_map_data.pixel_type = pixel_type
             current_map_data.dimensions = MapImageDimensions(top, left, height, width, grid_size)
 
@@ -4095,23 +4675,35 @@ class DreameVacuumMapDecoder:
     @staticmethod
     def get_segments(map_data: MapData, vslam_map: bool) -> dict[str, Any]:
         segments = {}
-        for y in range(map_data.dimensions.height):
-            for x in range(map_data.dimensions.width):
-                segment_id = int(map_data.pixel_type[x, y])
-                if segment_id > 0 and segment_id < 64:
-                    if segment_id not in segments:
-                        segments[segment_id] = Segment(segment_id, x, y, x, y)
-                        continue
-
-                    if x < segments[segment_id].x0:
-                        segments[segment_id].x0 = x
-                    elif x > segments[segment_id].x1:
-                        segments[segment_id].x1 = x
-
-                    if y < segments[segment_id].y0:
-                        segments[segment_id].y0 = y
-                    elif y > segments[segment_id].y1:
-                        segments[segment_id].y1 = y
+        width = map_data.dimensions.width
+        height = map_data.dimensions.height
+        pixel_type = map_data.pixel_type[:width, :height]
+
+        # Label every segment pixel and reduce its coordinates to per segment extents in a single pass
+        x_coords, y_coords = np.nonzero((pixel_type > 0) & (pixel_type < 64))
+        if len(x_coords):
+            labels = pixel_type[x_coords, y_coords]
+            x0 = np.full(64, width, dtype=np.int64)
+            y0 = np.full(64, height, dtype=np.int64)
+            x1 = np.full(64, -1, dtype=np.int64)
+            y1 = np.full(64, -1, dtype=np.int64)
+            first = np.full(64, width * height, dtype=np.int64)
+            np.minimum.at(x0, labels, x_coords)
+            np.minimum.at(y0, labels, y_coords)
+            np.maximum.at(x1, labels, x_coords)
+            np.maximum.at(y1, labels, y_coords)
+            np.minimum.at(first, labels, y_coords * width + x_coords)
+
+            # Segments are ordered by their first pixel in row order
+            segment_ids = np.unique(labels)
+            for segment_id in segment_ids[np.argsort(first[segment_ids], kind="stable")].tolist():
+                segments[segment_id] = Segment(
+                    segment_id,
+                    int(x0[segment_id]),
+                    int(y0[segment_id]),
+                    int(x1[segment_id]),
+                    int(y1[segment_id]),
+                )
 
         if segments:
             for k, v in segments.items():
@@ -4121,19 +4713,13 @@ class DreameVacuumMapDecoder:
                 if map_data.saved_map:
                     if vslam_map:
                         if map_data.pixel_type[x, y] != k:
-                            startI = -1
-                            endI = -1
-                            for i in range(map_data.dimensions.width):
-                                value = map_data.pixel_type[i, y]
-                                if startI == -1:
-                                    if value == k:
-                                        startI = i
-                                elif value != k or i == (map_data.dimensions.width - 1):
-                                    endI = i - 1
-                                    break
-
-                            if startI != -1 and endI != -1:
-                                x = (endI - startI) + startI
+                            row = map_data.pixel_type[:width, y] == k
+                            if row.any():
+                                start = int(np.argmax(row))
+                                # Run ends at the first different pixel or one before the last column
+                                rest = ~row[start + 1 :]
+                                if len(rest):
+                                    x = start + (int(np.argmax(rest)) if rest.any() else len(rest) - 1)
                     else:
                         center_x = DreameVacuumMapDecoder._get_segment_center(map_data, k, y, False)
                         if center_x is not None:
@@ -4497,23 +5083,18 @@ class DreameVacuumMapDataJsonRenderer:
         self._grid_size: int = 0
         self.render_complete: bool = True
         self._layers: dict[MapRendererLayer, dict[str, Any]] = {}
+        self._entities: dict[MapRendererLayer, Any] = {}
+        self._version: int = 0
+        self._base_version: int = 0
+        self._layer_versions: dict[MapRendererLayer, int] = {}
+        # Version that the path is replaced and the path entity count and last entity size on every version since then
+        self._path_version: int = 0
+        self._path_sizes: Tuple[Tuple[int, int, int], ...] = ()
+        self._delta = None
 
         self._default_map_data: str = base64.b64decode(DEFAULT_MAP_DATA)
         self._default_map_image = Image.open(BytesIO(base64.b64decode(DEFAULT_MAP_DATA_IMAGE))).convert("RGBA")
 
-    @staticmethod
-    def _coordinate_tuple_sort(a: list[int], b: list[int]) -> bool:
-        xA = a[0]
-        yA = a[1]
-        xB = b[0]
-        yB = b[1]
-
-        if yB > yA:
-            return -1
-        if xB > xA:
-            return 1
-        return 0
-
     @staticmethod
     def _convert_coordinates(x: int, y: int) -> int:
         return [
@@ -4525,6 +5106,102 @@ class DreameVacuumMapDataJsonRenderer:
     def _convert_angle(angle: int) -> int:
         return (((180 - angle) if (angle < 180) else (360 - angle + 180)) + 270) % 360
 
+    @staticmethod
+    def _pixel_layer(layer: dict[str, Any], x: np.ndarray, y: np.ndarray) -> dict[str, Any]:
+        # Pixels are sorted by their y coordinate, pixels on the same row keep their order
+        order = np.argsort(y, kind="stable")
+        x = x[order]
+        y = y[order]
+        count = len(x)
+        min_x = int(x.min())
+        max_x = int(x.max())
+        min_y = int(y.min())
+        max_y = int(y.max())
+        sum_x = int(x.sum())
+        sum_y = int(y.sum())
+        layer[MAP_DATA_JSON_PARAMETER_DIMENSIONS] = {
+            MAP_DATA_JSON_PARAMETER_X: {
+                MAP_DATA_JSON_PARAMETER_MIN: min_x,
+                MAP_DATA_JSON_PARAMETER_MAX: max_x,
+                MAP_DATA_JSON_PARAMETER_MID: round((max_x + min_x) / 2),
+                MAP_DATA_JSON_PARAMETER_AVG: round(sum_x / count) if sum_x else None,
+            },
+            MAP_DATA_JSON_PARAMETER_Y: {
+                MAP_DATA_JSON_PARAMETER_MIN: min_y,
+                MAP_DATA_JSON_PARAMETER_MAX: max_y,
+                MAP_DATA_JSON_PARAMETER_MID: round((max_y + min_y) / 2),
+                MAP_DATA_JSON_PARAMETER_AVG: round(sum_y / count) if sum_y else None,
+            },
+            MAP_DATA_JSON_PARAMETER_PIXEL_COUNT: float(count),
+        }
+
+        layer[MAP_DATA_JSON_PARAMETER_COMPRESSED_PIXELS] = DreameVacuumMapRenderer._compress_pixels(x, y)
+        return layer
+
+    def get_map_data_json(self, version: int = None) -> str | None:
+        """Map data document, only the layers changed after the given version when the base map is not changed"""
+        if self._map_data_json is None:
+            return None
+
+        current_version, base_version, layer_versions, entities, path_version, path_sizes = self._delta
+        if version is None or version < base_version or version > current_version:
+            return json.dumps(self._map_data_json, separators=(",", ":"))
+
+        changed_entities = {}
+        appended_entities = {}
+        for layer, layer_version in layer_versions.items():
+            if layer_version > version and layer != MapRendererLayer.IMAGE:
+                if layer == MapRendererLayer.PATH and path_version <= version:
+                    # Path is only extended since the given version, send the points added after it
+                    appended_entities[layer.name.lower()] = DreameVacuumMapDataJsonRenderer._appended_path(
+                        entities[layer], path_sizes, version
+                    )
+                    continue
+                value = entities.get(layer, [])
+                changed_entities[layer.name.lower()] = value if isinstance(value, list) else [value]
+
+        delta = {
+            MAP_DATA_JSON_PARAMETER_CLASS: MAP_DATA_JSON_DELTA_CLASS,
+            MAP_DATA_JSON_PARAMETER_META_DATA: {
+                MAP_DATA_JSON_PARAMETER_MAP_VERSION: current_version,
+                MAP_DATA_JSON_PARAMETER_BASE_VERSION: base_version,
+            },
+            MAP_DATA_JSON_PARAMETER_ENTITIES: changed_entities,
+        }
+        if appended_entities:
+            delta[MAP_DATA_JSON_PARAMETER_APPENDED_ENTITIES] = appended_entities
+        return json.dumps(delta, separators=(",", ":"))
+
+    @staticmethod
+    def _appended_path(path: list[dict[str, Any]], path_sizes, version: int) -> list[dict[str, Any]]:
+        # Points of the entity at index are appended after the offset, new entities are sent with zero offset
+        count, size = next((count, size) for v, count, size in reversed(path_sizes) if v <= version)
+        appended = []
+        for index in range(count - 1, len(path)):
+            offset = size if index == count - 1 else 0
+            points = path[index][MAP_DATA_JSON_PARAMETER_POINTS][offset:]
+            if points or index >= count:
+                appended.append(
+                    {
+                        MAP_DATA_JSON_PARAMETER_TYPE: MAP_DATA_JSON_PARAMETER_PATH,
+                        MAP_DATA_JSON_PARAMETER_POINTS: points,
+                        MAP_DATA_JSON_PARAMETER_INDEX: index,
+                        MAP_DATA_JSON_PARAMETER_OFFSET: offset,
+                    }
+                )
+        return appended
+
+    @staticmethod
+    def _extends_path(previous_path: list[dict[str, Any]] | None, path: list[dict[str, Any]]) -> bool:
+        if not previous_path or len(path) < len(previous_path):
+            return False
+        last = len(previous_path) - 1
+        for index in range(last):
+            if path[index][MAP_DATA_JSON_PARAMETER_POINTS] != previous_path[index][MAP_DATA_JSON_PARAMETER_POINTS]:
+                return False
+        points = previous_path[last][MAP_DATA_JSON_PARAMETER_POINTS]
+        return path[last][MAP_DATA_JSON_PARAMETER_POINTS][: len(points)] == points
+
     @staticmethod
     def _to_buffer(image, extra_data: str) -> bytes:
         buffer = io.BytesIO()
@@ -4576,6 +5253,8 @@ class DreameVacuumMapDataJsonRenderer:
                 MAP_DATA_JSON_PARAMETER_ROTATION: map_data.rotation,
             },
         }
+        # Layers that are included in the document, used for finding the changed layers for the delta documents
+        entities: dict[MapRendererLayer, Any] = {}
 
         if map_data.robot_position:
             if (
@@ -4593,6 +5272,7 @@ class DreameVacuumMapDataJsonRenderer:
                     },
                 }
             map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].append(self._layers[MapRendererLayer.ROBOT])
+            entities[MapRendererLayer.ROBOT] = self._layers[MapRendererLayer.ROBOT]
 
         if map_data.charger_position:
             if (
@@ -4612,6 +5292,7 @@ class DreameVacuumMapDataJsonRenderer:
                     },
                 }
             map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].append(self._layers[MapRendererLayer.CHARGER])
+            entities[MapRendererLayer.CHARGER] = self._layers[MapRendererLayer.CHARGER]
 
         if map_data.no_mopping_areas:
             if (
@@ -4641,6 +5322,7 @@ class DreameVacuumMapDataJsonRenderer:
                         }
                     )
             map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].extend(self._layers[MapRendererLayer.NO_MOP])
+            entities[MapRendererLayer.NO_MOP] = self._layers[MapRendererLayer.NO_MOP]
 
         if map_data.no_go_areas:
             if (
@@ -4671,6 +5353,7 @@ class DreameVacuumMapDataJsonRenderer:
                         }
                     )
             map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].extend(self._layers[MapRendererLayer.NO_GO])
+            entities[MapRendererLayer.NO_GO] = self._layers[MapRendererLayer.NO_GO]
 
         if map_data.active_areas:
             if (
@@ -4701,6 +5384,7 @@ class DreameVacuumMapDataJsonRenderer:
                         }
                     )
             map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].extend(self._layers[MapRendererLayer.ACTIVE_AREA])
+            entities[MapRendererLayer.ACTIVE_AREA] = self._layers[MapRendererLayer.ACTIVE_AREA]
 
         if map_data.active_points:
             if (
@@ -4743,6 +5427,7 @@ class DreameVacuumMapDataJsonRenderer:
                         }
                     )
             map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].extend(self._layers[MapRendererLayer.ACTIVE_POINT])
+            entities[MapRendererLayer.ACTIVE_POINT] = self._layers[MapRendererLayer.ACTIVE_POINT]
 
         if map_data.virtual_walls:
             if (
@@ -4762,6 +5447,7 @@ class DreameVacuumMapDataJsonRenderer:
                         }
                     )
             map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].extend(self._layers[MapRendererLayer.WALL])
+            entities[MapRendererLayer.WALL] = self._layers[MapRendererLayer.WALL]
 
         if map_data.path and (
             self._map_data is None
@@ -4772,14 +5458,20 @@ class DreameVacuumMapDataJsonRenderer:
             points = []
             self._layers[MapRendererLayer.PATH] = []
             if map_data.path and len(map_data.path) > 1:
-                s = map_data.path[0]
-                for point in map_data.path[1:]:
-                    if point.path_type == PathType.LINE:
-                        point = point
-                        a = DreameVacuumMapDataJsonRenderer._convert_coordinates(s.x, s.y)
-                        b = DreameVacuumMapDataJsonRenderer._convert_coordinates(point.x, point.y)
-
-                        points.extend([a[0], a[1], b[0], b[1]])
+                # Same as _convert_coordinates but for all points at once
+                x = np.round(
+                    (np.array(map_data.path.x, dtype=np.int64) + DreameVacuumMapDataJsonRenderer.HALF_INT16) / 10
+                )
+                y = DreameVacuumMapDataJsonRenderer.MAX - np.round(
+                    (np.array(map_data.path.y, dtype=np.int64) + DreameVacuumMapDataJsonRenderer.HALF_INT16) / 10
+                )
+                x = x.astype(np.int64).tolist()
+                y = y.astype(np.int64).tolist()
+                line = ord(PathType.LINE.value)
+                operators = map_data.path.operators
+                for i in range(1, len(operators)):
+                    if operators[i] == line:
+                        points.extend([x[i - 1], y[i - 1], x[i], y[i]])
                     else:
                         self._layers[MapRendererLayer.PATH].append(
                             {
@@ -4788,18 +5480,16 @@ class DreameVacuumMapDataJsonRenderer:
                             }
                         )
                         points = []
-                    s = point
             self._layers[MapRendererLayer.PATH].append(
                 {
                     MAP_DATA_JSON_PARAMETER_TYPE: MAP_DATA_JSON_PARAMETER_PATH,
                     MAP_DATA_JSON_PARAMETER_POINTS: points,
                 }
             )
-            map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].extend(self._layers[MapRendererLayer.PATH])
 
-        floor_pixels = []
-        wall_pixels = []
-        segments = {}
+        if map_data.path and self._layers.get(MapRendererLayer.PATH):
+            map_data_json[MAP_DATA_JSON_PARAMETER_ENTITIES].extend(self._layers[MapRendererLayer.PATH])
+            entities[MapRendererLayer.PATH] = self._layers[MapRendererLayer.PATH]
 
         if (
             self._map_data is None
@@ -4810,65 +5500,53 @@ class DreameVacuumMapDataJsonRenderer:
             or not self._layers.get(MapRendererLayer.IMAGE)
         ):
             self._layers[MapRendererLayer.IMAGE] = []
-            for y in range(map_data.dimensions.height):
-                for x in range(map_data.dimensions.width):
-                    segment_id = int(map_data.pixel_type[x, y])
-                    coords = [
-                        (x + (self._left / self._grid_size)),
-                        (y + (self._top / self._grid_size)),
-                    ]
-
-                    coords[1] = (DreameVacuumMapDataJsonRenderer.MAX / self._grid_size) - coords[1]
-
-                    coords[0] = round(coords[0])
-                    coords[1] = round(coords[1])
-
-                    if segment_id == MapPixelType.WALL.value:
-                        wall_pixels.append(coords)
-                    elif segment_id == MapPixelType.FLOOR.value or segment_id == MapPixelType.UNKNOWN.value:
-                        floor_pixels.append(coords)
-                    elif segment_id > 0 and segment_id < 61:
-                        if map_data.active_segments and segment_id not in map_data.active_segments:
-                            floor_pixels.append(coords)
-                        else:
-                            if not map_data.segments:
-                                segment_id = 1
-
-                            if segment_id not in segments:
-                                segments[segment_id] = []
-                            segments[segment_id].append(coords)
-
-            if floor_pixels:
+            width = map_data.dimensions.width
+            height = map_data.dimensions.height
+            # Pixels in row order with their coordinates, same as iterating over the rows and columns of the map
+            pixel_type = map_data.pixel_type[:width, :height].T.ravel()
+            index = np.arange(pixel_type.size)
+            x = np.round((index % width) + (self._left / self._grid_size)).astype(np.int64)
+            y = np.round(
+                (DreameVacuumMapDataJsonRenderer.MAX / self._grid_size)
+                - ((index // width) + (self._top / self._grid_size))
+            ).astype(np.int64)
+
+            wall_pixels = pixel_type == MapPixelType.WALL.value
+            floor_pixels = (pixel_type == MapPixelType.FLOOR.value) | (pixel_type == MapPixelType.UNKNOWN.value)
+            segment_pixels = (pixel_type > 0) & (pixel_type < 61)
+            if map_data.active_segments:
+                inactive_pixels = segment_pixels & ~np.isin(pixel_type, list(map_data.active_segments))
+                floor_pixels = floor_pixels | inactive_pixels
+                segment_pixels = segment_pixels & ~inactive_pixels
+
+            if floor_pixels.any():
                 self._layers[MapRendererLayer.IMAGE].append(
-                    {
-                        MAP_DATA_JSON_PARAMETER_TYPE: MAP_DATA_JSON_PARAMETER_FLOOR,
-                        MAP_DATA_JSON_PARAMETER_PIXELS: [
-                            val
-                            for sublist in sorted(
-                                floor_pixels,
-                                key=cmp_to_key(DreameVacuumMapDataJsonRenderer._coordinate_tuple_sort),
-                            )
-                            for val in sublist
-                        ],
-                    }
+                    DreameVacuumMapDataJsonRenderer._pixel_layer(
+                        {MAP_DATA_JSON_PARAMETER_TYPE: MAP_DATA_JSON_PARAMETER_FLOOR, MAP_DATA_JSON_PARAMETER_PIXELS: []},
+                        x[floor_pixels],
+                        y[floor_pixels],
+                    )
                 )
 
-            if wall_pixels:
+            if wall_pixels.any():
                 self._layers[MapRendererLayer.IMAGE].append(
-                    {
-                        MAP_DATA_JSON_PARAMETER_TYPE: MAP_DATA_JSON_PARAMETER_WALL,
-                        MAP_DATA_JSON_PARAMETER_PIXELS: [
-                            val
-                            for sublist in sorted(
-                                wall_pixels,
-                                key=cmp_to_key(DreameVacuumMapDataJsonRenderer._coordinate_tuple_sort),
-                            )
-                            for val in sublist
-                        ],
-                    }
+                    DreameVacuumMapDataJsonRenderer._pixel_layer(
+                        {MAP_DATA_JSON_PARAMETER_TYPE: MAP_DATA_JSON_PARAMETER_WALL, MAP_DATA_JSON_PARAMETER_PIXELS: []},
+                        x[wall_pixels],
+                        y[wall_pixels],
+                    )
                 )
 
-            if segments:
+            if segment_pixels.any():
+                segments = {}
+                if map_data.segments:
+                    # Segments are listed in the order of their first pixel
+                    segment_ids, first_index = np.unique(pixel_type[segment_pixels], return_index=True)
+                    for k in segment_ids[np.argsort(first_index)].tolist():
+                        segments[k] = segment_pixels & (pixel_type == k)
+                else:
+                    segments[1] = segment_pixels
+
                 for k, v in segments.items():
                     name = None
                     if map_data.segments:
@@ -4876,151 +5554,67 @@ class DreameVacuumMapDataJsonRenderer:
                         if k in map_data.segments:
                             name = map_data.segments[k].name
                     self._layers[MapRendererLayer.IMAGE].append(
-                        {
-                            MAP_DATA_JSON_PARAMETER_TYPE: MAP_DATA_JSON_PARAMETER_SEGMENT,
-                            MAP_DATA_JSON_PARAMETER_PIXELS: [
-                                val
-                                for sublist in sorted(
-                                    v,
-                                    key=cmp_to_key(DreameVacuumMapDataJsonRenderer._coordinate_tuple_sort),
-                                )
-                                for val in sublist
-                            ],
-                            MAP_DATA_JSON_PARAMETER_META_DATA: {
-                                MAP_DATA_JSON_PARAMETER_SEGMENT_ID: k,
-                                MAP_DATA_JSON_PARAMETER_ACTIVE: (
-                                    True if map_data.active_segments and k in map_data.active_segments else False
-                                ),
-                                MAP_DATA_JSON_PARAMETER_NAME: name,
+                        DreameVacuumMapDataJsonRenderer._pixel_layer(
+                            {
+                                MAP_DATA_JSON_PARAMETER_TYPE: MAP_DATA_JSON_PARAMETER_SEGMENT,
+                                MAP_DATA_JSON_PARAMETER_PIXELS: [],
+                                MAP_DATA_JSON_PARAMETER_META_DATA: {
+                                    MAP_DATA_JSON_PARAMETER_SEGMENT_ID: k,
+                                    MAP_DATA_JSON_PARAMETER_ACTIVE: (
+                                        True if map_data.active_segments and k in map_data.active_segments else False
+                                    ),
+                                    MAP_DATA_JSON_PARAMETER_NAME: name,
+                                },
                             },
-                        }
-                    )
-
-            for layers in self._layers[MapRendererLayer.IMAGE]:
-                pixels = layers[MAP_DATA_JSON_PARAMETER_PIXELS]
-                layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS] = {
-                    MAP_DATA_JSON_PARAMETER_X: {
-                        MAP_DATA_JSON_PARAMETER_MIN: 65535,
-                        MAP_DATA_JSON_PARAMETER_MAX: -65535,
-                        MAP_DATA_JSON_PARAMETER_MID: None,
-                        MAP_DATA_JSON_PARAMETER_AVG: None,
-                    },
-                    MAP_DATA_JSON_PARAMETER_Y: {
-                        MAP_DATA_JSON_PARAMETER_MIN: 65535,
-                        MAP_DATA_JSON_PARAMETER_MAX: -65535,
-                        MAP_DATA_JSON_PARAMETER_MID: None,
-                        MAP_DATA_JSON_PARAMETER_AVG: None,
-                    },
-                    MAP_DATA_JSON_PARAMETER_PIXEL_COUNT: len(pixels) / 2,
-                }
-
-                sum_x = 0
-                sum_y = 0
-                for i in range(0, len(pixels), 2):
-                    sum_x = sum_x + pixels[i]
-                    sum_y = sum_y + pixels[i + 1]
-
-                    if (
-                        pixels[i]
-                        < layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_X][
-                            MAP_DATA_JSON_PARAMETER_MIN
-                        ]
-                    ):
-                        layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_X][
-                            MAP_DATA_JSON_PARAMETER_MIN
-                        ] = pixels[i]
-
-                    if (
-                        pixels[i]
-                        > layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_X][
-                            MAP_DATA_JSON_PARAMETER_MAX
-                        ]
-                    ):
-                        layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_X][
-                            MAP_DATA_JSON_PARAMETER_MAX
-                        ] = pixels[i]
-
-                    if (
-                        pixels[i + 1]
-                        < layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_Y][
-                            MAP_DATA_JSON_PARAMETER_MIN
-                        ]
-                    ):
-                        layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_Y][
-                            MAP_DATA_JSON_PARAMETER_MIN
-                        ] = pixels[i + 1]
-
-                    if (
-                        pixels[i + 1]
-                        > layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_Y][
-                            MAP_DATA_JSON_PARAMETER_MAX
-                        ]
-                    ):
-                        layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_Y][
-                            MAP_DATA_JSON_PARAMETER_MAX
-                        ] = pixels[i + 1]
-
-                layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_X][MAP_DATA_JSON_PARAMETER_MID] = (
-                    round(
-                        (
-                            layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_X][
-                                MAP_DATA_JSON_PARAMETER_MAX
-                            ]
-                            + layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_X][
-                                MAP_DATA_JSON_PARAMETER_MIN
-                            ]
-                        )
-                        / 2
-                    )
-                )
-                layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_Y][MAP_DATA_JSON_PARAMETER_MID] = (
-                    round(
-                        (
-                            layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_Y][
-                                MAP_DATA_JSON_PARAMETER_MAX
-                            ]
-                            + layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_Y][
-                                MAP_DATA_JSON_PARAMETER_MIN
-                            ]
+                            x[v],
+                            y[v],
                         )
-                        / 2
                     )
-                )
-
-                if sum_x:
-                    layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_X][
-                        MAP_DATA_JSON_PARAMETER_AVG
-                    ] = round(sum_x / (len(pixels) / 2))
-                if sum_y:
-                    layers[MAP_DATA_JSON_PARAMETER_DIMENSIONS][MAP_DATA_JSON_PARAMETER_Y][
-                        MAP_DATA_JSON_PARAMETER_AVG
-                    ] = round(sum_y / (len(pixels) / 2))
-
-                current_x_start = -65535
-                current_y = -65535
-                current_count = 0
-                compressed_pixels = []
-
-                for i in range(0, len(pixels), 2):
-                    x = pixels[i]
-                    y = pixels[i + 1]
-
-                    if y != current_y or x > (current_x_start + current_count):
-                        compressed_pixels.extend([current_x_start, current_y, current_count])
-                        current_x_start = x
-                        current_y = y
-                        current_count = 1
-                    elif x != current_x_start:
-                        current_count = current_count + 1
-
-                compressed_pixels.extend([current_x_start, current_y, current_count])
-                layers[MAP_DATA_JSON_PARAMETER_COMPRESSED_PIXELS] = compressed_pixels[3:]
-                layers[MAP_DATA_JSON_PARAMETER_PIXELS] = []
 
         map_data_json[MAP_DATA_JSON_PARAMETER_LAYERS].extend(self._layers[MapRendererLayer.IMAGE])
+        entities[MapRendererLayer.IMAGE] = self._layers[MapRendererLayer.IMAGE]
+
+        # Layers are replaced when they are changed, not modified in place
+        version = self._version + 1
+        layer_versions = self._layer_versions.copy()
+        for layer in set(entities) | set(self._entities):
+            if entities.get(layer) is not self._entities.get(layer):
+                layer_versions[layer] = version
+        base_version = self._base_version
+        if (
+            layer_versions.get(MapRendererLayer.IMAGE) == version
+            or self._map_data is None
+            or self._map_data.rotation != map_data.rotation
+        ):
+            base_version = version
+        if layer_versions != self._layer_versions or base_version != self._base_version:
+            self._version = version
+        path = entities.get(MapRendererLayer.PATH)
+        if path is not self._entities.get(MapRendererLayer.PATH):
+            path_size = (
+                ((version, len(path), len(path[-1][MAP_DATA_JSON_PARAMETER_POINTS])),) if path else ()
+            )
+            if path and self._path_sizes and self._extends_path(self._entities.get(MapRendererLayer.PATH), path):
+                self._path_sizes = self._path_sizes + path_size
+            else:
+                self._path_version = version
+                self._path_sizes = path_size
+        self._base_version = base_version
+        self._layer_versions = layer_versions
+        self._entities = entities
+        map_data_json[MAP_DATA_JSON_PARAMETER_META_DATA][MAP_DATA_JSON_PARAMETER_MAP_VERSION] = self._version
+        map_data_json[MAP_DATA_JSON_PARAMETER_META_DATA][MAP_DATA_JSON_PARAMETER_BASE_VERSION] = self._base_version
 
         self._map_data = map_data
         self._map_data_json = map_data_json
+        self._delta = (
+            self._version,
+            self._base_version,
+            layer_versions,
+            entities,
+            self._path_version,
+            self._path_sizes,
+        )
         _LOGGER.debug(
             "Render Map Data: %s:%s took: %.2f",
             map_data.map_id,
@@ -5052,9 +5646,17 @@ class DreameVacuumMapRenderer:
         low_resolution: bool = False,
         square: bool = False,
         cache: bool = True,
+        encoder: str = None,
     ) -> None:
         self.color_scheme: MapRendererColorScheme = MAP_COLOR_SCHEME_LIST.get(color_scheme, MapRendererColorScheme())
         self.icon_set: int = MAP_ICON_SET_LIST.get(icon_set, 0)
+        self.encoder: MapRendererEncoder = MAP_ENCODER_LIST.get(encoder, MapRendererEncoder())
+        self.encode_time: float = None
+        self.encode_size: int = None
+        self.stream_encode_time: float = None
+        self.stream_encode_size: int = None
+        # Last frame is rendered without redrawing the map and the layers below the robot
+        self.render_overlay: bool = False
         self.config: MapRendererConfig = MapRendererConfig()
         if map_objects is not None:
             for attr in self.config.__dict__.keys():
@@ -5107,6 +5709,32 @@ class DreameVacuumMapRenderer:
         ]
 
         self._image = None
+        self._buffer = None
+        self._stream_buffer = None
+        self._base_image = None
+        self._base_version = None
+        self._base_update = None
+        self._objects_base = None
+        self._objects_image = None
+        self._objects_layer = None
+        self._objects_layers = None
+        self._objects_background = None
+        self._objects_background_version = None
+        self._objects_robot_box = None
+        self._layer_versions: dict[MapRendererLayer, int] = {}
+        self._path_key = None
+        self._path_length: int = 0
+        self._path_first = None
+        self._path_last = None
+        self._path_type = ""
+        self._path_sweep = []
+        self._path_mop = []
+        self._path_layer = None
+        self._path_mop_layer = None
+        self._path_mask = None
+        self._path_image = None
+        self._path_box = None
+        self.layer_render_times: dict[str, float] = {}
         self._charger_icon = None
         self._robot_icon = None
         self._robot_charging_icon = None
@@ -5195,12 +5823,38 @@ class DreameVacuumMapRenderer:
                 for icon in MAP_ICON_CUSTOM_MOPPING_ROUTE_DREAME
             ]
 
-    @staticmethod
-    def _to_buffer(image) -> bytes:
+    def _to_buffer(self, image) -> bytes:
         if image:
+            now = time.time()
             buffer = io.BytesIO()
-            image.save(buffer, format="PNG")
-            return buffer.getvalue()
+            if self.encoder.palette:
+                # Map colors are mostly flat, octree is the only quantizer that keeps the alpha channel
+                image = image.quantize(method=Image.Quantize.FASTOCTREE)
+            image.save(buffer, format="PNG", compress_level=self.encoder.compress_level)
+            buffer = buffer.getvalue()
+            self.encode_time = time.time() - now
+            self.encode_size = len(buffer)
+            _LOGGER.debug("Encode frame: %s bytes took: %.3f", self.encode_size, self.encode_time)
+            return buffer
+
+    def render_stream_image(self) -> bytes | None:
+        """JPEG encoded last rendered frame for the camera stream"""
+        if self.encoder.stream_quality is None or self._image is None:
+            return None
+
+        if self._stream_buffer is None:
+            now = time.time()
+            image = self._image
+            if image.mode != "RGB":
+                background = Image.new("RGB", image.size, (0, 0, 0) if self.color_scheme.dark else (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A") if "A" in image.getbands() else None)
+                image = background
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=self.encoder.stream_quality)
+            self._stream_buffer = buffer.getvalue()
+            self.stream_encode_time = time.time() - now
+            self.stream_encode_size = len(self._stream_buffer)
+        return self._stream_buffer
 
     @staticmethod
     def _set_icon_color(image, size, color):
@@ -5218,6 +5872,36 @@ class DreameVacuumMapRenderer:
 
         return ico
 
+    @staticmethod
+    def _compress_pixels(x: np.ndarray, y: np.ndarray) -> list[int]:
+        """Run length encoded rows as x, y and the count of the consecutive pixels"""
+        if not len(x):
+            return []
+
+        same_row = y[1:] == y[:-1]
+        if np.all(x[1:][same_row] > x[:-1][same_row]):
+            starts = np.flatnonzero(np.concatenate(([True], ~same_row | (x[1:] != x[:-1] + 1))))
+            counts = np.diff(np.append(starts, len(x)))
+            return np.column_stack((x[starts], y[starts], counts)).ravel().tolist()
+
+        # Pixels on the same row are not ordered or coordinates of different pixels are same
+        x = x.tolist()
+        y = y.tolist()
+        current_x_start = x[0]
+        current_y = y[0]
+        current_count = 1
+        compressed_pixels = []
+        for px, py in zip(x[1:], y[1:]):
+            if py != current_y or px > (current_x_start + current_count):
+                compressed_pixels.extend([current_x_start, current_y, current_count])
+                current_x_start = px
+                current_y = py
+                current_count = 1
+            elif px != current_x_start:
+                current_count = current_count + 1
+        compressed_pixels.extend([current_x_start, current_y, current_count])
+        return compressed_pixels
+
     @staticmethod
     def _calculate_bounds(dimensions, segments) -> list[int]:
         if segments:
@@ -5512,6 +6196,13 @@ class DreameVacuumMapRenderer:
             return (int(outRGB[0]), int(outRGB[1]), int(outRGB[2]), int(outA * 255))
         return source
 
+    def _stamp_layer(self, layer, started, changed=True):
+        now = time.perf_counter()
+        if changed:
+            self._layer_versions[layer] = self._layer_versions.get(layer, 0) + 1
+            self.layer_render_times[layer.name.lower()] = round((now - started) * 1000, 2)
+        return now
+
     def _combine_layers(self, cached_layers, layer_size, parent, sub):
         cached_layers[parent] = Image.new("RGBA", layer_size, (255, 255, 255, 0))
         if sub in cached_layers:
@@ -5525,6 +6216,7 @@ class DreameVacuumMapRenderer:
         resources: MapRendererResources = None,
         robot_status: int = 0,
         station_status: int = 0,
+        encoding: str = None,
     ) -> str:
         now = time.time()
 
@@ -5545,35 +6237,42 @@ class DreameVacuumMapRenderer:
             )
         else:
             pixels = {}
+            pixel_data = None
             min_x = map_data.dimensions.width - 1
             min_y = map_data.dimensions.height - 1
             max_x = 0
             max_y = 0
-            for y in range(map_data.dimensions.height):
-                for x in range(map_data.dimensions.width):
-                    px_type = int(map_data.pixel_type[x, y])
-                    if px_type:
-                        # if map_data.segments and map_data.saved_map and px_type == 255:
-                        #    pixel = map_data.data[(map_data.dimensions.width * y) + x]
-                        #    if pixel > 0:
-                        #        px_type = px_type + (pixel & 0x3F)
-
-                        if px_type in pixels:
-                            pixels[px_type].extend([x, y])
-                        else:
-                            pixels[px_type] = [x, y]
-                        max_x = max(x, max_x)
-                        min_x = min(x, min_x)
-                        max_y = max(y, max_y)
-                        min_y = min(y, min_y)
+
+            # Pixel types in row order as they are drawn on the card
+            pixel_type = map_data.pixel_type[: map_data.dimensions.width, : map_data.dimensions.height].T
+            y, x = np.nonzero(pixel_type)
+            if len(x):
+                min_x = int(x.min())
+                max_x = int(x.max())
+                min_y = int(y.min())
+                max_y = int(y.max())
+
+            if encoding == MAP_DATA_STRING_ENCODING_ZLIB:
+                # Whole pixel type array instead of the pixel layers, it is decoded by the card with the map size
+                pixel_data = base64.b85encode(zlib.compress(np.ascontiguousarray(pixel_type).tobytes())).decode(
+                    "utf-8"
+                )
+            else:
+                encoding = None
+                px_types = pixel_type[y, x]
+                order = np.argsort(px_types, kind="stable")
+                px_types = px_types[order]
+                splits = np.flatnonzero(px_types[1:] != px_types[:-1]) + 1
+                for px_type, layer_x, layer_y in zip(
+                    px_types[np.concatenate(([0], splits))].tolist() if len(px_types) else [],
+                    np.split(x[order], splits),
+                    np.split(y[order], splits),
+                ):
+                    pixels[px_type] = DreameVacuumMapRenderer._compress_pixels(layer_x, layer_y)
 
             if map_data.carpet_pixels:
-                px_type = 512
-                for px in map_data.carpet_pixels:
-                    if px_type in pixels:
-                        pixels[px_type].extend([px[0], px[1]])
-                    else:
-                        pixels[px_type] = [px[0], px[1]]
+                carpet_pixels = np.array(map_data.carpet_pixels).reshape(-1, 2)
+                pixels[512] = DreameVacuumMapRenderer._compress_pixels(carpet_pixels[:, 0], carpet_pixels[:, 1])
 
             crop = [0, 0, 0, 0]
 
@@ -5606,45 +6305,29 @@ class DreameVacuumMapRenderer:
                     min_y,
                 ]
 
-            for layer in pixels.keys():
-                current_x_start = -1
-                current_y = -1
-                current_count = 0
-                compressed_pixels = []
-                coords = pixels[layer]
-                for i in range(0, len(coords), 2):
-                    x = coords[i]
-                    y = coords[i + 1]
-                    if y != current_y or x > (current_x_start + current_count):
-                        compressed_pixels.extend([current_x_start, current_y, current_count])
-                        current_x_start = x
-                        current_y = y
-                        current_count = 1
-                    elif x != current_x_start:
-                        current_count = current_count + 1
-                compressed_pixels.extend([current_x_start, current_y, current_count])
-                pixels[layer] = compressed_pixels[3:]
-
-            path_types = {"S": 1, "W": 2, "M": 3}
+            path_types = {ord("S"): 1, ord("W"): 2, ord("M"): 3}
             paths = None
             if map_data.path:
                 paths = []
+                line = ord(PathType.LINE.value)
                 coords = [
-                    path_types.get(map_data.path[0].path_type),
-                    map_data.path[0].x,
-                    map_data.path[0].y,
+                    path_types.get(map_data.path.operators[0]),
+                    map_data.path.x[0],
+                    map_data.path.y[0],
                 ]
-                for path in map_data.path[1:]:
-                    if path.path_type.value != "L":
+                for x, y, operator in zip(map_data.path.x[1:], map_data.path.y[1:], map_data.path.operators[1:]):
+                    if operator != line:
                         paths.append(coords)
-                        coords = [path_types.get(path.path_type)]
-                    coords.extend([path.x, path.y])
+                        coords = [path_types.get(operator)]
+                    coords.extend([x, y])
 
                 if len(coords) > 2:
                     paths.append(coords)
 
             map_data_json = MapRendererData(
                 data=pixels,
+                encoding=encoding,
+                pixels=pixel_data,
                 size=[
                     map_data.dimensions.left,
                     map_data.dimensions.top,
@@ -6143,6 +6826,7 @@ class DreameVacuumMapRenderer:
             return self.default_map_image
 
         self.render_complete = False
+        self.render_overlay = False
         now = time.time()
 
         if map_data.saved_map:
@@ -6168,8 +6852,11 @@ class DreameVacuumMapRenderer:
                     and self._image
                 ):
                     self.render_complete = True
+                    self.render_overlay = True
                     _LOGGER.info("Skip render frame, map data not changed")
-                    return self._to_buffer(self._image)
+                    if self._buffer is None:
+                        self._buffer = self._to_buffer(self._image)
+                    return self._buffer
 
             scale = (
                 2
@@ -6256,11 +6943,9 @@ class DreameVacuumMapRenderer:
 
             if not self._low_memory and self.config.path and map_data.path and self._robot_type != RobotType.VSLAM:
                 if not self._cache or self._map_data is None or self._map_data.path != map_data.path:
-                    self._has_mask = False
-                    for path in map_data.path:
-                        if path.path_type == PathType.SWEEP_AND_MOP or path.path_type == PathType.MOP:
-                            self._has_mask = True
-                            break
+                    self._has_mask = map_data.path.has_path_type(PathType.SWEEP_AND_MOP) or map_data.path.has_path_type(
+                        PathType.MOP
+                    )
             else:
                 self._has_mask = False
 
@@ -6296,6 +6981,7 @@ class DreameVacuumMapRenderer:
                 else ((0, 0, 0, 0) if map_data.wifi_map else self.color_scheme.outside)
             )
 
+            timer = time.perf_counter()
             if (
                 not self._cache
                 or self._map_data is None
@@ -6372,15 +7058,33 @@ class DreameVacuumMapRenderer:
                         else:
                             area_colors[k] = area_colors[MapPixelType.FLOOR.value]
 
-                pixels = np.full(
-                    (
-                        map_data.dimensions.height,
-                        map_data.dimensions.width,
-                        4,
-                    ),
-                    area_colors[MapPixelType.OUTSIDE.value],
-                    dtype=np.uint8,
-                )
+                # Pixel types are stored bottom to top, flip them to image rows
+                pixel_type = map_data.pixel_type[: map_data.dimensions.width, : map_data.dimensions.height][
+                    :, ::-1
+                ].T
+                filled = pixel_type != 0
+
+                # Colors are written with a single lookup from a table indexed by the pixel type
+                color_table = np.empty((256, 4), dtype=np.uint8)
+                color_table[:] = area_colors[MapPixelType.NEW_SEGMENT.value]
+                color_table[MapPixelType.OUTSIDE.value] = area_colors[MapPixelType.OUTSIDE.value]
+                for k, v in area_colors.items():
+                    if isinstance(k, (int, np.integer)) and 0 < k < 256:
+                        color_table[k] = v
+                pixels = color_table[pixel_type]
+
+                min_x = map_data.dimensions.width - 1
+                min_y = map_data.dimensions.height - 1
+                max_x = 0
+                max_y = 0
+
+                filled_columns = np.flatnonzero(np.any(filled, axis=0))
+                if len(filled_columns):
+                    filled_rows = np.flatnonzero(np.any(filled, axis=1))
+                    min_x = min(int(filled_columns[0]), min_x)
+                    max_x = max(int(filled_columns[-1]), max_x)
+                    min_y = min(int(filled_rows[0]), min_y)
+                    max_y = max(int(filled_rows[-1]), max_y)
 
                 if self._has_mask:
                     mask_color = (255, 255, 255, 255)
@@ -6393,6 +7097,7 @@ class DreameVacuumMapRenderer:
                         (255, 255, 255, 0),
                         dtype=np.uint8,
                     )
+                    mask[filled & (pixel_type != MapPixelType.WALL.value)] = mask_color
 
                 if map_data.history_map and map_data.neglected_segments:
                     segment_mask = np.full(
@@ -6404,30 +7109,11 @@ class DreameVacuumMapRenderer:
                         (255, 255, 255, 0),
                         dtype=np.uint8,
                     )
-
-                min_x = map_data.dimensions.width - 1
-                min_y = map_data.dimensions.height - 1
-                max_x = 0
-                max_y = 0
-
-                for y in range(map_data.dimensions.height):
-                    for x in range(map_data.dimensions.width):
-                        px_type = int(map_data.pixel_type[x, map_data.dimensions.height - y - 1])
-
-                        if px_type != 0:
-                            pixels[y, x] = area_colors.get(px_type, area_colors[253])
-
-                            max_x = max(x, max_x)
-                            min_x = min(x, min_x)
-                            max_y = max(y, max_y)
-                            min_y = min(y, min_y)
-
-                            if self._has_mask and px_type != 255:
-                                mask[y, x] = mask_color
-
-                            if segment_mask is not None:
-                                if px_type in map_data.neglected_segments:
-                                    segment_mask[y, x] = self.color_scheme.neglected_segment
+                    neglected_segments = [
+                        k for k in map_data.neglected_segments if isinstance(k, (int, np.integer)) and 0 < k < 256
+                    ]
+                    if neglected_segments:
+                        segment_mask[np.isin(pixel_type, neglected_segments)] = self.color_scheme.neglected_segment
 
                 if render_material or render_carpet:
                     floor_scale = 2
@@ -6561,6 +7247,7 @@ class DreameVacuumMapRenderer:
                         ),
                         fill=(255, 255, 255, 0),
                     )
+                self._stamp_layer(MapRendererLayer.IMAGE, timer)
             else:
                 map_data.dimensions.crop = self._map_data.dimensions.crop
 
@@ -6568,6 +7255,8 @@ class DreameVacuumMapRenderer:
 
             image = cached_layers[MapRendererLayer.IMAGE]
 
+            timer = time.perf_counter()
+            path_box = None
             if not map_data.saved_map and map_data.path and self.config.path:
                 if (
                     not self._cache
@@ -6575,7 +7264,7 @@ class DreameVacuumMapRenderer:
                     or self._map_data.path != map_data.path
                     or not cached_layers.get(MapRendererLayer.PATH)
                 ):
-                    cached_layers[MapRendererLayer.PATH] = self.render_path(
+                    path_layer = self.render_path(
                         map_data.path,
                         self.color_scheme.path,
                         self.color_scheme.mop_path,
@@ -6587,12 +7276,71 @@ class DreameVacuumMapRenderer:
                         map_data.dimensions,
                         0.375 * scale * object_scale,
                         object_scale,
+                        map_data.map_id,
                     )
-                    cached_layers[MapRendererLayer.PATH].thumbnail(image.size, Image.Resampling.BOX, reducing_gap=1.5)
-                    _LOGGER.debug("Render PATH")
-                image = Image.alpha_composite(image, cached_layers[MapRendererLayer.PATH])
+                    path_box = self._path_box
+                    if (
+                        path_box
+                        and cached_layers.get(MapRendererLayer.PATH)
+                        and cached_layers[MapRendererLayer.PATH].size == image.size
+                    ):
+                        # Only the area of the appended points is scaled down again
+                        path_box = (
+                            int(path_box[0] / object_scale),
+                            int(path_box[1] / object_scale),
+                            min(int(math.ceil(path_box[2] / object_scale)), image.size[0]),
+                            min(int(math.ceil(path_box[3] / object_scale)), image.size[1]),
+                        )
+                        cached_layers[MapRendererLayer.PATH].paste(
+                            path_layer.crop(tuple(v * object_scale for v in path_box)).resize(
+                                (path_box[2] - path_box[0], path_box[3] - path_box[1]),
+                                Image.Resampling.BOX,
+                                reducing_gap=1.5,
+                            ),
+                            path_box[:2],
+                        )
+                        _LOGGER.debug("Render PATH %s", path_box)
+                    else:
+                        path_box = None
+                        cached_layers[MapRendererLayer.PATH] = path_layer.resize(
+                            image.size, Image.Resampling.BOX, reducing_gap=1.5
+                        )
+                        _LOGGER.debug("Render PATH")
+                    self._stamp_layer(MapRendererLayer.PATH, timer)
             elif self._cache and cached_layers.get(MapRendererLayer.PATH):
                 del cached_layers[MapRendererLayer.PATH]
+                self._stamp_layer(MapRendererLayer.PATH, timer)
+
+            # Map image with the path on top is only composited again when one of them is changed
+            base_version = (
+                self._layer_versions.get(MapRendererLayer.IMAGE),
+                self._layer_versions.get(MapRendererLayer.PATH) if cached_layers.get(MapRendererLayer.PATH) else None,
+            )
+            if not self._cache or self._base_image is None or self._base_version != base_version:
+                if (
+                    self._cache
+                    and path_box
+                    and self._base_version[0] == base_version[0]
+                    and self._base_version[1] is not None
+                ):
+                    image = self._base_image.copy()
+                    image.paste(
+                        Image.alpha_composite(
+                            cached_layers[MapRendererLayer.IMAGE].crop(path_box),
+                            cached_layers[MapRendererLayer.PATH].crop(path_box),
+                        ),
+                        path_box[:2],
+                    )
+                    self._base_update = (self._base_image, path_box)
+                else:
+                    if cached_layers.get(MapRendererLayer.PATH):
+                        image = Image.alpha_composite(image, cached_layers[MapRendererLayer.PATH])
+                    self._base_update = None
+                if self._cache:
+                    self._base_image = image
+                    self._base_version = base_version
+            else:
+                image = self._base_image
 
             image = self.render_objects(cached_layers, map_data, robot_status, station_status, image, object_scale)
 
@@ -6838,10 +7586,15 @@ class DreameVacuumMapRenderer:
                 self._station_status = station_status
                 self._image = image
         except Exception:
+            self._objects_layer = None
             _LOGGER.error("Map render Failed: %s", traceback.format_exc())
 
         self.render_complete = True
-        return self._to_buffer(self._image if self._cache else image)
+        buffer = self._to_buffer(self._image if self._cache else image)
+        if self._cache:
+            self._buffer = buffer
+            self._stream_buffer = None
+        return buffer
 
     def render_objects(self, cached_layers, map_data, robot_status, station_status, map_image, scale):
         layer_size = (int(map_image.size[0] * scale), int(map_image.size[1] * scale))
@@ -6883,6 +7636,7 @@ class DreameVacuumMapRenderer:
             robot_icon_size = robot_icon_size * 0.7
             icon_size = icon_size * 1.3
 
+        timer = time.perf_counter()
         layer = MapRendererLayer.NO_MOP
         if (
             (not map_data.saved_map or map_data.recovery_map)
@@ -6912,6 +7666,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.NO_GO
         if (not map_data.saved_map or map_data.recovery_map) and map_data.no_go_areas and self.config.no_go:
             layers.append(layer)
@@ -6935,6 +7690,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.WALL
         if (not map_data.saved_map or map_data.recovery_map) and map_data.virtual_walls and self.config.virtual_wall:
             layers.append(layer)
@@ -6957,6 +7713,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.VIRTUAL_THRESHOLD
         if map_data.virtual_thresholds and self.config.pathway:
             layers.append(layer)
@@ -6979,6 +7736,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.LOW_LYING_AREA
         if map_data.low_lying_areas and self.config.low_lying_area:
             layers.append(layer)
@@ -7000,6 +7758,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.FURNITURES
         if map_data.furnitures and self.config.furniture:
             layers.append(layer)
@@ -7046,6 +7805,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.ACTIVE_AREA
         if not map_data.saved_map and map_data.active_areas and self.config.active_area:
             layers.append(layer)
@@ -7069,6 +7829,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.ACTIVE_POINT
         if not map_data.saved_map and map_data.active_points and self.config.active_point:
             layers.append(layer)
@@ -7092,6 +7853,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.SEGMENTS
         if (
             map_data.segments
@@ -7197,6 +7959,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.CHARGER
         if map_data.charger_position and self.config.charger:
             layers.append(layer)
@@ -7354,6 +8117,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.ROBOT
         if not map_data.saved_map and map_data.robot_position and self.config.robot:
             layers.append(layer)
@@ -7437,6 +8201,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.ROUTER
         if map_data.router_position and map_data.wifi_map:
             layers.append(layer)
@@ -7460,6 +8225,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.OBSTACLES
         if not map_data.saved_map and map_data.obstacles and (self.config.obstacle or self.config.pet):
             layers.append(layer)
@@ -7529,6 +8295,7 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        timer = self._stamp_layer(layer, timer, layer in changes)
         layer = MapRendererLayer.CRUISE_POINTS
         if not map_data.saved_map and map_data.active_cruise_points:  # and self.config.cruise_point:
             layers.append(layer)
@@ -7574,32 +8341,134 @@ class DreameVacuumMapRenderer:
             changes.append(layer)
             del cached_layers[layer]
 
+        self._stamp_layer(layer, timer, layer in changes)
+        timer = time.perf_counter()
+        box = None
         if changes or not self._cache:
-            cached_layers[MapRendererLayer.OBJECTS] = Image.new(
-                "RGBA",
-                [layer_size[0], layer_size[1]],
-                (255, 255, 255, 0),
+            # Layers below the robot are pre-composited and reused until one of their versions changes
+            robot_index = (
+                layers.index(MapRendererLayer.ROBOT) if MapRendererLayer.ROBOT in layers else len(layers)
             )
-            for l in layers:
-                if cached_layers.get(l):
-                    if l in changes:
-                        _LOGGER.debug("Render %s", l.name)
-                    cached_layers[MapRendererLayer.OBJECTS] = Image.alpha_composite(
-                        cached_layers[MapRendererLayer.OBJECTS], cached_layers[l]
-                    )
+            background_version = (
+                layer_size,
+                tuple((l, self._layer_versions.get(l)) for l in layers[:robot_index] if cached_layers.get(l)),
+            )
+            if (
+                not self._cache
+                or self._objects_background is None
+                or self._objects_background_version != background_version
+            ):
+                background = Image.new("RGBA", layer_size, (255, 255, 255, 0))
+                for l in layers[:robot_index]:
+                    if cached_layers.get(l):
+                        if l in changes:
+                            _LOGGER.debug("Render %s", l.name)
+                        background = Image.alpha_composite(background, cached_layers[l])
+                if self._cache:
+                    self._objects_background = background
+                    self._objects_background_version = background_version
+            else:
+                background = self._objects_background
 
-            if layer_size != map_image.size:
-                cached_layers[MapRendererLayer.OBJECTS].thumbnail(
-                    map_image.size, Image.Resampling.BOX, reducing_gap=1.5
+            robot_box = None
+            if MapRendererLayer.ROBOT in layers and cached_layers.get(MapRendererLayer.ROBOT):
+                robot_box = cached_layers[MapRendererLayer.ROBOT].getbbox()
+
+            # Only the area covered by the previous and the current robot icon needs to be redrawn when the robot has moved
+            if (
+                self._cache
+                and changes == [MapRendererLayer.ROBOT]
+                and self._objects_layers == layers
+                and self._objects_layer is not None
+                and self._objects_layer.size == layer_size
+                and cached_layers.get(MapRendererLayer.OBJECTS)
+                and (robot_box or self._objects_robot_box)
+                and isinstance(scale, int)
+            ):
+                boxes = [b for b in (robot_box, self._objects_robot_box) if b]
+                box = (
+                    int(min(b[0] for b in boxes) / scale) * scale,
+                    int(min(b[1] for b in boxes) / scale) * scale,
+                    min(int(math.ceil(max(b[2] for b in boxes) / scale)) * scale, layer_size[0]),
+                    min(int(math.ceil(max(b[3] for b in boxes) / scale)) * scale, layer_size[1]),
                 )
+                _LOGGER.debug("Render %s %s", MapRendererLayer.ROBOT.name, box)
+                self.render_overlay = True
+                region = background.crop(box)
+                for l in layers[robot_index:]:
+                    if cached_layers.get(l):
+                        region = Image.alpha_composite(region, cached_layers[l].crop(box))
+                self._objects_layer.paste(region, box[:2])
+                if layer_size != map_image.size:
+                    box = tuple(int(v / scale) for v in box)
+                    region = region.resize(
+                        (box[2] - box[0], box[3] - box[1]), Image.Resampling.BOX, reducing_gap=1.5
+                    )
+                if cached_layers[MapRendererLayer.OBJECTS] is not self._objects_layer:
+                    cached_layers[MapRendererLayer.OBJECTS].paste(region, box[:2])
+            else:
+                objects = background
+                for l in layers[robot_index:]:
+                    if cached_layers.get(l):
+                        if l in changes:
+                            _LOGGER.debug("Render %s", l.name)
+                        objects = Image.alpha_composite(objects, cached_layers[l])
+
+                if objects is background:
+                    objects = background.copy()
+
+                cached_layers[MapRendererLayer.OBJECTS] = objects
+                if layer_size != map_image.size:
+                    cached_layers[MapRendererLayer.OBJECTS] = objects.resize(
+                        map_image.size, Image.Resampling.BOX, reducing_gap=1.5
+                    )
+
+                if self._cache:
+                    self._objects_layer = objects
+                    self._objects_layers = layers
+
+            if self._cache:
+                self._objects_robot_box = robot_box
         else:
             if not cached_layers.get(MapRendererLayer.OBJECTS):
                 return map_image
 
-        return Image.alpha_composite(
-            map_image,
-            cached_layers[MapRendererLayer.OBJECTS],
-        )
+        # Areas changed on the map image and on the objects layer since the last frame
+        boxes = None
+        if self._cache and self._objects_image is not None and (box or not changes):
+            boxes = [box] if box else []
+            if map_image is not self._objects_base:
+                if self._base_update and self._base_update[0] is self._objects_base:
+                    boxes.append(self._base_update[1])
+                else:
+                    boxes = None
+
+        if boxes is not None:
+            if not boxes:
+                return self._objects_image
+
+            box = (
+                min(b[0] for b in boxes),
+                min(b[1] for b in boxes),
+                max(b[2] for b in boxes),
+                max(b[3] for b in boxes),
+            )
+            image = self._objects_image.copy()
+            image.paste(
+                Image.alpha_composite(map_image.crop(box), cached_layers[MapRendererLayer.OBJECTS].crop(box)),
+                box[:2],
+            )
+        else:
+            image = Image.alpha_composite(
+                map_image,
+                cached_layers[MapRendererLayer.OBJECTS],
+            )
+
+        if self._cache:
+            self._objects_base = map_image
+            self._objects_image = image
+        self._stamp_layer(MapRendererLayer.OBJECTS, timer)
+        return image
 
     def render_areas(self, areas, color, fill, layer_size, dimensions, width, scale):
         new_layer = Image.new("RGBA", layer_size, (255, 255, 255, 0))
@@ -7661,47 +8530,35 @@ class DreameVacuumMapRenderer:
             )
         return new_layer
 
-    def render_path(self, path, color, mop_color, layer_size, mask, dimensions, width, scale):
+    def render_path(self, path, color, mop_color, layer_size, mask, dimensions, width, scale, map_id=None):
+        self._path_box = None
+        if not isinstance(path, PathList):
+            path = PathList(path)
+
+        if map_id is not None and self._cache and not self._low_memory and color[3] == 255:
+            return self._render_path_tail(path, color, mop_color, layer_size, mask, dimensions, width, scale, map_id)
+
         new_layer = Image.new("RGBA", layer_size, (255, 255, 255, 0))
         draw = ImageDraw.Draw(new_layer, "RGBA")
         sweep = []
         mop = []
-        sweep_path = []
-        mop_path = []
-        path_type = ""
-
-        for point in path:
-            p = point.to_img(dimensions)
-            if point.path_type == PathType.LINE:
-                l = [p.x * scale, p.y * scale]
-                if path_type == PathType.SWEEP_AND_MOP or (path_type == PathType.SWEEP or self._low_memory):
-                    sweep_path.extend(l)
-
-                if not self._low_memory and (path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP):
-                    mop_path.extend(l)
-            else:
-                if mop_path:
-                    mop.append(mop_path)
 
-                if sweep_path:
-                    sweep.append(sweep_path)
-
-                path_type = point.path_type
-                if path_type == PathType.SWEEP_AND_MOP or (path_type == PathType.SWEEP or self._low_memory):
-                    sweep_path = [p.x * scale, p.y * scale]
-                else:
-                    sweep_path = []
-
-                if not self._low_memory and (path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP):
-                    mop_path = [p.x * scale, p.y * scale]
-                else:
-                    mop_path = []
+        # Every point that is not a line starts a new line with its path type, lines before the first one has no type
+        x, y = path.to_img(dimensions, scale)
+        coords = np.column_stack((x, y)).ravel().tolist()
+        operators = np.frombuffer(bytes(path.operators), dtype=np.uint8)
+        starts = np.flatnonzero(operators != ord(PathType.LINE.value)).tolist()
+        lines = [(start, PathType(chr(operators[start]))) for start in starts]
+        if len(operators) and (not starts or starts[0] > 0):
+            lines.insert(0, (0, ""))
 
-        if sweep_path:
-            sweep.append(sweep_path)
+        for i, (start, path_type) in enumerate(lines):
+            end = lines[i + 1][0] if i + 1 < len(lines) else len(operators)
+            if path_type == PathType.SWEEP_AND_MOP or (path_type == PathType.SWEEP or self._low_memory):
+                sweep.append(coords[start * 2 : end * 2])
 
-        if mop_path:
-            mop.append(mop_path)
+            if not self._low_memory and (path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP):
+                mop.append(coords[start * 2 : end * 2])
 
         if mop and mask:
             mop_layer = Image.new("RGBA", layer_size, (255, 255, 255, 0))
@@ -7749,6 +8606,194 @@ class DreameVacuumMapRenderer:
 
         return new_layer
 
+    def _render_path_tail(self, path, color, mop_color, layer_size, mask, dimensions, width, scale, map_id):
+        key = (
+            map_id,
+            tuple(layer_size),
+            dimensions.top,
+            dimensions.left,
+            dimensions.height,
+            dimensions.width,
+            dimensions.grid_size,
+            dimensions.scale,
+            tuple(dimensions.padding),
+            tuple(dimensions.crop),
+            tuple(color),
+            tuple(mop_color),
+            width,
+            scale,
+        )
+
+        # Points are only appended to the path while the same map is being updated, anything else is drawn from scratch
+        length = self._path_length
+        full = bool(
+            self._path_key != key
+            or len(path) < length
+            or (
+                length
+                and (
+                    path[0] != self._path_first
+                    or path[length - 1] != self._path_last
+                    or path[length - 1].path_type != self._path_last.path_type
+                )
+            )
+        )
+        if full:
+            self._path_key = key
+            self._path_layer = Image.new("RGBA", layer_size, (255, 255, 255, 0))
+            self._path_mop_layer = None
+            self._path_type = ""
+            self._path_sweep = []
+            self._path_mop = []
+            length = 0
+
+        size = width * scale
+        cap_size = int(math.floor(size / 2))
+        draw = ImageDraw.Draw(self._path_layer, "RGBA")
+        sweep = []
+        mop = []
+        path_type = self._path_type
+        # Sweep path is opaque and continues from the last two points so the joint is drawn as if it was not split
+        sweep_path = list(self._path_sweep)
+        sweep_seed = max(len(sweep_path), 2)
+        mop_path = list(self._path_mop)
+        xs = sweep_path[0::2] + mop_path[0::2]
+        ys = sweep_path[1::2] + mop_path[1::2]
+
+        tail = path[length:]
+        x, y = tail.to_img(dimensions, scale)
+        x = x.tolist()
+        y = y.tolist()
+        xs.extend(x)
+        ys.extend(y)
+        line = ord(PathType.LINE.value)
+        for px, py, operator in zip(x, y, tail.operators):
+            if operator == line:
+                l = [px, py]
+                if path_type == PathType.SWEEP_AND_MOP or (path_type == PathType.SWEEP or self._low_memory):
+                    sweep_path.extend(l)
+
+                if not self._low_memory and (path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP):
+                    mop_path.extend(l)
+            else:
+                if len(mop_path) > 2:
+                    mop.append(mop_path)
+
+                if sweep_path:
+                    if len(sweep_path) > sweep_seed:
+                        sweep.append(sweep_path)
+                    draw.ellipse(
+                        [
+                            sweep_path[-2] - cap_size,
+                            sweep_path[-1] - cap_size,
+                            sweep_path[-2] + cap_size,
+                            sweep_path[-1] + cap_size,
+                        ],
+                        fill=color,
+                    )
+                sweep_seed = 2
+
+                path_type = PathType(chr(operator))
+                if path_type == PathType.SWEEP_AND_MOP or (path_type == PathType.SWEEP or self._low_memory):
+                    sweep_path = [px, py]
+                    draw.ellipse(
+                        [
+                            sweep_path[0] - cap_size,
+                            sweep_path[1] - cap_size,
+                            sweep_path[0] + cap_size,
+                            sweep_path[1] + cap_size,
+                        ],
+                        fill=color,
+                    )
+                else:
+                    sweep_path = []
+
+                if not self._low_memory and (path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP):
+                    mop_path = [px, py]
+                else:
+                    mop_path = []
+
+        if len(sweep_path) > sweep_seed:
+            sweep.append(sweep_path)
+
+        if len(mop_path) > 2:
+            mop.append(mop_path)
+
+        if mop:
+            if self._path_mop_layer is None:
+                self._path_mop_layer = Image.new("RGBA", layer_size, (255, 255, 255, 0))
+            mop_draw = ImageDraw.Draw(self._path_mop_layer, "RGBA")
+            for line in mop:
+                mop_draw.line(
+                    line,
+                    width=int(round(size * 10.5)),
+                    fill=mop_color,
+                    joint="curve",
+                )
+
+        for line in sweep:
+            draw.line(
+                line,
+                width=int(round(size)),
+                fill=color,
+                joint="curve",
+            )
+
+        self._path_length = len(path)
+        self._path_first = path[0] if path else None
+        self._path_last = path[-1] if path else None
+        self._path_type = path_type
+        self._path_sweep = sweep_path[-4:]
+        self._path_mop = mop_path[-2:]
+
+        # Only the area around the new points and the previous end of the path is composited again
+        box = None
+        if not full and mask is self._path_mask and self._path_image is not None and xs:
+            margin = int(math.ceil(size * (10.5 if self._path_mop_layer is not None else 1) / 2)) + 2
+            box = (
+                max(int(math.floor(min(xs))) - margin, 0),
+                max(int(math.floor(min(ys))) - margin, 0),
+                min(int(math.ceil(max(xs))) + margin, layer_size[0]),
+                min(int(math.ceil(max(ys))) + margin, layer_size[1]),
+            )
+            if box[0] >= box[2] or box[1] >= box[3]:
+                box = None
+
+        offset = box[:2] if box else (0, 0)
+
+        layer = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]) if box else layer_size, (255, 255, 255, 0))
+        if self._path_mop_layer is not None:
+            if mask:
+                layer.paste(
+                    self._path_mop_layer.crop(box) if box else self._path_mop_layer,
+                    (0, 0),
+                    mask=mask.crop(box) if box else mask,
+                )
+            else:
+                layer = self._path_mop_layer.crop(box) if box else self._path_mop_layer.copy()
+        sweep_layer = self._path_layer.crop(box) if box else self._path_layer
+        layer.paste(sweep_layer, (0, 0), sweep_layer)
+
+        # End of the last line is still open and can be continued with the next frame
+        if sweep_path:
+            ImageDraw.Draw(layer, "RGBA").ellipse(
+                [
+                    sweep_path[-2] - offset[0] - cap_size,
+                    sweep_path[-1] - offset[1] - cap_size,
+                    sweep_path[-2] - offset[0] + cap_size,
+                    sweep_path[-1] - offset[1] + cap_size,
+                ],
+                fill=color,
+            )
+
+        if box is None:
+            self._path_image = layer
+        else:
+            self._path_image.paste(layer, offset)
+        self._path_mask = mask
+        self._path_box = box
+        return self._path_image
+
     def render_charger(
         self,
         charger_position,
@@ -9508,10 +10553,17 @@ class DreameVacuumMapRenderer:
 
 
 class DreameVacuumMapOptimizer:
-    def __init__(self) -> None:
+    def __init__(self, engine: str = None) -> None:
         self._js_optimizer = None
+        # 0: JavaScript optimizer on MiniRacer, 1: Python implementation,
+        # 2: Python implementation with its scanning and filling stages on NumPy, it is not a replacement for the JavaScript optimizer.
+        # Outline tracing, area linking and charger position stages follow the outline pixel by pixel and they are not vectorized.
+        self.engine: int = MAP_OPTIMIZER_LIST.get(engine, 0)
 
     def _clean_wall(self, data, width, height):
+        if self.engine == 2:
+            return self._clean_wall_vectorized(data, width, height)
+
         for j in range(1, height - 1):
             for i in range(1, width - 1):
                 index = j * width + i
@@ -9542,6 +10594,9 @@ class DreameVacuumMapOptimizer:
                 data[i] = 0
 
     def _obstacle_data(self, data, width, height):
+        if self.engine == 2:
+            return self._obstacle_data_vectorized(data, width, height)
+
         for it in range(2):
             for j in range(height):
                 for i in range(width):
@@ -9587,6 +10642,8 @@ class DreameVacuumMapOptimizer:
 
     def _fill_map_data(self, data, width, height, fill):
         self._fill_map_data_2(data, width, height)
+        if self.engine == 2:
+            return self._fill_map_data_vectorized(data, width, height, fill)
 
         size = len(data)
         ssize = 3
@@ -9654,6 +10711,9 @@ class DreameVacuumMapOptimizer:
                             isEmpty = True
 
     def _denoise(self, data, width, height):
+        if self.engine == 2:
+            return self._denoise_vectorized(data, width, height)
+
         tmpMapInfo = data.copy()
         ssize = 20
         for i in range(width):
@@ -9760,6 +10820,9 @@ class DreameVacuumMapOptimizer:
                 startX = -1
 
     def _update_border_value(self, data, width, height, stroke):
+        if self.engine == 2:
+            return self._update_border_value_vectorized(data, width, height, stroke)
+
         for j in range(height):
             for i in range(width):
                 index = j * width + i
@@ -9780,6 +10843,9 @@ class DreameVacuumMapOptimizer:
                             data[index] = stroke
 
     def _fill_cross_line(self, data, width, height, stroke):
+        if self.engine == 2:
+            return self._fill_cross_line_vectorized(data, width, height, stroke)
+
         size = len(data)
         for i in range(width):
             startY = -1
@@ -10080,6 +11146,9 @@ class DreameVacuumMapOptimizer:
         return paths
 
     def _fill_map_data_2(self, data, width, height):
+        if self.engine == 2:
+            return self._fill_map_data_2_vectorized(data, width, height)
+
         while True:
             first_point = self._find_first_empty_point(data, width, height)
             if first_point is None:
@@ -10096,6 +11165,268 @@ class DreameVacuumMapOptimizer:
             elif data[i] == 255:
                 data[i] = 0
 
+    def _update_border_value_vectorized(self, data, width, height, stroke):
+        values = np.array(data, dtype=np.int32).reshape(height, width)
+        filled = values != 0
+        # Pixels are on the border when any of the surrounding pixels is empty, stroke value never clears a pixel
+        empty = np.pad(~filled, 1, constant_values=True)
+        border = np.zeros((height, width), dtype=bool)
+        for j in range(3):
+            for i in range(3):
+                border |= empty[j : j + height, i : i + width]
+        border[0, :] = True
+        border[-1, :] = True
+        border[:, 0] = True
+        border[:, -1] = True
+        values[filled & border] = stroke
+        data[:] = values.ravel().tolist()
+
+    def _fill_map_data_2_vectorized(self, data, width, height):
+        values = np.array(data, dtype=np.int32)
+        empty = values == 0
+        size = len(values)
+
+        # Empty pixels connected to an empty pixel on the edge of the map are outside.
+        # Neighbors are calculated on the flat buffer and wrap around the same way as the point search does.
+        outside = empty.reshape(height, width).copy()
+        outside[1:-1, 1:-1] = False
+        outside = outside.ravel()
+
+        run_starts = empty & ~np.concatenate(([False], empty[:-1]))
+        run_ids = np.cumsum(run_starts) - 1
+        empty_run_ids = run_ids[empty]
+        run_count = int(np.count_nonzero(run_starts))
+        column_empty = empty.reshape(height, width).T.ravel()
+        column_run_starts = column_empty & ~np.concatenate(([False], column_empty[:-1]))
+        column_run_starts[::height] = column_empty[::height]
+        column_run_ids = np.cumsum(column_run_starts) - 1
+        column_empty_run_ids = column_run_ids[column_empty]
+        column_run_count = int(np.count_nonzero(column_run_starts))
+        while True:
+            # Horizontally and then vertically connected empty pixels are filled at once
+            outside_runs = np.zeros(run_count, dtype=bool)
+            outside_runs[run_ids[outside & empty]] = True
+            outside[empty] = outside_runs[empty_run_ids]
+
+            column_outside = outside.reshape(height, width).T.ravel()
+            outside_runs = np.zeros(column_run_count, dtype=bool)
+            outside_runs[column_run_ids[column_outside & column_empty]] = True
+            column_outside[column_empty] = outside_runs[column_empty_run_ids]
+            outside = column_outside.reshape(width, height).T.ravel()
+
+            expanded = outside | (
+                empty
+                & (
+                    np.roll(outside, width)
+                    | np.roll(outside, -width)
+                    | np.roll(outside, 1)
+                    | np.roll(outside, -1)
+                )
+            )
+            if np.array_equal(expanded, outside):
+                break
+            outside = expanded
+
+        values[empty & ~outside] = 3
+        values[values == 255] = 0
+        if size:
+            data[:] = values.tolist()
+
+    @staticmethod
+    def _runs(mask, closed=True):
+        # Runs of set values on each row, when closed runs reaching the end of the row are skipped
+        rows, length = mask.shape
+        padded = np.zeros((rows, length + 2), dtype=np.int8)
+        padded[:, 1:-1] = mask
+        padded[:, -1] = int(closed)
+        delta = np.diff(padded, axis=1)
+        start_rows, starts = np.nonzero(delta == 1)
+        end_rows, ends = np.nonzero(delta == -1)
+        index = np.searchsorted(start_rows * (length + 1) + starts, end_rows * (length + 1) + ends) - 1
+        return end_rows, starts[index], ends
+
+    @staticmethod
+    def _runs_mask(shape, rows, starts, ends):
+        covered = np.zeros((shape[0], shape[1] + 1), dtype=np.int32)
+        np.add.at(covered, (rows, starts), 1)
+        np.add.at(covered, (rows, ends), -1)
+        return np.cumsum(covered, axis=1)[:, :-1] > 0
+
+    def _fill_runs(self, values, rows, starts, ends, value):
+        values[self._runs_mask(values.shape, rows, starts, ends)] = value
+
+    def _fill_map_data_vectorized(self, data, width, height, fill):
+        # Neighbor count of the per pixel implementation is only reached on the first row and column,
+        # gaps up to three pixels are filled there and other pixels are never changed.
+        values = np.array(data, dtype=np.int32).reshape(height, width)
+        for lines in (values.T[:1], values[:1]):
+            rows, starts, ends = self._runs(lines == 0)
+            selected = (starts > 0) & ((ends - starts) <= 3)
+            self._fill_runs(lines, rows[selected], starts[selected], ends[selected], fill)
+        data[:] = values.ravel().tolist()
+
+    def _fill_cross_line_vectorized(self, data, width, height, stroke):
+        values = np.array(data, dtype=np.int32).reshape(height, width)
+        strokes = values == stroke
+
+        # Only empty pixels are changed, stroke pixels and the lines found on them are same for every column and row.
+        # Row below is skipped past the map width as implemented on the per pixel loop.
+        for lines, line_strokes, limit in ((values.T, strokes.T, width), (values, strokes, min(width, height))):
+            count = lines.shape[0]
+            stroke_sums = np.zeros((count + 2, lines.shape[1] + 1), dtype=np.int32)
+            np.cumsum(line_strokes, axis=1, out=stroke_sums[1:-1, 1:])
+            rows, starts, ends = self._runs(line_strokes, False)
+            selected = (ends - starts) >= 2
+            rows, starts, ends = rows[selected], starts[selected], ends[selected]
+            before = rows
+            after = np.where(rows + 1 < limit, rows + 2, 0)
+            crosses = (
+                stroke_sums[before, ends]
+                - stroke_sums[before, starts]
+                + stroke_sums[after, ends]
+                - stroke_sums[after, starts]
+            )
+            selected = crosses > 2
+            rows, starts, ends = rows[selected], starts[selected], ends[selected]
+            side = rows + 1 < limit
+            filled = np.zeros(lines.shape, dtype=bool)
+            filled[:-1] |= self._runs_mask(lines.shape, rows[rows > 0], starts[rows > 0], ends[rows > 0])[1:]
+            filled[1:] |= self._runs_mask(lines.shape, rows[side], starts[side], ends[side])[:-1]
+            lines[filled & (lines == 0)] = 1
+
+        values[strokes] = 1
+        data[:] = values.ravel().tolist()
+        self._update_border_value(data, width, height, stroke)
+
+    def _denoise_vectorized(self, data, width, height):
+        values = np.array(data, dtype=np.int32).reshape(height, width)
+        walls = values == 1
+
+        # Each column and then each row only reads and clears its own pixels, so all of them are processed at once.
+        # Short runs are cleared when they are on the border or there is no wall next to them on one side.
+        for lines, side_walls in ((values.T, walls.T), (values, walls)):
+            count = lines.shape[0]
+            wall_sums = np.zeros((count, lines.shape[1] + 1), dtype=np.int32)
+            np.cumsum(side_walls, axis=1, out=wall_sums[:, 1:])
+            rows, starts, ends = self._runs(lines != 0)
+            length = ends - starts
+            selected = length <= 20
+            rows, starts, ends, length = rows[selected], starts[selected], ends[selected], length[selected]
+            before = np.maximum(rows - 1, 0)
+            after = np.minimum(rows + 1, count - 1)
+            border = (
+                (rows == 0)
+                | (rows == count - 1)
+                | (length <= 2)
+                | (wall_sums[before, ends] == wall_sums[before, starts])
+                | (wall_sums[after, ends] == wall_sums[after, starts])
+            )
+            self._fill_runs(lines, rows[border], starts[border], ends[border], 0)
+
+        for lines in (values.T, values):
+            rows, starts, ends = self._runs(lines != 0)
+            selected = (ends - starts) <= 2
+            self._fill_runs(lines, rows[selected], starts[selected], ends[selected], 0)
+
+        data[:] = values.ravel().tolist()
+
+    def _find_obstacle_border_vectorized(self, data, width, height, stroke):
+        values = np.array(data, dtype=np.int32).reshape(height, width)
+        obstacle = values == stroke
+        # Changing an obstacle pixel to 2 does not change the result for its neighbors
+        other = np.pad(~(obstacle | (values == 2)), 1, constant_values=False)
+        border = np.zeros((height, width), dtype=bool)
+        for j in range(3):
+            for i in range(3):
+                border |= other[j : j + height, i : i + width]
+        border[0, :] = True
+        border[-1, :] = True
+        border[:, 0] = True
+        border[:, -1] = True
+        values[obstacle & border] = 2
+        data[:] = values.ravel().tolist()
+
+    def _clean_small_obstacle_vectorized(self, data, width, height, stroke):
+        values = np.array(data, dtype=np.int32).reshape(height, width)
+        for lines in (values.T, values):
+            rows, starts, ends = self._runs(lines == stroke)
+            selected = (ends - starts) <= 3
+            self._fill_runs(lines, rows[selected], starts[selected], ends[selected], 1)
+        data[:] = values.ravel().tolist()
+
+    @staticmethod
+    def _chain(start, carry):
+        # Pixels set on a start pixel or carried from the previous pixel on the same row: result[i] = start[i] | (carry[i] & result[i - 1])
+        index = np.arange(start.shape[-1])
+        last_start = np.maximum.accumulate(np.where(start, index, -1), axis=-1)
+        last_break = np.maximum.accumulate(np.where(start | carry, -1, index), axis=-1)
+        return last_start > last_break
+
+    def _clean_wall_vectorized(self, data, width, height):
+        values = np.array(data, dtype=np.int32).reshape(height, width)
+
+        # Rows are processed in order because the row above is read after it is changed,
+        # left pixel is read after it is changed too and that is carried along the row.
+        walls = values == 1
+        inner = walls[1:-1, 1:-1]
+        count = (~walls[1:-1, 2:]).astype(np.int8) + ~walls[2:, 1:-1]
+        left = ~walls[1:-1, :-2]
+        for j in range(1, height - 1):
+            row_count = count[j - 1] + ~walls[j - 1, 1:-1]
+            row = inner[j - 1]
+            cleared = self._chain(
+                row & ((row_count == 3) | ((row_count == 2) & left[j - 1])), row & (row_count == 2)
+            )
+            row &= ~cleared
+            values[j, 1:-1][cleared] = 0
+
+        # A pixel changed to wall on the row above or on the left only changes its own neighbors on the next row or on the right,
+        # wall on the right or below is required to change a pixel so it cannot be changed by a chain.
+        inner = values[1:-1, 1:-1] == 2
+        below = inner & walls[2:, 1:-1]
+        right = inner & walls[1:-1, 2:]
+        left = walls[1:-1, :-2]
+        for j in np.flatnonzero(below.any(axis=1) | right.any(axis=1)) + 1:
+            vertical = below[j - 1] & walls[j - 1, 1:-1]
+            changed = vertical.copy()
+            changed[1:] |= vertical[:-1] & right[j - 1, 1:]
+            changed |= right[j - 1] & left[j - 1]
+            walls[j, 1:-1] |= changed
+            values[j, 1:-1][changed] = 1
+
+        values[values == 2] = 0
+        data[:] = values.ravel().tolist()
+
+    def _obstacle_data_vectorized(self, data, width, height):
+        values = np.array(data, dtype=np.int32).reshape(height, width)
+        for it in range(2):
+            # Pixels on the right and on the row above are not changed yet when a pixel is processed
+            padded = np.pad(values, 1)
+            obstacle = values == 2
+            left = padded[1:-1, :-2]
+            right = padded[1:-1, 2:]
+            top = padded[2:, 1:-1]
+            inside = obstacle & (right == 2)
+            last = obstacle & (right != 2)
+            empty_top = obstacle & (top == 0)
+            obstacle_top = obstacle & (top == 2)
+            start = inside & (left == 0)
+            last_empty = last & (right == 0) & (left == 2)
+
+            # Rows are processed in order because the row below is read after it is changed.
+            # Inside a run of obstacle pixels the left pixel is an obstacle pixel that is cleared or not,
+            # every pixel before the last one is cleared once a pixel before it on the run is cleared and
+            # the last one is cleared when the pixel before it is not cleared and there is an empty pixel on its right.
+            bottom = np.zeros(width, dtype=np.int32)
+            for j in np.flatnonzero(obstacle.any(axis=1)):
+                if j > 0:
+                    bottom = values[j - 1]
+                vertical = (empty_top[j] & (bottom == 2)) | (obstacle_top[j] & (bottom == 0))
+                cleared = self._chain(vertical | start[j], inside[j])
+                cleared[1:] = np.where(last[j, 1:], vertical[1:] | (last_empty[j, 1:] & ~cleared[:-1]), cleared[1:])
+                values[j][cleared] = 0
+        data[:] = values.ravel().tolist()
+
     def _link_adjacent_areas(self, original_data, data, width, height, stroke):
         horizontalLines = []
         verticalLines = []
@@ -10564,6 +11895,9 @@ class DreameVacuumMapOptimizer:
         return True
 
     def _find_obstacle_border(self, data, width, height, stroke):
+        if self.engine == 2:
+            return self._find_obstacle_border_vectorized(data, width, height, stroke)
+
         size = len(data)
         for j in range(height):
             for i in range(width):
@@ -10586,6 +11920,9 @@ class DreameVacuumMapOptimizer:
                         data[index] = 2
 
     def _clean_small_obstacle(self, data, width, height, stroke):
+        if self.engine == 2:
+            return self._clean_small_obstacle_vectorized(data, width, height, stroke)
+
         for i in range(width):
             startY = -1
             for j in range(height):
@@ -10841,7 +12178,45 @@ class DreameVacuumMapOptimizer:
             map_data.optimized_pixel_type = pixel_type
             map_data.optimized_dimensions = MapImageDimensions(top, left, height, width, map_data.dimensions.grid_size)
 
-    def optimize(self, map_data, saved_map_data=None, js_optimizer=True):
+    @staticmethod
+    def _window_sum(values, delta):
+        # Sum of every (2 * delta + 1) square window clipped to the map, calculated from a summed area table
+        size = 2 * delta + 1
+        table = np.pad(values, ((delta + 1, delta), (delta + 1, delta))).cumsum(axis=0).cumsum(axis=1)
+        return table[size:, size:] - table[:-size, size:] - table[size:, :-size] + table[:-size, :-size]
+
+    @staticmethod
+    def _window_max(values, delta):
+        size = 2 * delta + 1
+        padded = np.pad(values, delta, constant_values=-1)
+        padded = np.lib.stride_tricks.sliding_window_view(padded, size, axis=0).max(axis=-1)
+        return np.lib.stride_tricks.sliding_window_view(padded, size, axis=1).max(axis=-1)
+
+    def _smooth_wifi_map(self, map_data):
+        # Replace every signal pixel with the most common signal level around it, searching in growing windows until one is found.
+        # Counts are compared as implemented on the original per pixel loop, on a tie the level whose last pixel comes first in the row order wins.
+        pixel_type = map_data.pixel_type[: map_data.dimensions.width, : map_data.dimensions.height].astype(np.int64)
+        width, height = pixel_type.shape
+        levels = range(MapPixelType.WIFI_POOR.value, MapPixelType.WIFI_EXCELLENT.value + 1)
+        order = np.arange(height)[np.newaxis, :] * width + np.arange(width)[:, np.newaxis]
+        pending = pixel_type > 2
+
+        for delta in range(3, 6):
+            if not pending.any():
+                break
+
+            counts = np.stack([self._window_sum((pixel_type == level).astype(np.int64), delta) for level in levels])
+            last = np.stack([self._window_max(np.where(pixel_type == level, order, -1), delta) for level in levels])
+            max_count = counts.max(axis=0)
+            found = pending & (max_count > 0)
+            if found.any():
+                winner = np.argmin(np.where(counts == max_count, last, width * height), axis=0)
+                map_data.optimized_pixel_type[: map_data.dimensions.width, : map_data.dimensions.height][found] = (
+                    winner[found] + MapPixelType.WIFI_POOR.value
+                )
+                pending &= ~found
+
+    def optimize(self, map_data, saved_map_data=None):
         if map_data.saved_map:
             return map_data
 
@@ -10849,39 +12224,13 @@ class DreameVacuumMapOptimizer:
             map_data.optimized_pixel_type = np.copy(map_data.pixel_type)
             map_data.optimized_dimensions = map_data.dimensions
             if not map_data.empty_map:
-                for y in range(map_data.dimensions.height):
-                    for x in range(map_data.dimensions.width):
-                        if int(map_data.pixel_type[x, y]) > 2:
-                            max_count = 0
-                            max_px = -1
-                            value_count = [0, 0, 0, 0]
-                            for delta in range(3, 6):
-                                for n in range(y - delta, y + delta + 1):
-                                    for m in range(x - delta, x + delta + 1):
-                                        if (
-                                            n < 0
-                                            or n >= map_data.dimensions.height
-                                            or m < 0
-                                            or m >= map_data.dimensions.width
-                                        ):
-                                            continue
-
-                                        px = int(map_data.pixel_type[m, n]) - 11
-                                        if px >= 0:
-                                            value_count[px] = value_count[px] + 1
-                                            if value_count[px] > max_count:
-                                                max_count = value_count[px]
-                                                max_px = px
-
-                                if max_px >= 0:
-                                    map_data.optimized_pixel_type[x, y] = MapPixelType(max_px + 11)
-                                    break
+                self._smooth_wifi_map(map_data)
             return map_data
 
         try:
             now = time.time()
 
-            if js_optimizer:
+            if self.engine == 0:
                 if self._js_optimizer == None:
                     self._js_optimizer = MiniRacer()
                     self._js_optimizer.eval(base64.b64decode(MAP_OPTIMIZER_JS))
@@ -10950,17 +12299,24 @@ class DreameVacuumMapOptimizer:
             else:
                 width = map_data.dimensions.width
                 height = map_data.dimensions.height
-                clean_data = np.zeros((width * height), np.uint8).tolist()
-
                 data_map = {255: 2, 253: 1, 250: 3}
-                pointNum = 0
-                for j in range(height):
-                    for i in range(width):
-                        index = j * width + i
-                        clean_data[index] = int(map_data.pixel_type[i, j])
-                        if clean_data[index]:
-                            pointNum = pointNum + 1
-                            clean_data[index] = data_map.get(clean_data[index], 0)
+                if self.engine == 2:
+                    values = map_data.pixel_type[:width, :height].T
+                    pointNum = int(np.count_nonzero(values))
+                    value_map = np.zeros(256, dtype=np.uint8)
+                    for k, v in data_map.items():
+                        value_map[k] = v
+                    clean_data = value_map[values].ravel().tolist()
+                else:
+                    clean_data = np.zeros((width * height), np.uint8).tolist()
+                    pointNum = 0
+                    for j in range(height):
+                        for i in range(width):
+                            index = j * width + i
+                            clean_data[index] = int(map_data.pixel_type[i, j])
+                            if clean_data[index]:
+                                pointNum = pointNum + 1
+                                clean_data[index] = data_map.get(clean_data[index], 0)
 
                 original_data = clean_data.copy()
                 pixel_type = np.zeros((width, height), np.uint8)
@@ -11021,12 +12377,20 @@ class DreameVacuumMapOptimizer:
 
                     currentPointNum = 0
                     data_map = {7: 255, 2: 255, 3: (0 if saved_map_data else 250)}
-                    for j in range(height):
-                        for i in range(width):
-                            clean_value = clean_data[j * width + i]
-                            if clean_value != 0:
-                                currentPointNum = currentPointNum + 1
-                                pixel_type[i, j] = data_map.get(clean_value, 253)
+                    if self.engine == 2:
+                        values = np.array(clean_data).reshape(height, width).T
+                        filled = values != 0
+                        currentPointNum = int(np.count_nonzero(filled))
+                        pixel_type[filled] = MapPixelType.NEW_SEGMENT.value
+                        for k, v in data_map.items():
+                            pixel_type[values == k] = v
+                    else:
+                        for j in range(height):
+                            for i in range(width):
+                                clean_value = clean_data[j * width + i]
+                                if clean_value != 0:
+                                    currentPointNum = currentPointNum + 1
+                                    pixel_type[i, j] = data_map.get(clean_value, 253)
 
                     if not ((currentPointNum * 100) / pointNum) < 50 and pointNum > 2000:
                         map_data.optimized_pixel_type = pixel_type
@@ -1,4 +1,5 @@
 import logging
+import asyncio
 import random
 import hashlib
 import json
@@ -9,6 +10,8 @@ import requests
 import zlib
 import ssl
 import queue
+import aiohttp
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeoutError
 from threading import Thread, Timer
 from time import sleep
 import time, locale
@@ -31,9 +34,22 @@ DREAME_STRINGS: Final = (
     "H4sICAAAAAAEAGNsb3VkX3N0cmluZ3MuanNvbgCFU9tuGjEQ/RUUKaiVysIuiKWKeKAgBK2qbbikIVWFBtvLuvFla5sQ+vUd26Q0fek+2HPmPsc7364Srl1CDQPJEsdIdfXuKu1m/RzvxegkNuPrUi4/1fn16ieqJsFxu5RgXKUla2dJmrxvvOFfKq3YTYMXy0Y6SHpJetNYEhCs3U06nbc+KRl0dt18kO+yrN/P8/6OUNIbpGU3p4MSetkO0g50O1AOUujTspVi0AewnDQeZh/F5msq7rPpkcw2z8Xj9PZeLrLbWT1ap9OHO1UVxWQ/xIBO+FCwDtzBoiDBOmbWnKK844pOtASuENRG18y4E4pIwZx6lQBXaiOH82LZtATtQxCiuTeg3NadEKKTYaVhtto6/chU8xXy5hqsPWpDmwfLjAIZYpov2gBCJiBEH5RD3I7st+DgqrYOZ8iGJnRi1sbkl9J/MHuuOSq2PBr3XHvBMeX7DROfU/teWjhlnNUjT0VEkamLhYIDH8meOGEoCG7dXebtqtTRUKzG8wi0I14KcxuQ9uwf8N5HS02ZCN0RHN9eWsJqLaKlfyqm6FhLCS8dlVz4UH95As9v5WM9c3hVWEIb/3J75iah0Uns2v6DJ7HYCElFtPY0jPZMuYtpIQgC76AN/wUucrgKHLbCXzHWyjEEq1gc6lpwEhzbP2zwrrd4bM/t6KMSGujaiKgorE3pK23cOamfoOU3Lok0fEb812KlSZb0/r9Y338DqLVvecIDAAA="
 )
 
+# Connect and read timeouts, same with the blocking session requests
+CLOUD_REQUEST_TIMEOUT: Final = aiohttp.ClientTimeout(total=None, sock_connect=6, sock_read=6)
+MI_CLOUD_REQUEST_TIMEOUT: Final = aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=5)
+# Time to wait for a single try of a request sent on the event loop, longer than the connect and read timeouts together
+CLOUD_REQUEST_WAIT_TIMEOUT: Final = 15
+
 _LOGGER = logging.getLogger(__name__)
 
 
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
 class DreameVacuumDeviceProtocol(MiIOProtocol):
     def __init__(self, ip: str, token: str) -> None:
         super().__init__(ip, token, 0, 0, True, 2)
@@ -98,6 +114,8 @@ class DreameVacuumDreameHomeCloudProtocol:
         self._country = country
         self._did = did
         self._session = requests.session()
+        self._client_session: aiohttp.ClientSession = None
+        self._loop: asyncio.AbstractEventLoop = None
         self._queue = queue.Queue()
         self._thread = None
         self._client_queue = queue.Queue()
@@ -126,6 +144,45 @@ class DreameVacuumDreameHomeCloudProtocol:
         self._strings = None
         self.verification_url = None
 
+    def set_client_session(self, session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop) -> None:
+        """Send requests with the given aiohttp session on the event loop instead of the blocking session."""
+        self._client_session = session
+        self._loop = loop
+
+    def _use_client_session(self) -> bool:
+        # Waiting for a request on the event loop thread blocks the loop forever, blocking session is used instead
+        return (
+            self._client_session is not None
+            and not self._client_session.closed
+            and self._loop.is_running()
+            and _running_loop() is not self._loop
+        )
+
+    def _run_coroutine(self, coro, retry_count: int) -> Any:
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        except RuntimeError as ex:
+            # Event loop is closed
+            coro.close()
+            _LOGGER.warning("Unable to send request: %s", ex)
+            return None
+        try:
+            return future.result(timeout=((retry_count if retry_count and retry_count > 0 else 0) + 1) * CLOUD_REQUEST_WAIT_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            _LOGGER.warning("Request timed out")
+            return None
+        except CancelledError:
+            return None
+
+    async def _async_api_call_callback(self, callback, url, params, retry_count):
+        response = await self.async_api_call(url, params, retry_count)
+        try:
+            # Callbacks are blocking and not executed on the event loop
+            await self._loop.run_in_executor(None, callback, response)
+        except Exception as ex:
+            _LOGGER.warning("Api call callback failed: %s", ex)
+
     def _api_task(self):
         while True:
             item = self._queue.get()
@@ -141,6 +198,12 @@ class DreameVacuumDreameHomeCloudProtocol:
             self._queue.task_done()
 
     def _api_call_async(self, callback, url, params=None, retry_count=2):
+        if self._use_client_session():
+            asyncio.run_coroutine_threadsafe(
+                self._async_api_call_callback(callback, url, params, retry_count), self._loop
+            )
+            return
+
         if self._thread is None:
             self._thread = Thread(target=self._api_task, daemon=True)
             self._thread.start()
@@ -154,6 +217,13 @@ class DreameVacuumDreameHomeCloudProtocol:
             retry_count,
         )
 
+    async def async_api_call(self, url, params=None, retry_count=2):
+        return await self.async_request(
+            f"{self.get_api_url()}/{url}",
+            json.dumps(params, separators=(",", ":")) if params is not None else None,
+            retry_count,
+        )
+
     def get_api_url(self) -> str:
         return f"https://{self._country}{self._strings[0]}:{self._strings[1]}"
 
@@ -530,12 +600,12 @@ class DreameVacuumDreameHomeCloudProtocol:
             retry_count,
         )
 
-    def send(self, method, parameters, retry_count: int = 2) -> Any:
+    def _get_send_request(self, method, parameters) -> Tuple[str, Dict[str, Any]]:
         host = ""
         if self._host and len(self._host):
             host = f"-{self._host.split('.')[0]}"
 
-        api_response = self._api_call(
+        request = (
             f"{self._strings[37]}{host}/{self._strings[27]}/{self._strings[38]}",
             {
                 "did": str(self._did),
@@ -547,9 +617,20 @@ class DreameVacuumDreameHomeCloudProtocol:
                     "params": parameters,
                 },
             },
-            retry_count,
         )
         self._id = self._id + 1
+        return request
+
+    def send(self, method, parameters, retry_count: int = 2) -> Any:
+        url, params = self._get_send_request(method, parameters)
+        return self._get_send_result(self._api_call(url, params, retry_count))
+
+    async def async_send(self, method, parameters, retry_count: int = 2) -> Any:
+        url, params = self._get_send_request(method, parameters)
+        return self._get_send_result(await self.async_api_call(url, params, retry_count))
+
+    @staticmethod
+    def _get_send_result(api_response) -> Any:
         if (
             api_response is None
             or "data" not in api_response
@@ -562,6 +643,9 @@ class DreameVacuumDreameHomeCloudProtocol:
         return api_response["data"]["result"]
 
     def get_file(self, url: str, retry_count: int = 4) -> Any:
+        if self._use_client_session():
+            return self._run_coroutine(self.async_get_file(url, retry_count), retry_count)
+
         retries = 0
         if not retry_count or retry_count < 0:
             retry_count = 0
@@ -576,6 +660,55 @@ class DreameVacuumDreameHomeCloudProtocol:
             retries = retries + 1
         return None
 
+    async def async_get_file(self, url: str, retry_count: int = 4) -> Any:
+        retries = 0
+        if not retry_count or retry_count < 0:
+            retry_count = 0
+        while retries < retry_count + 1:
+            try:
+                async with self._client_session.get(url, timeout=CLOUD_REQUEST_TIMEOUT) as response:
+                    if response.status == 200:
+                        return await response.read()
+            except Exception as ex:
+                _LOGGER.warning("Unable to get file at %s: %s", url, ex)
+            retries = retries + 1
+        return None
+
+    def _iter_file(self, url: str, response, chunk_size: int, retry_count: int):
+        size = 0
+        try:
+            for chunk in response.iter_content(chunk_size):
+                size = size + len(chunk)
+                yield chunk
+        except requests.exceptions.RequestException as ex:
+            # Connection is dropped or timed out after the headers are received, download the file again and continue from where it is left
+            _LOGGER.warning("Unable to stream file at %s: %s", url, ex)
+            response.close()
+            content = self.get_file(url, retry_count)
+            if content is None:
+                raise
+            if len(content) > size:
+                yield content[size:]
+        finally:
+            response.close()
+
+    def get_file_stream(self, url: str, chunk_size: int = 65536, retry_count: int = 4) -> Any:
+        retries = 0
+        if not retry_count or retry_count < 0:
+            retry_count = 0
+        while retries < retry_count + 1:
+            try:
+                response = self._session.get(url, timeout=6, stream=True)
+            except Exception as ex:
+                response = None
+                _LOGGER.warning("Unable to get file at %s: %s", url, ex)
+            if response is not None:
+                if response.status_code == 200:
+                    return self._iter_file(url, response, chunk_size, retry_count - retries)
+                response.close()
+            retries = retries + 1
+        return None
+
     def get_file_url(self, object_name: str = "") -> Any:
         api_response = self._api_call(
             f"{self._strings[23]}/{self._strings[39]}/{self._strings[56]}",
@@ -663,7 +796,26 @@ class DreameVacuumDreameHomeCloudProtocol:
             return None
         return api_response["result"]
 
+    def _get_request_headers(self) -> Dict[str, str]:
+        headers = {
+            "Accept": "*/*",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept-Language": "en-US;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+            self._strings[47]: self._strings[3],
+            self._strings[49]: self._strings[5],
+            self._strings[50]: self._ti if self._ti else self._strings[6],
+            self._strings[51]: self._strings[52],
+            self._strings[46]: self._key,
+        }
+        if self._country == "cn":
+            headers[self._strings[48]] = self._strings[4]
+        return headers
+
     def request(self, url: str, data, retry_count=2) -> Any:
+        if self._use_client_session():
+            return self._run_coroutine(self.async_request(url, data, retry_count), retry_count)
+
         retries = 0
         if not retry_count or retry_count < 0:
             retry_count = 0
@@ -674,21 +826,7 @@ class DreameVacuumDreameHomeCloudProtocol:
                         response = None
                         break
 
-                headers = {
-                    "Accept": "*/*",
-                    "Content-Type": "application/x-www-form-urlencoded",
-                    "Accept-Language": "en-US;q=0.8",
-                    "Accept-Encoding": "gzip, deflate",
-                    self._strings[47]: self._strings[3],
-                    self._strings[49]: self._strings[5],
-                    self._strings[50]: self._ti if self._ti else self._strings[6],
-                    self._strings[51]: self._strings[52],
-                    self._strings[46]: self._key,
-                }
-                if self._country == "cn":
-                    headers[self._strings[48]] = self._strings[4]
-
-                response = self._session.post(url, headers=headers, data=data, timeout=6)
+                response = self._session.post(url, headers=self._get_request_headers(), data=data, timeout=6)
                 break
             except requests.exceptions.Timeout:
                 retries = retries + 1
@@ -721,6 +859,52 @@ class DreameVacuumDreameHomeCloudProtocol:
             self._fail_count = self._fail_count + 1
         return None
 
+    async def async_request(self, url: str, data, retry_count=2) -> Any:
+        retries = 0
+        if not retry_count or retry_count < 0:
+            retry_count = 0
+        response = None
+        while retries < retry_count + 1:
+            try:
+                if self._key_expire and time.time() > self._key_expire:
+                    if not await self._loop.run_in_executor(None, self.login):
+                        break
+
+                async with self._client_session.post(
+                    url, headers=self._get_request_headers(), data=data, timeout=CLOUD_REQUEST_TIMEOUT
+                ) as api_response:
+                    response = (api_response.status, await api_response.text())
+                break
+            except asyncio.TimeoutError:
+                retries = retries + 1
+                if self._connected:
+                    _LOGGER.warning(
+                        "Error while executing request: Read timed out. (read timeout=6): %s",
+                        data,
+                    )
+            except Exception as ex:
+                retries = retries + 1
+                if self._connected:
+                    _LOGGER.warning("Error while executing request: %s", str(ex))
+
+        if response is not None:
+            status, text = response
+            if status == 200:
+                self._fail_count = 0
+                self._connected = True
+                return json.loads(text)
+            elif status == 401 and self._secondary_key:
+                _LOGGER.warning("Execute api call failed: Token Expired")
+                await self._loop.run_in_executor(None, self.login)
+            else:
+                _LOGGER.warning("Execute api call failed with response: %s", text)
+
+        if self._fail_count == 5:
+            self._connected = False
+        else:
+            self._fail_count = self._fail_count + 1
+        return None
+
     def disconnect(self):
         self._session.close()
         self._connected = False
@@ -755,6 +939,8 @@ class DreameVacuumMiHomeCloudProtocol:
         self._country = country
         self._auth_key = auth_key
         self._session = requests.session()
+        self._client_session: aiohttp.ClientSession = None
+        self._loop: asyncio.AbstractEventLoop = None
         self._queue = queue.Queue()
         self._thread = None
         self._sign = None
@@ -789,6 +975,45 @@ class DreameVacuumMiHomeCloudProtocol:
         except:
             self._timezone = "GMT+00:00"
 
+    def set_client_session(self, session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop) -> None:
+        """Send requests with the given aiohttp session on the event loop instead of the blocking session."""
+        self._client_session = session
+        self._loop = loop
+
+    def _use_client_session(self) -> bool:
+        # Waiting for a request on the event loop thread blocks the loop forever, blocking session is used instead
+        return (
+            self._client_session is not None
+            and not self._client_session.closed
+            and self._loop.is_running()
+            and _running_loop() is not self._loop
+        )
+
+    def _run_coroutine(self, coro, retry_count: int) -> Any:
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        except RuntimeError as ex:
+            # Event loop is closed
+            coro.close()
+            _LOGGER.warning("Unable to send request: %s", ex)
+            return None
+        try:
+            return future.result(timeout=((retry_count if retry_count and retry_count > 0 else 0) + 1) * CLOUD_REQUEST_WAIT_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            _LOGGER.warning("Request timed out")
+            return None
+        except CancelledError:
+            return None
+
+    async def _async_api_call_callback(self, callback, url, params, retry_count):
+        response = await self.async_api_call(url, params, retry_count)
+        try:
+            # Callbacks are blocking and not executed on the event loop
+            await self._loop.run_in_executor(None, callback, response)
+        except Exception as ex:
+            _LOGGER.warning("Api call callback failed: %s", ex)
+
     def _api_task(self):
         while True:
             item = self._queue.get()
@@ -807,6 +1032,12 @@ class DreameVacuumMiHomeCloudProtocol:
             self._queue.task_done()
 
     def _api_call_async(self, callback, url, params=None, retry_count=2):
+        if self._use_client_session():
+            asyncio.run_coroutine_threadsafe(
+                self._async_api_call_callback(callback, url, params, retry_count), self._loop
+            )
+            return
+
         if self._thread is None:
             self._thread = Thread(target=self._api_task, daemon=True)
             self._thread.start()
@@ -826,6 +1057,25 @@ class DreameVacuumMiHomeCloudProtocol:
             response = None
         return response
 
+    async def async_api_call(self, url, params, retry_count=2):
+        response = await self.async_request(
+            f"{self.get_api_url()}/{url}",
+            {"data": json.dumps(params, separators=(",", ":"))},
+            retry_count,
+        )
+
+        # Login check sends another request when there is no response
+        logged_in = (
+            self.check_login(response)
+            if response is not None
+            else await self._loop.run_in_executor(None, self.check_login)
+        )
+        if not logged_in:
+            self._logged_in = False
+            self._auth_failed = True
+            response = None
+        return response
+
     @property
     def logged_in(self) -> bool:
         return self._logged_in
@@ -1052,6 +1302,9 @@ class DreameVacuumMiHomeCloudProtocol:
         return False
 
     def get_file(self, url: str, retry_count: int = 4) -> Any:
+        if self._use_client_session():
+            return self._run_coroutine(self.async_get_file(url, retry_count), retry_count)
+
         retries = 0
         if not retry_count or retry_count < 0:
             retry_count = 0
@@ -1066,6 +1319,55 @@ class DreameVacuumMiHomeCloudProtocol:
             retries = retries + 1
         return None
 
+    async def async_get_file(self, url: str, retry_count: int = 4) -> Any:
+        retries = 0
+        if not retry_count or retry_count < 0:
+            retry_count = 0
+        while retries < retry_count + 1:
+            try:
+                async with self._client_session.get(url, timeout=CLOUD_REQUEST_TIMEOUT) as response:
+                    if response.status == 200:
+                        return await response.read()
+            except Exception as ex:
+                _LOGGER.warning("Unable to get file at %s: %s", url, ex)
+            retries = retries + 1
+        return None
+
+    def _iter_file(self, url: str, response, chunk_size: int, retry_count: int):
+        size = 0
+        try:
+            for chunk in response.iter_content(chunk_size):
+                size = size + len(chunk)
+                yield chunk
+        except requests.exceptions.RequestException as ex:
+            # Connection is dropped or timed out after the headers are received, download the file again and continue from where it is left
+            _LOGGER.warning("Unable to stream file at %s: %s", url, ex)
+            response.close()
+            content = self.get_file(url, retry_count)
+            if content is None:
+                raise
+            if len(content) > size:
+                yield content[size:]
+        finally:
+            response.close()
+
+    def get_file_stream(self, url: str, chunk_size: int = 65536, retry_count: int = 4) -> Any:
+        retries = 0
+        if not retry_count or retry_count < 0:
+            retry_count = 0
+        while retries < retry_count + 1:
+            try:
+                response = self._session.get(url, timeout=6, stream=True)
+            except Exception as ex:
+                response = None
+                _LOGGER.warning("Unable to get file at %s: %s", url, ex)
+            if response is not None:
+                if response.status_code == 200:
+                    return self._iter_file(url, response, chunk_size, retry_count - retries)
+                response.close()
+            retries = retries + 1
+        return None
+
     def get_file_url(self, object_name: str = "") -> Any:
         api_response = self._api_call(f'home/getfileurl{("_v3" if self._v3 else "")}', {"obj_name": object_name})
         _LOGGER.debug("Get file url result: %s = %s", object_name, api_response)
@@ -1113,6 +1415,16 @@ class DreameVacuumMiHomeCloudProtocol:
             return None
         return api_response["result"]
 
+    async def async_send(self, method, parameters, retry_count: int = 2) -> Any:
+        api_response = await self.async_api_call(
+            f"v2/home/rpc/{self._did}",
+            {"method": method, "params": parameters},
+            retry_count,
+        )
+        if api_response is None or "result" not in api_response:
+            return None
+        return api_response["result"]
+
     def get_device_property(self, key, limit=1, time_start=0, time_end=9999999999):
         return self.get_device_data(key, "prop", limit, time_start, time_end)
 
@@ -1285,10 +1597,7 @@ class DreameVacuumMiHomeCloudProtocol:
             return None
         return api_response["result"]
 
-    def request(self, url: str, params: Dict[str, str], retry_count=2) -> Any:
-        retries = 0
-        if not retry_count or retry_count < 0:
-            retry_count = 0
+    def _get_request(self, url: str, params: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
         headers = {
             "User-Agent": self._useragent,
             "Accept-Encoding": "identity",
@@ -1310,7 +1619,16 @@ class DreameVacuumMiHomeCloudProtocol:
         nonce = self.generate_nonce()
         signed_nonce = self.signed_nonce(nonce)
         fields = self.generate_enc_params(url, "POST", signed_nonce, nonce, params, self._ssecurity)
+        return headers, cookies, fields
+
+    def request(self, url: str, params: Dict[str, str], retry_count=2) -> Any:
+        if self._use_client_session():
+            return self._run_coroutine(self.async_request(url, params, retry_count), retry_count)
 
+        retries = 0
+        if not retry_count or retry_count < 0:
+            retry_count = 0
+        headers, cookies, fields = self._get_request(url, params)
         while retries < retry_count + 1:
             try:
                 response = self._session.post(url, headers=headers, cookies=cookies, data=fields, timeout=5)
@@ -1335,6 +1653,39 @@ class DreameVacuumMiHomeCloudProtocol:
             self._fail_count = self._fail_count + 1
         return None
 
+    async def async_request(self, url: str, params: Dict[str, str], retry_count=2) -> Any:
+        retries = 0
+        if not retry_count or retry_count < 0:
+            retry_count = 0
+        headers, cookies, fields = self._get_request(url, params)
+        response = None
+        while retries < retry_count + 1:
+            try:
+                async with self._client_session.post(
+                    url, headers=headers, cookies=cookies, data=fields, timeout=MI_CLOUD_REQUEST_TIMEOUT
+                ) as api_response:
+                    response = (api_response.status, await api_response.text())
+                break
+            except Exception as ex:
+                retries = retries + 1
+                if self._connected:
+                    _LOGGER.warning("Error while executing request: %s %s", url, str(ex))
+
+        if response is not None:
+            status, text = response
+            if status == 200:
+                self._fail_count = 0
+                self._connected = True
+                decoded = self.decrypt_rc4(self.signed_nonce(fields["_nonce"]), text)
+                return json.loads(decoded) if decoded else None
+            _LOGGER.warning("Execute api call failed with response: %s", text)
+
+        if self._fail_count == 5:
+            self._connected = False
+        else:
+            self._fail_count = self._fail_count + 1
+        return None
+
     def get_api_url(self) -> str:
         return f"https://{('' if self._country == 'cn' else (self._country + '.'))}api.io.mi.com/app"
 
@@ -1439,6 +1790,8 @@ class DreameVacuumProtocol:
         account_type: str = "mi",
         device_id: str = None,
         auth_key: str = None,
+        session: aiohttp.ClientSession = None,
+        loop: asyncio.AbstractEventLoop = None,
     ) -> None:
         self._ready = False
         self.prefer_cloud = prefer_cloud
@@ -1471,6 +1824,13 @@ class DreameVacuumProtocol:
             self.prefer_cloud = True
             self.device_cloud = self.cloud
 
+        # Cloud requests are sent on the event loop with the shared session when it is available
+        if session is not None and loop is not None:
+            if self.cloud is not None:
+                self.cloud.set_client_session(session, loop)
+            if self.device_cloud is not None and self.device_cloud is not self.cloud:
+                self.device_cloud.set_client_session(session, loop)
+
     def set_credentials(self, ip: str, token: str, mac: str = None, account_type: str = "mi"):
         self._mac = mac
         self._account_type = account_type
@@ -1579,6 +1939,11 @@ class DreameVacuumProtocol:
     def get_properties(self, parameters: Any = None, retry_count: int = 1) -> Any:
         return self.send("get_properties", parameters=parameters, retry_count=retry_count)
 
+    @property
+    def parallel_requests(self) -> bool:
+        """Requests are sent over cloud and can be executed in parallel."""
+        return bool((self.prefer_cloud or not self.device) and self.device_cloud)
+
     def set_property(self, siid: int, piid: int, value: Any = None, retry_count: int = 2) -> Any:
         return self.set_properties(
             [
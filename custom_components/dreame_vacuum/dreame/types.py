@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import re
+import copy
 import math
 import json
 import time
+import numpy as np
+from array import array
 from typing import Any, Dict, Final, List, Optional
 from enum import IntEnum, Enum
 from dataclasses import dataclass, field
@@ -2485,6 +2489,131 @@ class Path(Point):
         return attributes
 
 
+class PathList:
+    """Packed cleaning path, coordinates are stored in int32 arrays and path types in an uint8 array.
+    Path objects are only created when an item is accessed so it can still be used as a list of Path.
+    """
+
+    _PATTERN = re.compile(r"([MWSLl])(-?\d+),(-?\d+)")
+    _OPERATORS = np.zeros(256, dtype=bool)
+    _OPERATORS[np.frombuffer(b"MWSLl", dtype=np.uint8)] = True
+    _CHARACTERS = _OPERATORS.copy()
+    _CHARACTERS[np.frombuffer(b"0123456789-,", dtype=np.uint8)] = True
+    _SEPARATORS = str.maketrans("MWSLl", ",,,,,")
+    _PATH_TYPES = {ord(path_type.value): path_type for path_type in PathType}
+
+    def __init__(self, points=None) -> None:
+        self.x = array("i")
+        self.y = array("i")
+        self.operators = bytearray()
+        if points:
+            self.extend(points)
+
+    @staticmethod
+    def from_string(value: str) -> PathList:
+        """Parse path string of the map data json (tr), L operator is relative to the previous point and others are absolute.
+        You will only get "l" paths with in a P frame, it means path is connected with the path from previous frame and it is stored as a line.
+        """
+        path = PathList()
+        if not value:
+            return path
+
+        data = np.frombuffer(value.encode(), dtype=np.uint8)
+        operators = data[PathList._OPERATORS[data]]
+        values = None
+        if PathList._OPERATORS[data[0]] and PathList._CHARACTERS[data].all():
+            values = np.fromstring(value[1:].translate(PathList._SEPARATORS), dtype=np.int64, sep=",")
+        if values is None or len(values) != len(operators) * 2:
+            # Fallback for unexpected characters in the string
+            matches = PathList._PATTERN.findall(value)
+            if not matches:
+                return path
+            operators = np.frombuffer("".join(m[0] for m in matches).encode(), dtype=np.uint8)
+            values = np.array([v for m in matches for v in m[1:]], dtype=np.int64)
+
+        relative = operators == ord("L")
+        start = np.maximum.accumulate(np.where(relative, -1, np.arange(len(operators))))
+        for values, coordinates in ((values[0::2], path.x), (values[1::2], path.y)):
+            total = np.cumsum(values)
+            coordinates.frombytes(
+                (total - np.where(start >= 0, total[start] - values[start], 0)).astype(np.int32).tobytes()
+            )
+        path.operators[:] = operators.tobytes().replace(b"l", b"L")
+        return path
+
+    def __len__(self) -> int:
+        return len(self.operators)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            path = PathList()
+            path.x = self.x[index]
+            path.y = self.y[index]
+            path.operators = self.operators[index]
+            return path
+        return Path(self.x[index], self.y[index], PathList._PATH_TYPES[self.operators[index]])
+
+    def __iter__(self):
+        path_types = PathList._PATH_TYPES
+        for x, y, operator in zip(self.x, self.y, self.operators):
+            yield Path(x, y, path_types[operator])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PathList):
+            return self.operators == other.operators and self.x == other.x and self.y == other.y
+        if isinstance(other, list):
+            return list(self) == other
+        return False
+
+    def __repr__(self) -> str:
+        return f"PathList({len(self)})"
+
+    def append(self, point: Path) -> None:
+        self.x.append(int(point.x))
+        self.y.append(int(point.y))
+        self.operators.append(ord(point.path_type.value))
+
+    def extend(self, points) -> None:
+        if isinstance(points, PathList):
+            self.x.extend(points.x)
+            self.y.extend(points.y)
+            self.operators.extend(points.operators)
+        else:
+            for point in points:
+                self.append(point)
+
+    def copy(self) -> PathList:
+        return self[:]
+
+    def has_path_type(self, path_type: PathType) -> bool:
+        return ord(path_type.value) in self.operators
+
+    def to_img(self, image_dimensions, scale=1):
+        """Image coordinates of all points as float arrays, same as calling Point.to_img for each point"""
+        return (
+            (
+                ((np.array(self.x, dtype=np.int64) - image_dimensions.left) / image_dimensions.grid_size)
+                * image_dimensions.scale
+                + image_dimensions.padding[0]
+                - image_dimensions.crop[0]
+            )
+            * scale,
+            (
+                (
+                    (
+                        ((image_dimensions.height) * image_dimensions.grid_size - 1)
+                        - (np.array(self.y, dtype=np.int64) - image_dimensions.top)
+                    )
+                    / image_dimensions.grid_size
+                )
+                * image_dimensions.scale
+                + image_dimensions.padding[1]
+                - image_dimensions.crop[1]
+            )
+            * scale,
+        )
+
+
 class Obstacle(Point):
     def __init__(
         self,
@@ -3223,6 +3352,14 @@ class MapImageDimensions:
             and self.grid_size == other.grid_size
         )
 
+    def copy(self) -> MapImageDimensions:
+        dimensions = copy.copy(self)
+        if self.padding is not None:
+            dimensions.padding = list(self.padding)
+        if self.crop is not None:
+            dimensions.crop = list(self.crop)
+        return dimensions
+
 
 class CleaningHistory:
     def __init__(self, history_data, property_mapping) -> None:
@@ -3454,7 +3591,7 @@ class MapData:
         self.no_mopping_areas: Optional[List[Area]] = None  # Data json: vw.mop
         self.virtual_walls: Optional[List[Wall]] = None  # Data json: vw.line
         self.virtual_thresholds: Optional[List[Wall]] = None  # Data json: vws.vwsl
-        self.path: Optional[Path] = None  # Data json: tr
+        self.path: Optional[PathList] = None  # Data json: tr
         self.active_segments: Optional[int] = None  # Data json: sa
         self.active_areas: Optional[List[Area]] = None  # Data json: da2
         self.active_points: Optional[List[Point]] = None  # Data json: sp
@@ -3650,6 +3787,28 @@ class MapData:
 
         return True
 
+    def snapshot(self) -> MapData:
+        """Copy-on-write copy of the map data for rendering.
+        Image buffers and positions are shared because map manager replaces them on every frame instead of modifying them,
+        only containers that are modified in place by the map manager, the device or the renderer are copied.
+        """
+        map_data = copy.copy(self)
+        if self.dimensions is not None:
+            map_data.dimensions = self.dimensions.copy()
+        if self.optimized_dimensions is not None:
+            map_data.optimized_dimensions = self.optimized_dimensions.copy()
+        if self.combined_dimensions is not None:
+            map_data.combined_dimensions = self.combined_dimensions.copy()
+        if self.segments is not None:
+            map_data.segments = {k: copy.copy(v) for k, v in self.segments.items()}
+        if self.obstacles is not None:
+            map_data.obstacles = {k: copy.copy(v) for k, v in self.obstacles.items()}
+        if self.path is not None:
+            map_data.path = self.path.copy()
+        if self.carpet_pixels is not None:
+            map_data.carpet_pixels = list(self.carpet_pixels)
+        return map_data
+
     def as_dict(self) -> Dict[str, Any]:
         attributes_list = {}
         if self.charger_position is not None:
@@ -3864,6 +4023,13 @@ class MapRendererColorScheme:
     dark: bool = False
 
 
+@dataclass
+class MapRendererEncoder:
+    compress_level: int = 6
+    palette: bool = False
+    stream_quality: int = None  # Camera stream frames are encoded as JPEG when set
+
+
 MAP_COLOR_SCHEME_LIST: Final = {
     "Dreame Light": MapRendererColorScheme(),
     "Dreame Dark": MapRendererColorScheme(
@@ -3992,6 +4158,16 @@ MAP_COLOR_SCHEME_LIST: Final = {
 
 MAP_ICON_SET_LIST: Final = {"Dreame": 0, "Dreame Old": 1, "Mijia": 2, "Material": 3}
 
+MAP_OPTIMIZER_LIST: Final = {"JavaScript": 0, "Python": 1, "Python (NumPy stages)": 2}
+
+MAP_ENCODER_LIST: Final = {
+    "PNG": MapRendererEncoder(),
+    "Fast PNG": MapRendererEncoder(compress_level=1),
+    "Palette PNG": MapRendererEncoder(palette=True),
+    "Fast palette PNG": MapRendererEncoder(compress_level=1, palette=True),
+    "Fast palette PNG, JPEG stream": MapRendererEncoder(compress_level=1, palette=True, stream_quality=80),
+}
+
 
 class MapRendererLayer(IntEnum):
     IMAGE = 0
@@ -4101,6 +4277,8 @@ class MapRendererResources:
 @dataclass
 class MapRendererData:
     data: Dict[int, list[int]]
+    encoding: str = None
+    pixels: str = None
     size: list[int] = None
     map_id: int = 0
     saved_map_id: int = None
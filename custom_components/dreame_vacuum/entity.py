@@ -69,6 +69,8 @@ class DreameVacuumEntityDescription:
     icon_fn: Callable[[str, object], str] = None
     name_fn: Callable[[str, object], str] = None
     attrs_fn: Callable[[object, Dict]] = None
+    # Other device properties that the entity state depends on
+    dependencies: list[DreameVacuumProperty] = None
 
 
 class DreameVacuumEntity(CoordinatorEntity[DreameVacuumDataUpdateCoordinator]):
@@ -120,7 +122,7 @@ class DreameVacuumEntity(CoordinatorEntity[DreameVacuumDataUpdateCoordinator]):
                     elif description.key in ACTION_AVAILABILITY:
                         description.available_fn = ACTION_AVAILABILITY[description.key]
 
-        super().__init__(coordinator=coordinator)
+        super().__init__(coordinator=coordinator, context=self._get_context(description))
         if description:
             if description.key is not None:
                 self._attr_translation_key = description.key
@@ -128,6 +130,21 @@ class DreameVacuumEntity(CoordinatorEntity[DreameVacuumDataUpdateCoordinator]):
             self._set_id()
             self._attr_unique_id = f"{self.device.mac}_{self.entity_description.key}"
 
+    @staticmethod
+    def _get_context(description: DreameVacuumEntityDescription) -> frozenset[int] | None:
+        """Properties the entity state depends on, entity is updated on every change when they are not known."""
+        if (
+            description is None
+            or not isinstance(description.property_key, DreameVacuumProperty)
+            or description.available_fn is not None
+            or description.attrs_fn is not None
+        ):
+            return None
+        return frozenset(
+            [description.property_key.value]
+            + ([prop.value for prop in description.dependencies] if description.dependencies else [])
+        )
+
     def _set_id(self) -> None:
         if self.entity_description:
             if self.entity_description.icon_fn is not None:
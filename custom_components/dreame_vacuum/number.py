@@ -295,6 +295,9 @@ class DreameVacuumNumberEntity(DreameVacuumEntity, NumberEntity):
 
         super().__init__(coordinator, description)
         self._generate_entity_id(ENTITY_ID_FORMAT)
+        if description.min_value_fn or description.max_value_fn:
+            # Value range can be changed by any property
+            self.coordinator_context = None
         self._attr_mode = description.mode
         self._attr_native_value = super().native_value
 
@@ -862,6 +862,8 @@ class DreameVacuumSelectEntity(DreameVacuumEntity, SelectEntity):
         super().__init__(coordinator, description)
         self._generate_entity_id(ENTITY_ID_FORMAT)
         if description.options is not None:
+            # Options can be changed by any property
+            self.coordinator_context = None
             self._attr_options = description.options(coordinator.device, None)
         self._attr_current_option = self.native_value
 
@@ -82,10 +82,19 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.STATE,
         icon="mdi:robot-vacuum",
+        dependencies=[
+            DreameVacuumProperty.STATUS,
+            DreameVacuumProperty.TASK_STATUS,
+            DreameVacuumProperty.CHARGING_STATUS,
+            DreameVacuumProperty.BATTERY_LEVEL,
+            DreameVacuumProperty.CLEANING_PAUSED,
+            DreameVacuumProperty.SELF_WASH_BASE_STATUS,
+        ],
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.STATUS,
         icon="mdi:vacuum",
+        dependencies=[DreameVacuumProperty.CHARGING_STATUS, DreameVacuumProperty.BATTERY_LEVEL],
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.RELOCATION_STATUS,
@@ -105,6 +114,17 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
         exists_fn=lambda description, device: not device.capability.self_wash_base
         and not device.capability.embedded_tank
         and DreameVacuumEntityDescription().exists_fn(description, device),
+        dependencies=[
+            DreameVacuumProperty.STATE,
+            DreameVacuumProperty.STATUS,
+            DreameVacuumProperty.TASK_STATUS,
+            DreameVacuumProperty.CHARGING_STATUS,
+            DreameVacuumProperty.BATTERY_LEVEL,
+            DreameVacuumProperty.CLEANING_PAUSED,
+            DreameVacuumProperty.SELF_WASH_BASE_STATUS,
+            DreameVacuumProperty.MOP_IN_STATION,
+            DreameVacuumProperty.MOP_PAD_INSTALLED,
+        ],
     ),
     DreameVacuumSensorEntityDescription(
         key="mop_pad",
@@ -139,6 +159,15 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
         property_key=DreameVacuumProperty.DRAINAGE_STATUS,
         icon_fn=lambda value, device: "mdi:pump" if device.status.draining else "mdi:pump-off",
         exists_fn=lambda description, device: device.capability.water_check,
+        dependencies=[
+            DreameVacuumProperty.STATE,
+            DreameVacuumProperty.STATUS,
+            DreameVacuumProperty.TASK_STATUS,
+            DreameVacuumProperty.CHARGING_STATUS,
+            DreameVacuumProperty.BATTERY_LEVEL,
+            DreameVacuumProperty.CLEANING_PAUSED,
+            DreameVacuumProperty.SELF_WASH_BASE_STATUS,
+        ],
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.TASK_TYPE,
@@ -167,6 +196,7 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.CHARGING_STATUS,
         icon="mdi:home-lightning-bolt",
+        dependencies=[DreameVacuumProperty.BATTERY_LEVEL],
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.BATTERY_LEVEL,
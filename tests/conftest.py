@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The integration is not installed as a package, dreame package is imported from the integration folder
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "custom_components", "dreame_vacuum"))
@@ -0,0 +1,85 @@
+import copy
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from dreame.map import DreameVacuumMapDecoder, DreameVacuumMapOptimizer
+from dreame.types import MapDataPartial, Point
+
+STAGES = [
+    ("_clean_wall", (), [0, 1, 2]),
+    ("_obstacle_data", (), [0, 1, 2, 3]),
+    ("_fill_map_data", (3,), [0, 1, 2]),
+    ("_denoise", (), [0, 1, 2, 3, 5]),
+    ("_update_border_value", (6,), [0, 1, 2, 3, 5, 255]),
+    ("_fill_cross_line", (5,), [0, 1, 5]),
+    ("_fill_map_data_2", (), [0, 1, 2, 3, 5, 255]),
+    ("_find_obstacle_border", (3,), [0, 1, 2, 3, 5, 7]),
+    ("_clean_small_obstacle", (3,), [0, 1, 2, 3, 5, 7]),
+]
+
+
+def _vslam_map(width, height, seed):
+    rng = random.Random(seed)
+    pixels = np.zeros((height, width), np.uint8)
+    for i in range(7):
+        x0 = rng.randrange(0, width - 40)
+        y0 = rng.randrange(0, height - 40)
+        x1 = min(width - 2, x0 + rng.randrange(30, width // 2))
+        y1 = min(height - 2, y0 + rng.randrange(30, height // 2))
+        pixels[y0:y1, x0:x1] = 1
+        pixels[y0, x0:x1] = 2
+        pixels[y1 - 1, x0:x1] = 2
+        pixels[y0:y1, x0] = 2
+        pixels[y0:y1, x1 - 1] = 2
+    noise = np.random.RandomState(seed).rand(height, width)
+    pixels[noise < 0.03] = 2
+    pixels[noise > 0.97] = 0
+
+    partial_map = MapDataPartial()
+    partial_map.map_id = 1
+    partial_map.frame_id = 1
+    partial_map.frame_type = 73
+    partial_map.raw = (
+        struct.pack("<hh", 1, 1)
+        + bytes([73])
+        + struct.pack("<hhhhhhhhhhh", 10, 20, 30, 40, 50, 60, 50, width, height, 0, 0)
+        + pixels.tobytes()
+    )
+    partial_map.data_json = {"ris": 1}
+    map_data, _ = DreameVacuumMapDecoder.decode_map_data_from_partial(partial_map, True)
+    map_data.charger_position = Point(width * 25, height * 25, 0)
+    return map_data
+
+
+@pytest.mark.parametrize("name, args, values", STAGES, ids=[stage[0] for stage in STAGES])
+def test_stage_parity(name, args, values):
+    """Every stage that has a NumPy implementation must change the map data same as the per pixel one."""
+    rng = random.Random(name)
+    python = DreameVacuumMapOptimizer("Python")
+    numpy = DreameVacuumMapOptimizer("Python (NumPy stages)")
+    for _ in range(300):
+        width, height = rng.randrange(1, 30), rng.randrange(1, 30)
+        empty = rng.random()
+        data = [0 if rng.random() < empty else rng.choice(values) for _ in range(width * height)]
+        expected, result = data.copy(), data.copy()
+        try:
+            getattr(python, name)(expected, width, height, *args)
+        except IndexError:
+            # Per pixel implementation reads past the buffer on some maps that are not generated by the device
+            continue
+        getattr(numpy, name)(result, width, height, *args)
+        assert result == expected, (width, height, data)
+
+
+@pytest.mark.parametrize("size", [(100, 80), (160, 120)])
+@pytest.mark.parametrize("seed", range(3))
+def test_optimize_parity(size, seed):
+    map_data = _vslam_map(*size, seed)
+    expected = DreameVacuumMapOptimizer("Python").optimize(copy.deepcopy(map_data))
+    result = DreameVacuumMapOptimizer("Python (NumPy stages)").optimize(copy.deepcopy(map_data))
+    assert expected.optimized_pixel_type is not None
+    assert np.array_equal(result.optimized_pixel_type, expected.optimized_pixel_type)
+    assert result.optimized_charger_position == expected.optimized_charger_position
@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+import pytest
+
+from dreame.map import DreameVacuumMapOptimizer
+from dreame.types import MapData, MapImageDimensions, MapPixelType
+
+
+def _map_data(pixel_type):
+    map_data = MapData()
+    map_data.pixel_type = pixel_type
+    map_data.dimensions = MapImageDimensions(0, 0, pixel_type.shape[1], pixel_type.shape[0], 50)
+    map_data.wifi_map = True
+    map_data.saved_map = False
+    map_data.empty_map = False
+    return map_data
+
+
+def _smooth_wifi_map(map_data):
+    """Per pixel implementation that the vectorized one replaces."""
+    optimized_pixel_type = np.copy(map_data.pixel_type)
+    for y in range(map_data.dimensions.height):
+        for x in range(map_data.dimensions.width):
+            if int(map_data.pixel_type[x, y]) > 2:
+                max_count = 0
+                max_px = -1
+                value_count = [0, 0, 0, 0]
+                for delta in range(3, 6):
+                    for n in range(y - delta, y + delta + 1):
+                        for m in range(x - delta, x + delta + 1):
+                            if n < 0 or n >= map_data.dimensions.height or m < 0 or m >= map_data.dimensions.width:
+                                continue
+
+                            px = int(map_data.pixel_type[m, n]) - MapPixelType.WIFI_POOR.value
+                            if px >= 0:
+                                value_count[px] = value_count[px] + 1
+                                if value_count[px] > max_count:
+                                    max_count = value_count[px]
+                                    max_px = px
+
+                    if max_px >= 0:
+                        optimized_pixel_type[x, y] = max_px + MapPixelType.WIFI_POOR.value
+                        break
+    return optimized_pixel_type
+
+
+def _random_wifi_map(rng, width, height, density):
+    values = [
+        MapPixelType.OUTSIDE.value,
+        MapPixelType.WIFI_WALL.value,
+        MapPixelType.WIFI_UNREACHED.value,
+    ] + list(range(MapPixelType.WIFI_POOR.value, MapPixelType.WIFI_EXCELLENT.value + 1))
+    pixel_type = np.zeros((width, height), dtype=np.uint8)
+    for x in range(width):
+        for y in range(height):
+            if rng.random() < density:
+                pixel_type[x, y] = rng.choice(values)
+    return pixel_type
+
+
+def _row(*values):
+    return np.array([values], dtype=np.uint8).T
+
+
+TIE_CASES = [
+    # Same count, level whose last pixel is reached first on the row order wins
+    _row(12, 11, 10, 10),
+    _row(11, 12, 12, 11, 10),
+    np.array([[11, 0, 12], [0, 10, 0], [12, 0, 11]], dtype=np.uint8),
+    # Nothing around on the smaller windows, found on the largest one
+    _row(10, 0, 0, 0, 0, 11, 12, 0, 0, 0, 0, 10),
+    # Nothing around on any window
+    _row(10, 0, 0, 0, 0, 0, 0, 11),
+]
+
+
+@pytest.mark.parametrize("pixel_type", TIE_CASES)
+def test_smooth_wifi_map_ties(pixel_type):
+    for pixel_type in (pixel_type, np.ascontiguousarray(pixel_type.T)):
+        map_data = DreameVacuumMapOptimizer("Python").optimize(_map_data(pixel_type))
+        assert np.array_equal(map_data.optimized_pixel_type, _smooth_wifi_map(_map_data(pixel_type)))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_smooth_wifi_map_random(seed):
+    rng = random.Random(seed)
+    pixel_type = _random_wifi_map(rng, rng.randrange(1, 40), rng.randrange(1, 40), rng.choice([0.02, 0.1, 0.5, 1]))
+    map_data = DreameVacuumMapOptimizer("Python").optimize(_map_data(pixel_type))
+    assert np.array_equal(map_data.optimized_pixel_type, _smooth_wifi_map(_map_data(pixel_type)))
@@ -0,0 +1,48 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pytest
+
+from dreame.map import DreameVacuumMapDecoder
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _load_sequences():
+    with open(os.path.join(FIXTURES, "p_frames.json")) as file:
+        return json.load(file)
+
+
+def _digest(map_data):
+    return {
+        "width": map_data.dimensions.width,
+        "height": map_data.dimensions.height,
+        "left": map_data.dimensions.left,
+        "top": map_data.dimensions.top,
+        "pixel_type": hashlib.sha256(np.ascontiguousarray(map_data.pixel_type).tobytes()).hexdigest(),
+        "data": hashlib.sha256(bytes(map_data.data)).hexdigest(),
+        "carpet_pixels": hashlib.sha256(
+            json.dumps(sorted(map(list, map_data.carpet_pixels or []))).encode()
+        ).hexdigest(),
+    }
+
+
+@pytest.mark.parametrize("sequence", _load_sequences())
+def test_p_frames_merge(sequence):
+    """Replay an I frame and the following P frames, every merged map must match the one from the per pixel decoder."""
+    vslam_map = sequence["vslam_map"]
+    frames = sequence["frames"]
+
+    map_data, _ = DreameVacuumMapDecoder.decode_map_data_from_partial(
+        DreameVacuumMapDecoder.decode_map_partial(frames[0]), vslam_map
+    )
+    assert map_data is not None
+
+    for index, (frame, expected) in enumerate(zip(frames[1:], sequence["expected"])):
+        map_data = DreameVacuumMapDecoder.decode_p_map_data_from_partial(
+            DreameVacuumMapDecoder.decode_map_partial(frame), map_data, vslam_map
+        )
+        assert map_data is not None
+        assert _digest(map_data) == expected, f"P frame {index + 2}"